@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.0/ref/settings/
 """
 
+import json
 import os
 
 import environ
@@ -22,8 +23,26 @@ from sentry_sdk.integrations.logging import ignore_logger as sentry_sdk_ignore_l
 env = environ.Env(
     DEBUG=(bool, False),
     DEBUG_TOOLBAR_SHOW=(bool, False),
-    ROBOCJK_EXPORT_CANCEL_TIMEOUT=(int, 120),
     ROBOCJK_EXPORT_QUERIES_PAGINATION_LIMIT=(int, 500),
+    ROBOCJK_EXPORT_WORKERS=(int, 1),
+    ROBOCJK_EXPORT_LOCK_TTL=(int, 60),
+    ROBOCJK_EXPORT_LOCK_HEARTBEAT_INTERVAL=(int, 15),
+    ROBOCJK_EXPORT_SKIP_UNCHANGED_FILES=(bool, True),
+    ROBOCJK_EXPORT_PIPELINE_WRITERS=(int, 4),
+    ROBOCJK_EXPORT_PIPELINE_BATCH_SIZE=(int, 100),
+    ROBOCJK_EXPORT_PIPELINE_MAX_PENDING_BATCHES=(int, 16),
+    ROBOCJK_EXPORT_PIPELINE_WRITE_IN_WORKERS=(bool, False),
+    ROBOCJK_EXPORT_RUNS_MAX_AGE=(int, 30),
+    ROBOCJK_API_STREAM_CHUNK_SIZE=(int, 2000),
+    ROBOCJK_API_COMPRESSION_ENCODINGS=(list, ["zstd", "br", "gzip"]),
+    ROBOCJK_API_COMPRESSION_MIN_SIZE=(int, 1024),
+    ROBOCJK_API_COMPRESSION_GZIP_LEVEL=(int, 6),
+    ROBOCJK_API_COMPRESSION_BR_LEVEL=(int, 4),
+    ROBOCJK_API_COMPRESSION_ZSTD_LEVEL=(int, 3),
+    ROBOCJK_API_COMPRESSION_ENDPOINTS=(json.loads, {}),
+    ROBOCJK_API_AUTH_USER_CACHE_TIMEOUT=(int, 300),
+    ROBOCJK_API_AUTH_USER_CACHE_LOCAL_TIMEOUT=(int, 30),
+    ROBOCJK_API_BULK_UPDATE_MAX_ITEMS=(int, 1000),
 )
 env_root = environ.Path(__file__) - 3  # get root of the project
 env_path = env_root() + "/conf/env_settings"
@@ -61,8 +80,34 @@ GIT_USER_NAME = env("GIT_USER_NAME")
 JWT_SECRET = env("JWT_SECRET")
 JWT_ALGORITHM = "HS256"
 
-ROBOCJK_EXPORT_CANCEL_TIMEOUT = env("ROBOCJK_EXPORT_CANCEL_TIMEOUT")
 ROBOCJK_EXPORT_QUERIES_PAGINATION_LIMIT = env("ROBOCJK_EXPORT_QUERIES_PAGINATION_LIMIT")
+ROBOCJK_EXPORT_WORKERS = env("ROBOCJK_EXPORT_WORKERS")
+ROBOCJK_EXPORT_LOCK_TTL = env("ROBOCJK_EXPORT_LOCK_TTL")
+ROBOCJK_EXPORT_LOCK_HEARTBEAT_INTERVAL = env("ROBOCJK_EXPORT_LOCK_HEARTBEAT_INTERVAL")
+ROBOCJK_EXPORT_SKIP_UNCHANGED_FILES = env("ROBOCJK_EXPORT_SKIP_UNCHANGED_FILES")
+ROBOCJK_EXPORT_PIPELINE_WRITERS = env("ROBOCJK_EXPORT_PIPELINE_WRITERS")
+ROBOCJK_EXPORT_PIPELINE_BATCH_SIZE = env("ROBOCJK_EXPORT_PIPELINE_BATCH_SIZE")
+ROBOCJK_EXPORT_PIPELINE_MAX_PENDING_BATCHES = env(
+    "ROBOCJK_EXPORT_PIPELINE_MAX_PENDING_BATCHES"
+)
+ROBOCJK_EXPORT_PIPELINE_WRITE_IN_WORKERS = env(
+    "ROBOCJK_EXPORT_PIPELINE_WRITE_IN_WORKERS"
+)
+ROBOCJK_EXPORT_RUNS_MAX_AGE = env("ROBOCJK_EXPORT_RUNS_MAX_AGE")
+ROBOCJK_API_STREAM_CHUNK_SIZE = env("ROBOCJK_API_STREAM_CHUNK_SIZE")
+ROBOCJK_API_COMPRESSION_ENCODINGS = env("ROBOCJK_API_COMPRESSION_ENCODINGS")
+ROBOCJK_API_COMPRESSION_MIN_SIZE = env("ROBOCJK_API_COMPRESSION_MIN_SIZE")
+ROBOCJK_API_COMPRESSION_GZIP_LEVEL = env("ROBOCJK_API_COMPRESSION_GZIP_LEVEL")
+ROBOCJK_API_COMPRESSION_BR_LEVEL = env("ROBOCJK_API_COMPRESSION_BR_LEVEL")
+ROBOCJK_API_COMPRESSION_ZSTD_LEVEL = env("ROBOCJK_API_COMPRESSION_ZSTD_LEVEL")
+# compression options by api endpoint url name, eg. {"glif_list": {"min_size": 4096, "zstd": 1}}
+ROBOCJK_API_COMPRESSION_ENDPOINTS = env("ROBOCJK_API_COMPRESSION_ENDPOINTS")
+ROBOCJK_API_AUTH_USER_CACHE_TIMEOUT = env("ROBOCJK_API_AUTH_USER_CACHE_TIMEOUT")
+ROBOCJK_API_AUTH_USER_CACHE_LOCAL_TIMEOUT = env(
+    "ROBOCJK_API_AUTH_USER_CACHE_LOCAL_TIMEOUT"
+)
+# max number of items of a single glif bulk update request
+ROBOCJK_API_BULK_UPDATE_MAX_ITEMS = env("ROBOCJK_API_BULK_UPDATE_MAX_ITEMS")
 
 TEST_API_HOST = env("TEST_API_HOST")
 TEST_API_USERNAME = env("TEST_API_USERNAME")
@@ -122,7 +167,7 @@ INSTALLED_APPS = [
 X_FRAME_OPTIONS = "SAMEORIGIN"
 
 MIDDLEWARE = [
-    "django.middleware.gzip.GZipMiddleware",
+    "robocjk.api.middleware.ApiCompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "csp.middleware.CSPMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
@@ -1,10 +1,12 @@
 import datetime as dt
 
-from django.conf import settings
+from django.apps import apps
 from django.db import close_old_connections, models
 from django.utils.translation import gettext_lazy as _
 
 from robocjk.debug import logger
+from robocjk.exceptions import ExportLockLostError
+from robocjk.io.profiling import ExportProfiler
 
 
 class ExportModel(models.Model):
@@ -55,61 +57,117 @@ class ExportModel(models.Model):
         return last_full_export_older_than_24h or last_full_export_day_before
 
     @property
-    def export_cancelable(self):
-        if self.export_running:
-            now = dt.datetime.now()
-            if (now - self.export_started_at) > dt.timedelta(
-                minutes=settings.ROBOCJK_EXPORT_CANCEL_TIMEOUT
-            ):
-                return True
-        return False
+    def export_lock_key(self):
+        return f"{self._meta.label_lower}:{self.pk}"
+
+    def _acquire_export(self, holder):
+        """
+        Atomically acquire the export lock lease of this object (only if it is
+        free or if its lease has expired), so that exports of different objects
+        can run concurrently while the same object is never exported twice,
+        even by processes running on different hosts.
+        """
+        export_lock_cls = apps.get_model("robocjk", "ExportLock")
+        if not export_lock_cls.acquire(self.export_lock_key, holder):
+            return False
+        now = dt.datetime.now()
+        self.__class__.objects.filter(pk=self.pk).update(
+            export_running=True, export_started_at=now
+        )
+        self.export_running = True
+        self.export_started_at = now
+        return True
 
-    @property
-    def exportable(self):
-        return not self.export_running or self.export_cancelable
+    def _release_export(self, holder):
+        export_lock_cls = apps.get_model("robocjk", "ExportLock")
+        export_lock_cls.release(self.export_lock_key, holder)
 
     def export(self, full=None):
         close_old_connections()
 
-        cls = self.__class__
-
-        exporting_objects = list(cls.objects.all())
-        exportable_objects = [obj.exportable for obj in exporting_objects]
-        if not all(exportable_objects):
-            logger.warning(
-                "Skipped export to avoid overlapping with other exports that are still running."
-            )
-            return False
+        # refresh_from_db(fields=...) would load a deferred instance and
+        # the slug models access the deferred name field on init (recursion)
+        export_fields = ["export_enabled", "export_running", "export_started_at"]
+        export_values = self.__class__.objects.values(*export_fields).get(pk=self.pk)
+        for field_name, field_value in export_values.items():
+            setattr(self, field_name, field_value)
 
         if not self.export_enabled:
             logger.info(f"Skipped export for '{self}' because it is disabled.")
             return False
 
-        if self.export_running:
-            if self.export_cancelable:
-                logger.warning(
-                    f"Canceled unfinished export for '{self}' to allow a new export to start."
-                )
-                self.export_running = False
-                self.save()
-            else:
-                logger.info(
-                    f"Skipped export for '{self}' because there is an export process that is still running."
-                )
-                return False
-
-        # save export started status in the database
+        export_lock_cls = apps.get_model("robocjk", "ExportLock")
+        export_lock_holder = export_lock_cls.get_holder_id()
+        export_unfinished = self.export_running
+        if not self._acquire_export(export_lock_holder):
+            logger.info(
+                f"Skipped export for '{self}' because there is an export process that is still running."
+            )
+            return False
+
+        if export_unfinished:
+            logger.warning(
+                f"Canceled unfinished export for '{self}' to allow a new export to start."
+            )
+
+        try:
+            # keep the lease alive while the export is running
+            with export_lock_cls.heartbeat(
+                self.export_lock_key, export_lock_holder
+            ) as export_heartbeat:
+                self.export_heartbeat = export_heartbeat
+                return self._export(full)
+        finally:
+            self.export_heartbeat = None
+            self._release_export(export_lock_holder)
+
+    def check_export_lock(self, renew=False):
+        """
+        Raise ExportLockLostError if the export lock lease of this object has
+        been lost (eg. taken over by another process after its expiration).
+        """
+        export_heartbeat = getattr(self, "export_heartbeat", None)
+        if export_heartbeat:
+            export_heartbeat.check(renew=renew)
+
+    def get_export_profiler(self):
+        """
+        Get the profiler recording the timings of the current export phases.
+        """
+        if not hasattr(self, "export_profiler"):
+            self.export_profiler = ExportProfiler()
+        return self.export_profiler
+
+    def get_export_run_fields(self):
+        raise NotImplementedError()
+
+    def _export(self, full):
+        # export started status has been saved in the database
         logger.info(f'Started export for "{self}".')
-        self.export_running = True
-        self.export_started_at = dt.datetime.now()
-        self.save()
 
         # if full argument is provided use it, otherwise use the automated check
         full_export = full or self.full_export_needed
 
+        # keep track of the export phases timings and counts
+        export_run_cls = apps.get_model("robocjk", "ExportRun")
+        export_run = export_run_cls.objects.create(
+            full_export=full_export,
+            started_at=self.export_started_at or dt.datetime.now(),
+            **self.get_export_run_fields(),
+        )
+        self.export_profiler = ExportProfiler()
+
         # save model to the file system
         try:
             self.save_to_file_system(full_export)
+            # don't mark the export as completed if another process took it over
+            self.check_export_lock(renew=True)
+        except ExportLockLostError as export_error:
+            logger.error(f"Canceled export for '{self}': {export_error}")
+            close_old_connections()
+            # the export status belongs to the new export lock holder
+            export_run.complete(self.export_profiler, error=export_error)
+            return False
         except Exception as export_error:
             error_type_name = type(export_error).__name__
             logger.exception(
@@ -118,6 +176,7 @@ class ExportModel(models.Model):
             close_old_connections()
             self.export_running = False
             self.save()
+            export_run.complete(self.export_profiler, error=export_error)
             return False
 
         # save export completed status in the database
@@ -128,7 +187,11 @@ class ExportModel(models.Model):
             self.last_full_export_at = dt.datetime.now()
 
         self.save()
-        logger.info(f"Completed export for '{self}'.")
+        export_run.complete(self.export_profiler)
+        logger.info(
+            f"Completed export for '{self}' in {export_run.duration:.2f}s - "
+            f"timings: {self.export_profiler.format_timings()}"
+        )
         return True
 
     def save_to_file_system(self, full_export):
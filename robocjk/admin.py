@@ -17,6 +17,7 @@ from robocjk.models import (  # Proof,
     CharacterGlyphLayer,
     DeepComponent,
     DeletedGlif,
+    ExportRun,
     Font,
     FontImport,
     GlyphsComposition,
@@ -324,6 +325,25 @@ class FontImportInline(admin.TabularInline):
     extra = 0
 
 
+class FontExportRunInline(admin.TabularInline):
+    model = ExportRun
+    fields = (
+        "started_at",
+        "full_export",
+        "status",
+        "duration",
+        "files_written",
+        "bytes_written",
+        "timings",
+    )
+    readonly_fields = fields
+    extra = 0
+    show_change_link = True
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Font)
 class FontAdmin(admin.ModelAdmin):
     def info(self, font, *args, **kwargs):
@@ -500,7 +520,7 @@ class FontAdmin(admin.ModelAdmin):
             },
         ),
     )
-    inlines = [FontImportInline]
+    inlines = [FontImportInline, FontExportRunInline]
     save_on_top = True
     show_full_result_count = False
 
@@ -992,6 +1012,88 @@ class DeletedGlifAdmin(admin.ModelAdmin):
     show_full_result_count = False
 
 
+@admin.register(ExportRun)
+class ExportRunAdmin(admin.ModelAdmin):
+    list_select_related = (
+        "project",
+        "font",
+    )
+    list_display = (
+        "started_at",
+        "project",
+        "font",
+        "full_export",
+        "status",
+        "duration",
+        "files_written",
+        "bytes_written",
+    )
+    list_filter = (
+        "project",
+        FontFilter,
+        "full_export",
+        "status",
+        (
+            "started_at",
+            DateTimeRangeFilter,
+        ),
+    )
+    readonly_fields = (
+        "project",
+        "font",
+        "full_export",
+        "status",
+        "started_at",
+        "completed_at",
+        "duration",
+        "files_written",
+        "bytes_written",
+        "timings",
+        "counts",
+        "error",
+    )
+    fieldsets = (
+        (
+            None,
+            {
+                "fields": (
+                    "project",
+                    "font",
+                    "full_export",
+                    "status",
+                    "error",
+                ),
+            },
+        ),
+        (
+            "Timings",
+            {
+                "fields": (
+                    "started_at",
+                    "completed_at",
+                    "duration",
+                    "timings",
+                ),
+            },
+        ),
+        (
+            "Counts",
+            {
+                "fields": (
+                    "files_written",
+                    "bytes_written",
+                    "counts",
+                ),
+            },
+        ),
+    )
+    save_on_top = True
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+
 # @admin.register(Proof)
 # class ProofAdmin(admin.ModelAdmin):
 #
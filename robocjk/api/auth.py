@@ -1,11 +1,22 @@
+import copy
 import datetime as dt
+import threading
+import time
 
 import jwt
 from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
+from django.core.cache import cache
+
+from robocjk.utils import get_digest
 
 # from robocjk.debug import logger
 
+# in-process auth token -> (user, expiration timestamp) cache
+_auth_users_cache = {}
+_auth_users_cache_lock = threading.Lock()
+_auth_users_cache_max_size = 10000
+
 
 def decode_auth_token(token):
     try:
@@ -84,14 +95,89 @@ def get_user_by_auth_token(token):
     if not data:
         # logger.error('get_user_by_auth_token -> token payload not found')
         return None
-    user_cls = get_user_model()
     user_pk = data["user_pk"]
+    now = time.time()
+    token_exp = data.get("exp", now)
+    # the token signature and expiration have already been verified,
+    # so the user can be read from the in-process cache (if not expired)
+    with _auth_users_cache_lock:
+        user_obj, user_exp = _auth_users_cache.get(token, (None, 0))
+    if user_obj and user_exp > now:
+        return copy.copy(user_obj)
+    shared_timeout = min(settings.ROBOCJK_API_AUTH_USER_CACHE_TIMEOUT, token_exp - now)
+    user_obj = _get_user(token, user_pk, shared_timeout)
+    if not user_obj:
+        return None
+    local_timeout = min(
+        settings.ROBOCJK_API_AUTH_USER_CACHE_LOCAL_TIMEOUT, token_exp - now
+    )
+    if local_timeout > 0:
+        _set_local_user(token, user_obj, now + local_timeout)
+    return copy.copy(user_obj)
+
+
+def _get_user_cache_keys(user_pk, token=""):
+    user_key = f"robocjk-api-auth-user-{user_pk}-{get_digest(token)}"
+    invalidated_at_key = f"robocjk-api-auth-user-{user_pk}-invalidated-at"
+    return user_key, invalidated_at_key
+
+
+def _get_user(token, user_pk, timeout):
+    # read user from the shared cache (multiple workers) or from the database,
+    # cached users are valid only if cached after the last user invalidation
+    user_key, invalidated_at_key = _get_user_cache_keys(user_pk, token)
+    if timeout > 0:
+        cached = cache.get_many([user_key, invalidated_at_key])
+        user_obj, cached_at = cached.get(user_key, (None, 0))
+        if user_obj and cached_at > cached.get(invalidated_at_key, 0):
+            return user_obj
+    user_cls = get_user_model()
+    # taken before reading, an invalidation during the read makes this entry stale
+    fetched_at = time.time()
     try:
         user_obj = user_cls.objects.get(pk=user_pk)
-        return user_obj
     except user_cls.DoesNotExist:
         # logger.error('get_user_by_auth_token -> user not found')
         return None
+    if timeout > 0:
+        cache.set(user_key, (user_obj, fetched_at), timeout=timeout)
+    return user_obj
+
+
+def _set_local_user(token, user_obj, user_exp):
+    with _auth_users_cache_lock:
+        if len(_auth_users_cache) >= _auth_users_cache_max_size:
+            # remove expired entries, if not enough clear the whole cache
+            now = time.time()
+            for key, (_, exp) in list(_auth_users_cache.items()):
+                if exp <= now:
+                    del _auth_users_cache[key]
+            if len(_auth_users_cache) >= _auth_users_cache_max_size:
+                _auth_users_cache.clear()
+        _auth_users_cache[token] = (user_obj, user_exp)
+
+
+def invalidate_user_auth_cache(user_pk):
+    """
+    Remove the user from the auth users caches, the shared cache is cleared
+    immediately, in-process caches of other workers expire within
+    ROBOCJK_API_AUTH_USER_CACHE_LOCAL_TIMEOUT seconds.
+    """
+    with _auth_users_cache_lock:
+        for key, (user_obj, _) in list(_auth_users_cache.items()):
+            if user_obj.pk == user_pk:
+                del _auth_users_cache[key]
+    _, invalidated_at_key = _get_user_cache_keys(user_pk)
+    cache.set(
+        invalidated_at_key,
+        time.time(),
+        timeout=settings.ROBOCJK_API_AUTH_USER_CACHE_TIMEOUT,
+    )
+
+
+def delete_user_auth_cache(sender, instance, **kwargs):
+    # invalidate cached user when it is saved (eg. deactivated) or deleted
+    invalidate_user_auth_cache(instance.pk)
 
 
 def get_user_by_credentials(request, username, password):
@@ -1,3 +1,4 @@
+import copy
 import json
 
 
@@ -36,11 +37,27 @@ class Client:
         ls = [value for value in values if isinstance(value, str)] if values else None
         return json.dumps(ls) if ls else None
 
-    def __init__(self, host, username, password):
+    # views returning an ETag, their responses are cached by the client
+    ETAG_VIEW_NAMES = {
+        "font_get",
+        "atomic_element_get",
+        "deep_component_get",
+        "character_glyph_get",
+    }
+
+    def __init__(
+        self, host, username, password, compression=True, etags_cache_size=1000
+    ):
         """
         Initialize a new Robo-CJK API client using the given credentials,
         then authentication is automatically managed by the client,
         no need to do anything.
+        If compression is True, compressed responses are requested using
+        all the encodings supported by the installed libraries (gzip and,
+        if installed, brotli and zstandard).
+        Responses with an ETag are cached (up to etags_cache_size responses)
+        and requested again as conditional requests, if they are not modified
+        the cached response is returned, use 0 to disable the cache.
         """
         if not host or not any(
             host.startswith(protocol) for protocol in ["http://", "https://"]
@@ -59,6 +76,9 @@ class Client:
         self._username = username
         self._password = password
         self._auth_token = None
+        self._compression = compression
+        self._etags_cache = {}
+        self._etags_cache_size = etags_cache_size
         self._connect()
 
     def _connect(self):
@@ -67,6 +87,11 @@ class Client:
 
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         self._session = requests.Session()
+        self._session.headers["Accept-Encoding"] = (
+            urllib3.util.make_headers(accept_encoding=True)["accept-encoding"]
+            if self._compression
+            else "identity"
+        )
 
         try:
             # check if there are robocjk apis available at the given host
@@ -88,6 +113,14 @@ class Client:
         Call an API method by its 'view-name' passing the given params.
         """
         url, data, headers = self._prepare_request(view_name, params)
+        # use the cached response etag (if any) to send a conditional request
+        etag_cache_key = None
+        etag_cache_entry = None
+        if self._etags_cache_size and view_name in self.ETAG_VIEW_NAMES:
+            etag_cache_key = (view_name, json.dumps(data, sort_keys=True))
+            etag_cache_entry = self._etags_cache.get(etag_cache_key)
+            if etag_cache_entry:
+                headers["If-None-Match"] = etag_cache_entry[0]
         # request options
         options = {
             "data": data,
@@ -107,13 +140,26 @@ class Client:
             if self._auth_token:
                 # re-send previously unauthorized request
                 return self._api_call(view_name, params)
+        if response.status_code == 304 and etag_cache_entry:
+            # not modified - return the cached response data
+            return copy.deepcopy(etag_cache_entry[1])
         # read response json data and return dict
         response_data = response.json()
         if response.status_code != 200:
             raise HTTPError(f"{response.status_code} {response_data['error']}")
 
+        etag = response.headers.get("ETag")
+        if etag_cache_key and etag:
+            self._cache_etag_response(etag_cache_key, etag, response_data)
         return response_data
 
+    def _cache_etag_response(self, key, etag, response_data):
+        # least recently cached responses are discarded first
+        self._etags_cache.pop(key, None)
+        while len(self._etags_cache) >= self._etags_cache_size:
+            del self._etags_cache[next(iter(self._etags_cache))]
+        self._etags_cache[key] = (etag, copy.deepcopy(response_data))
+
     def _prepare_request(self, view_name, params):
         # get api absolute url
         url = self._api_url(view_name)
@@ -160,6 +206,7 @@ class Client:
             "glif_list": "/api/glif/list/",
             "glif_lock": "/api/glif/lock/",
             "glif_unlock": "/api/glif/unlock/",
+            "glif_bulk_update": "/api/glif/bulk-update/",
             # Atomic Element
             "atomic_element_list": "/api/atomic-element/list/",
             "atomic_element_get": "/api/atomic-element/get/",
@@ -337,10 +384,15 @@ class Client:
         has_outlines=None,
         has_components=None,
         has_unicode=None,
+        columnar=None,
+        stream=None,
     ):
         """
         Get the lists of Atomic Elements / Deep Components / Character Glyphs
         of a Font according to the given filters.
+        If columnar is True, each list is returned as a dict of columns
+        (a list of values for each field) to reduce the response size.
+        If stream is True, the server streams the response rows while reading them.
         """
         params = {
             "font_uid": font_uid,
@@ -356,6 +408,8 @@ class Client:
             "has_outlines": has_outlines,
             "has_components": has_components,
             "has_unicode": has_unicode,
+            "columnar": columnar,
+            "stream": "json" if stream else None,
         }
         return self._api_call("glif_list", params)
 
@@ -370,10 +424,12 @@ class Client:
         return_related=False,
         return_made_of=False,
         return_used_by=False,
+        return_ids=None,
     ):
         """
         Lock lists of Atomic Elements / Deep Components / Character Glyphs
         of a Font by their id or name.
+        If return_ids is True, only the acquired and refused ids are returned.
         """
         params = {
             "font_uid": font_uid,
@@ -388,6 +444,7 @@ class Client:
             "return_related": return_related,
             "return_made_of": return_made_of,
             "return_used_by": return_used_by,
+            "return_ids": return_ids,
         }
         return self._api_call("glif_lock", params)
 
@@ -402,10 +459,12 @@ class Client:
         return_related=False,
         return_made_of=False,
         return_used_by=False,
+        return_ids=None,
     ):
         """
         Unlock lists of Atomic Elements / Deep Components / Character Glyphs
         of a Font by their id or name.
+        If return_ids is True, only the released and refused ids are returned.
         """
         params = {
             "font_uid": font_uid,
@@ -420,9 +479,30 @@ class Client:
             "return_related": return_related,
             "return_made_of": return_made_of,
             "return_used_by": return_used_by,
+            "return_ids": return_ids,
         }
         return self._api_call("glif_unlock", params)
 
+    def glif_bulk_update(self, font_uid, items, ignore_lock=False, atomic=True):
+        """
+        Create / update many Atomic Elements / Deep Components / Character Glyphs
+        of a Font and their layers in a single request.
+        Each item is a dict containing "type" ("atomic_element", "deep_component"
+        or "character_glyph"), "id" or "name" (defaults to the name in the data),
+        "data" (.glif xml) and / or "layers" (list of dicts containing
+        "group_name" and "data"), glifs not found by name are created.
+        If atomic is True, no item is updated if any item is invalid.
+        A result (status, error, id, name, created, updated, layers) is returned
+        for each item.
+        """
+        params = {
+            "font_uid": font_uid,
+            "items": json.dumps(items),
+            "ignore_lock": ignore_lock,
+            "atomic": atomic,
+        }
+        return self._api_call("glif_bulk_update", params)
+
     def atomic_element_list(
         self,
         font_uid,
@@ -437,9 +517,11 @@ class Client:
         has_outlines=None,
         has_components=None,
         has_unicode=None,
+        stream=None,
     ):
         """
         Get the list of Atomic Elements of a Font according to the given filters.
+        If stream is True, the server streams the response rows while reading them.
         """
         params = {
             "font_uid": font_uid,
@@ -454,6 +536,7 @@ class Client:
             "has_outlines": has_outlines,
             "has_components": has_components,
             "has_unicode": has_unicode,
+            "stream": "json" if stream else None,
         }
         return self._api_call("atomic_element_list", params)
 
@@ -753,9 +836,11 @@ class Client:
         has_outlines=None,
         has_components=None,
         has_unicode=None,
+        stream=None,
     ):
         """
         Get the list of Deep Components of a Font according to the given filters.
+        If stream is True, the server streams the response rows while reading them.
         """
         params = {
             "font_uid": font_uid,
@@ -770,6 +855,7 @@ class Client:
             "has_outlines": has_outlines,
             "has_components": has_components,
             "has_unicode": has_unicode,
+            "stream": "json" if stream else None,
         }
         return self._api_call("deep_component_list", params)
 
@@ -958,9 +1044,11 @@ class Client:
         has_outlines=None,
         has_components=None,
         has_unicode=None,
+        stream=None,
     ):
         """
         Get the list of Character Glyphs of a Font according to the given filters.
+        If stream is True, the server streams the response rows while reading them.
         """
         params = {
             "font_uid": font_uid,
@@ -975,6 +1063,7 @@ class Client:
             "has_outlines": has_outlines,
             "has_components": has_components,
             "has_unicode": has_unicode,
+            "stream": "json" if stream else None,
         }
         return self._api_call("character_glyph_list", params)
 
@@ -12,8 +12,17 @@ from robocjk.api.http import (
     ApiResponseForbidden,
     ApiResponseInternalServerError,
     ApiResponseNotFound,
+    ApiResponseNotModified,
     ApiResponseServiceUnavailableError,
     ApiResponseUnauthorized,
+    get_etag,
+    is_etag_matched,
+)
+from robocjk.api.serializers import (
+    get_atomic_element_prefetch_lookups,
+    get_character_glyph_prefetch_lookups,
+    get_deep_component_prefetch_lookups,
+    get_serialization_options_key,
 )
 from robocjk.core import GlifData
 from robocjk.models import (
@@ -262,14 +271,62 @@ def require_data(view_func):
 #     return wrapper
 
 
+# glif fields changed by any glif update, layers update, lock or unlock
+GLIF_ETAG_FIELDS = [
+    "id",
+    "updated_at",
+    "layers_updated_at",
+    "is_locked",
+    "locked_by_id",
+    "locked_at",
+]
+
+
+def _get_glif_etag(obj_cls, params, obj=None, filters=None):
+    """
+    Get the ETag of a glif response computed from indexed columns only,
+    from the given object or querying them by filters (without loading data).
+    Return None if the response includes related glifs (they can change
+    without changing the glif) or if the glif doesn't exist.
+    """
+    options = get_serialization_options_key(params)
+    if options["return_made_of"] or options["return_used_by"]:
+        return None
+    fields = [field for field in GLIF_ETAG_FIELDS if hasattr(obj_cls, field)]
+    if obj is None:
+        values = obj_cls.objects.filter(**filters).values_list(*fields).first()
+        if values is None:
+            return None
+    else:
+        values = tuple(getattr(obj, field) for field in fields)
+    # the response depends on the serialization options too
+    return get_etag(obj_cls.__name__, values, options)
+
+
+def _get_etag_response(request, response, etag=None):
+    """
+    Set the ETag of a successful api response, if not given it is computed
+    from the response data digest; if it matches the If-None-Match header
+    a not modified response is returned instead.
+    """
+    if response.status_code != 200 or response.streaming:
+        return response
+    etag = etag or get_etag(response.data)
+    if is_etag_matched(request, etag):
+        return ApiResponseNotModified(etag)
+    response.headers["ETag"] = etag
+    return response
+
+
 def require_atomic_element(**kwargs):
     # read decorator options
     select_related = kwargs.get("select_related", ["font", "locked_by"]) or []
-    prefetch_related = (
-        kwargs.get("prefetch_related", ["layers", "deep_components"]) or []
-    )
+    # if not specified, prefetch lookups are planned by serialization options
+    prefetch_related = kwargs.get("prefetch_related", None)
     prefix_params = kwargs.get("prefix_params", False)
     check_locked = kwargs.get("check_locked", False)
+    # if True, the response has an ETag and can be not modified
+    etag = kwargs.get("etag", False)
 
     def decorator(view_func, *args, **kwargs):
         @wraps(view_func)
@@ -292,10 +349,20 @@ def require_atomic_element(**kwargs):
             filters["font__uid"] = kwargs["font"].uid
             # retrieve atomic element object
             obj_cls = AtomicElement
+            # if possible, check the ETag before loading the object data
+            if etag and request.headers.get("If-None-Match"):
+                obj_etag = _get_glif_etag(obj_cls, params, filters=filters)
+                if obj_etag and is_etag_matched(request, obj_etag):
+                    return ApiResponseNotModified(obj_etag)
+            obj_prefetch_related = (
+                get_atomic_element_prefetch_lookups(params)
+                if prefetch_related is None
+                else prefetch_related
+            )
             try:
                 obj = (
                     obj_cls.objects.select_related(*select_related)
-                    .prefetch_related(*prefetch_related)
+                    .prefetch_related(*obj_prefetch_related)
                     .get(**filters)
                 )
             except obj_cls.DoesNotExist:
@@ -316,6 +383,10 @@ def require_atomic_element(**kwargs):
                     )
             # success
             kwargs["atomic_element"] = obj
+            if etag:
+                obj_etag = _get_glif_etag(obj_cls, params, obj=obj)
+                response = view_func(request, *args, **kwargs)
+                return _get_etag_response(request, response, obj_etag)
             return view_func(request, *args, **kwargs)
 
         return inner
@@ -334,7 +405,6 @@ def require_atomic_element_layer(**kwargs):
             check_locked=True,
             prefix_params=True,
             select_related=["font"],
-            prefetch_related=["layers"],
         )
         def inner(request, *args, **kwargs):
             # build query filters
@@ -378,14 +448,12 @@ def require_deep_component(**kwargs):
     # read decorator options
     select_related_defaults = ["font", "locked_by"]
     select_related = kwargs.get("select_related", select_related_defaults) or []
-    prefetch_related_defaults = [
-        "character_glyphs",
-        "atomic_elements",
-        "atomic_elements__layers",
-    ]
-    prefetch_related = kwargs.get("prefetch_related", prefetch_related_defaults) or []
+    # if not specified, prefetch lookups are planned by serialization options
+    prefetch_related = kwargs.get("prefetch_related", None)
     prefix_params = kwargs.get("prefix_params", False)
     check_locked = kwargs.get("check_locked", False)
+    # if True, the response has an ETag and can be not modified
+    etag = kwargs.get("etag", False)
 
     def decorator(view_func, *args, **kwargs):
         @wraps(view_func)
@@ -408,10 +476,20 @@ def require_deep_component(**kwargs):
             filters["font__uid"] = kwargs["font"].uid
             # retrieve deep component object
             obj_cls = DeepComponent
+            # if possible, check the ETag before loading the object data
+            if etag and request.headers.get("If-None-Match"):
+                obj_etag = _get_glif_etag(obj_cls, params, filters=filters)
+                if obj_etag and is_etag_matched(request, obj_etag):
+                    return ApiResponseNotModified(obj_etag)
+            obj_prefetch_related = (
+                get_deep_component_prefetch_lookups(params)
+                if prefetch_related is None
+                else prefetch_related
+            )
             try:
                 obj = (
                     obj_cls.objects.select_related(*select_related)
-                    .prefetch_related(*prefetch_related)
+                    .prefetch_related(*obj_prefetch_related)
                     .get(**filters)
                 )
             except obj_cls.DoesNotExist:
@@ -432,6 +510,10 @@ def require_deep_component(**kwargs):
                     )
             # success
             kwargs["deep_component"] = obj
+            if etag:
+                obj_etag = _get_glif_etag(obj_cls, params, obj=obj)
+                response = view_func(request, *args, **kwargs)
+                return _get_etag_response(request, response, obj_etag)
             return view_func(request, *args, **kwargs)
 
         return inner
@@ -444,15 +526,12 @@ def require_character_glyph(**kwargs):
     # read decorator options
     select_related_defaults = ["font", "locked_by"]
     select_related = kwargs.get("select_related", select_related_defaults) or []
-    prefetch_related_defaults = [
-        "layers",
-        "deep_components",
-        "deep_components__atomic_elements",
-        "deep_components__atomic_elements__layers",
-    ]
-    prefetch_related = kwargs.get("prefetch_related", prefetch_related_defaults) or []
+    # if not specified, prefetch lookups are planned by serialization options
+    prefetch_related = kwargs.get("prefetch_related", None)
     prefix_params = kwargs.get("prefix_params", False)
     check_locked = kwargs.get("check_locked", False)
+    # if True, the response has an ETag and can be not modified
+    etag = kwargs.get("etag", False)
 
     def decorator(view_func, *args, **kwargs):
         @wraps(view_func)
@@ -478,10 +557,20 @@ def require_character_glyph(**kwargs):
             filters["font__uid"] = kwargs["font"].uid
             # retrieve character glyph objecs
             obj_cls = CharacterGlyph
+            # if possible, check the ETag before loading the object data
+            if etag and request.headers.get("If-None-Match"):
+                obj_etag = _get_glif_etag(obj_cls, params, filters=filters)
+                if obj_etag and is_etag_matched(request, obj_etag):
+                    return ApiResponseNotModified(obj_etag)
+            obj_prefetch_related = (
+                get_character_glyph_prefetch_lookups(params)
+                if prefetch_related is None
+                else prefetch_related
+            )
             try:
                 obj = (
                     obj_cls.objects.select_related(*select_related)
-                    .prefetch_related(*prefetch_related)
+                    .prefetch_related(*obj_prefetch_related)
                     .get(**filters)
                 )
             except obj_cls.DoesNotExist:
@@ -502,6 +591,10 @@ def require_character_glyph(**kwargs):
                     )
             # success
             kwargs["character_glyph"] = obj
+            if etag:
+                obj_etag = _get_glif_etag(obj_cls, params, obj=obj)
+                response = view_func(request, *args, **kwargs)
+                return _get_etag_response(request, response, obj_etag)
             return view_func(request, *args, **kwargs)
 
         return inner
@@ -520,7 +613,6 @@ def require_character_glyph_layer(**kwargs):
             check_locked=True,
             prefix_params=True,
             select_related=["font"],
-            prefetch_related=["layers"],
         )
         def inner(request, *args, **kwargs):
             # build query filters
@@ -1,13 +1,68 @@
 from datetime import datetime
 
 from django.conf import settings
-from django.http import JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+
+from robocjk.debug import logger
+from robocjk.utils import get_digest
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ApiJSONEncoder(DjangoJSONEncoder):
+    """
+    Encodes using orjson (if installed) which is much faster than the json module,
+    datetimes are passed through to the DjangoJSONEncoder.default method
+    to keep the same output format.
+    """
+
+    def encode(self, o):
+        if orjson is None or self.indent is not None:
+            return super().encode(o)
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(o, default=self.default, option=option).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # eg. integers exceeding 64-bit
+            return super().encode(o)
+
+
+def get_etag(*values):
+    """
+    Get a strong ETag computed from the digest of the given json serializable values.
+    """
+    return quote_etag(get_digest(ApiJSONEncoder(sort_keys=True).encode(values)))
+
+
+def is_etag_matched(request, etag):
+    """
+    Check if the given ETag matches the If-None-Match request header
+    (using weak comparison, compressed responses have weak ETags).
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    if "*" in etags:
+        return True
+    etag = etag.removeprefix("W/")
+    return any(
+        etag == if_none_match_etag.removeprefix("W/") for if_none_match_etag in etags
+    )
 
 
 class ApiResponse(JsonResponse):
+    data = None
     error = None
 
-    def __init__(self, data=None, status=None, error=None):
+    def __init__(self, data=None, status=None, error=None, sort_keys=True):
         super().__init__(
             data={
                 "data": data,
@@ -17,10 +72,12 @@ class ApiResponse(JsonResponse):
                 "server_timezone": settings.TIME_ZONE,
             },
             status=status,
+            encoder=ApiJSONEncoder,
             json_dumps_params={
-                "sort_keys": True,
+                "sort_keys": sort_keys,
             },
         )
+        self.data = data
         self.error = error
 
     def _format_error(self, prefix, message=""):
@@ -28,8 +85,112 @@ class ApiResponse(JsonResponse):
 
 
 class ApiResponseSuccess(ApiResponse):
-    def __init__(self, data):
-        super().__init__(data=data, status=200, error=None)
+    def __init__(self, data, sort_keys=True, etag=None):
+        super().__init__(data=data, status=200, error=None, sort_keys=sort_keys)
+        if etag:
+            self.headers["ETag"] = etag
+
+
+class ApiResponseNotModified(HttpResponseNotModified):
+    """
+    Returned (without content) when the ETag of the response matches
+    the If-None-Match request header, the client already has the current data.
+    """
+
+    def __init__(self, etag):
+        super().__init__()
+        self.headers["ETag"] = etag
+
+
+class ApiResponseStream(StreamingHttpResponse):
+    """
+    Streams the same json of ApiResponseSuccess, data can be an iterable of rows
+    or a dict of iterables of rows (eg. querysets iterators), rows are encoded
+    and sent in chunks, so the whole data is never kept in memory.
+    """
+
+    content_type = "application/json"
+
+    def __init__(self, data, sort_keys=True, chunk_size=None):
+        self._encoder = ApiJSONEncoder(sort_keys=sort_keys)
+        self._chunk_size = chunk_size or settings.ROBOCJK_API_STREAM_CHUNK_SIZE
+        super().__init__(
+            self._iterate_content(data),
+            content_type=self.content_type,
+            status=200,
+        )
+
+    def _iterate_content(self, data):
+        try:
+            yield from self._iterate_chunks(data)
+        except Exception:
+            # headers have already been sent, the client receives truncated data
+            logger.exception("Error while streaming api response.")
+            raise
+
+    def _iterate_chunks(self, data):
+        # data is the first key of the envelope, both sorted and unsorted
+        envelope = self._encoder.encode(
+            {
+                "status": 200,
+                "error": None,
+                "server_datetime": datetime.now(),
+                "server_timezone": settings.TIME_ZONE,
+            }
+        )
+        yield '{"data":'
+        if isinstance(data, dict):
+            keys = sorted(data.keys()) if self._encoder.sort_keys else data.keys()
+            separator = "{"
+            for key in keys:
+                yield f"{separator}{self._encoder.encode(key)}:"
+                yield from self._iterate_rows_chunks(data[key])
+                separator = ","
+            yield "}" if separator == "," else "{}"
+        else:
+            yield from self._iterate_rows_chunks(data)
+        yield f",{envelope[1:]}"
+
+    def _iterate_rows_chunks(self, rows):
+        yield "["
+        separator = ""
+        for chunk in self._iterate_encoded_rows_chunks(rows):
+            yield separator + ",".join(chunk)
+            separator = ","
+        yield "]"
+
+    def _iterate_encoded_rows_chunks(self, rows):
+        chunk = []
+        for row in rows:
+            chunk.append(self._encoder.encode(row))
+            if len(chunk) >= self._chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class ApiResponseNDJSONStream(ApiResponseStream):
+    """
+    Streams the data rows as newline delimited json (one row per line),
+    if data is a dict of iterables of rows each row has a "list" key
+    with the name of the list it belongs to.
+    """
+
+    content_type = "application/x-ndjson"
+
+    def _iterate_chunks(self, data):
+        if isinstance(data, dict):
+            for key, rows in data.items():
+                yield from self._iterate_rows_chunks(
+                    {"list": key, **row} for row in rows
+                )
+        else:
+            yield from self._iterate_rows_chunks(data)
+
+    def _iterate_rows_chunks(self, rows):
+        for chunk in self._iterate_encoded_rows_chunks(rows):
+            yield "\n".join(chunk) + "\n"
 
 
 class ApiResponseError(ApiResponse):
@@ -0,0 +1,187 @@
+import gzip
+import zlib
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def _gzip_compress(data, level):
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _gzip_compress_sequence(sequence, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in sequence:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _brotli_compress(data, level):
+    return brotli.compress(data, quality=level)
+
+
+def _brotli_compress_sequence(sequence, level):
+    compressor = brotli.Compressor(quality=level)
+    for chunk in sequence:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def _zstd_compress(data, level):
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _zstd_compress_sequence(sequence, level):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    for chunk in sequence:
+        data = compressor.compress(chunk) + compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# encoding: (compress function, compress sequence function)
+COMPRESSION_CODECS = {
+    "gzip": (_gzip_compress, _gzip_compress_sequence),
+}
+if brotli is not None:
+    COMPRESSION_CODECS["br"] = (_brotli_compress, _brotli_compress_sequence)
+if zstandard is not None:
+    COMPRESSION_CODECS["zstd"] = (_zstd_compress, _zstd_compress_sequence)
+
+
+def get_compression_encodings():
+    """
+    Get the enabled compression encodings (ordered by server preference)
+    excluding the ones with missing optional dependencies.
+    """
+    return [
+        encoding
+        for encoding in settings.ROBOCJK_API_COMPRESSION_ENCODINGS
+        if encoding in COMPRESSION_CODECS
+    ]
+
+
+def get_compression_options(url_name):
+    """
+    Get the compression min size and levels for the api endpoint
+    with the given url name (default options updated with endpoint ones).
+    """
+    options = {
+        "min_size": settings.ROBOCJK_API_COMPRESSION_MIN_SIZE,
+        "gzip": settings.ROBOCJK_API_COMPRESSION_GZIP_LEVEL,
+        "br": settings.ROBOCJK_API_COMPRESSION_BR_LEVEL,
+        "zstd": settings.ROBOCJK_API_COMPRESSION_ZSTD_LEVEL,
+    }
+    options.update(settings.ROBOCJK_API_COMPRESSION_ENDPOINTS.get(url_name, {}))
+    return options
+
+
+def parse_accept_encoding(value):
+    """
+    Parse the Accept-Encoding header value and return a dict
+    containing the quality value of each encoding.
+    """
+    encodings = {}
+    for item in value.split(","):
+        encoding, _, params = item.strip().partition(";")
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        quality = 1.0
+        param_key, _, param_value = params.strip().partition("=")
+        if param_key.strip().lower() == "q":
+            try:
+                quality = float(param_value)
+            except ValueError:
+                quality = 0.0
+        encodings[encoding] = quality
+    return encodings
+
+
+def negotiate_encoding(value, encodings):
+    """
+    Get the encoding with the highest quality value in the Accept-Encoding
+    header value among the given encodings (ties are resolved by their order),
+    None if none of them is acceptable.
+    """
+    accepted_encodings = parse_accept_encoding(value)
+    best_encoding = None
+    best_quality = 0.0
+    for encoding in encodings:
+        quality = accepted_encodings.get(encoding, accepted_encodings.get("*", 0.0))
+        if quality > best_quality:
+            best_encoding = encoding
+            best_quality = quality
+    return best_encoding
+
+
+class ApiCompressionMiddleware(GZipMiddleware):
+    """
+    Compress api responses using the best encoding (zstd, br or gzip)
+    accepted by the client, with min size and levels configurable per endpoint;
+    other responses are compressed by the GZipMiddleware.
+    """
+
+    def process_response(self, request, response):
+        resolver_match = getattr(request, "resolver_match", None)
+        is_api_view = resolver_match and getattr(resolver_match.func, "api_view", False)
+        if not is_api_view or (response.streaming and response.is_async):
+            return super().process_response(request, response)
+
+        # avoid compressing if the response has already got a content-encoding
+        if response.has_header("Content-Encoding"):
+            return response
+
+        options = get_compression_options(resolver_match.url_name)
+        if not response.streaming and len(response.content) < options["min_size"]:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            get_compression_encodings(),
+        )
+        if not encoding:
+            return response
+
+        level = options[encoding]
+        compress, compress_sequence = COMPRESSION_CODECS[encoding]
+        if response.streaming:
+            response.streaming_content = compress_sequence(
+                response.streaming_content, level
+            )
+            # the compressed content size is unknown until it's streamed
+            del response.headers["Content-Length"]
+        else:
+            # return the compressed content only if it's actually shorter
+            compressed_content = compress(response.content, level)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(response.content))
+
+        # weaken strong etag to allow conditional requests matches
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -1,4 +1,6 @@
 from benedict import benedict
+from django.apps import apps
+from django.db.models import Prefetch
 
 USER_FIELDS = [
     "id",
@@ -154,6 +156,24 @@ def _get_serialization_options(options):
     return options
 
 
+def get_serialization_options_key(options=None):
+    """
+    Get the normalized serialization options which affect the serialized data
+    (eg. to be included in cache keys or ETags), the given options are not changed.
+    """
+    options = _get_serialization_options(dict(options or {}))
+    return {
+        key: options[key]
+        for key in [
+            "exclude_fields",
+            "return_data",
+            "return_layers",
+            "return_made_of",
+            "return_used_by",
+        ]
+    }
+
+
 def _serialize_object(obj, fields, options):
     exclude_fields = options["exclude_fields"]
     return {
@@ -181,6 +201,93 @@ def _serialize_glif_layer(obj, fields, options):
     return data
 
 
+def _serialize_related_values(obj, related_name, fields):
+    # reuse the prefetched objects (if any) instead of querying the values again
+    if related_name in getattr(obj, "_prefetched_objects_cache", {}):
+        return [
+            {field: getattr(related_obj, field) for field in fields}
+            for related_obj in getattr(obj, related_name).all()
+        ]
+    return list(getattr(obj, related_name).values(*fields))
+
+
+def _get_only_prefetch(lookup, model_name, fields):
+    model = apps.get_model("robocjk", model_name)
+    return Prefetch(lookup, queryset=model.objects.only(*fields))
+
+
+def get_atomic_element_prefetch_lookups(options=None, prefix=""):
+    """
+    Get the prefetch_related lookups needed to serialize atomic elements
+    with the given options without running queries for each object.
+    """
+    options = _get_serialization_options(options)
+    lookups = [f"{prefix}locked_by"] if prefix else []
+    if options["return_layers"]:
+        lookups += [f"{prefix}layers"]
+    if options["return_used_by"]:
+        lookups += [
+            _get_only_prefetch(
+                f"{prefix}deep_components", "DeepComponent", DEEP_COMPONENT_ID_FIELDS
+            )
+        ]
+    return lookups
+
+
+def get_deep_component_prefetch_lookups(options=None, prefix=""):
+    """
+    Get the prefetch_related lookups needed to serialize deep components
+    with the given options without running queries for each object.
+    """
+    options = _get_serialization_options(options)
+    lookups = [f"{prefix}locked_by"] if prefix else []
+    if options["return_made_of"]:
+        lookups += [f"{prefix}atomic_elements"]
+        lookups += get_atomic_element_prefetch_lookups(
+            options, prefix=f"{prefix}atomic_elements__"
+        )
+    if options["return_used_by"]:
+        lookups += [
+            _get_only_prefetch(
+                f"{prefix}character_glyphs",
+                "CharacterGlyph",
+                CHARACTER_GLYPH_ID_FIELDS,
+            )
+        ]
+    return lookups
+
+
+def get_character_glyph_prefetch_lookups(options=None, prefix="", depth=0):
+    """
+    Get the prefetch_related lookups needed to serialize character glyphs
+    with the given options without running queries for each object,
+    character glyphs made of character glyphs are planned for one level.
+    """
+    options = _get_serialization_options(options)
+    lookups = [f"{prefix}locked_by"] if prefix else []
+    if options["return_layers"]:
+        lookups += [f"{prefix}layers"]
+    if options["return_made_of"]:
+        lookups += [f"{prefix}character_glyphs"]
+        if depth < 1:
+            lookups += get_character_glyph_prefetch_lookups(
+                options, prefix=f"{prefix}character_glyphs__", depth=(depth + 1)
+            )
+        lookups += [f"{prefix}deep_components"]
+        lookups += get_deep_component_prefetch_lookups(
+            options, prefix=f"{prefix}deep_components__"
+        )
+    if options["return_used_by"]:
+        lookups += [
+            _get_only_prefetch(
+                f"{prefix}used_by_character_glyphs",
+                "CharacterGlyph",
+                CHARACTER_GLYPH_ID_FIELDS,
+            )
+        ]
+    return lookups
+
+
 def serialize_user(obj, options=None):
     options = _get_serialization_options(options)
     data = _serialize_object(obj, USER_FIELDS, options)
@@ -230,11 +337,13 @@ def serialize_atomic_element(obj, options=None):
             if return_data
             else ATOMIC_ELEMENT_LAYER_ID_FIELDS
         )
-        data["layers"] = list(obj.layers.values(*layers_fields))
+        data["layers"] = _serialize_related_values(obj, "layers", layers_fields)
     if return_made_of:
         data["made_of"] = []
     if return_used_by:
-        data["used_by"] = list(obj.deep_components.values(*DEEP_COMPONENT_ID_FIELDS))
+        data["used_by"] = _serialize_related_values(
+            obj, "deep_components", DEEP_COMPONENT_ID_FIELDS
+        )
     return data
 
 
@@ -266,7 +375,9 @@ def serialize_deep_component(obj, options=None):
         ]
 
     if return_used_by:
-        data["used_by"] = list(obj.character_glyphs.values(*CHARACTER_GLYPH_ID_FIELDS))
+        data["used_by"] = _serialize_related_values(
+            obj, "character_glyphs", CHARACTER_GLYPH_ID_FIELDS
+        )
     return data
 
 
@@ -286,7 +397,7 @@ def serialize_character_glyph(obj, options=None):
             if return_data
             else CHARACTER_GLYPH_LAYER_ID_FIELDS
         )
-        data["layers"] = list(obj.layers.values(*layers_fields))
+        data["layers"] = _serialize_related_values(obj, "layers", layers_fields)
     if return_made_of:
         made_of_character_glyphs = []
         # create a set for storing character-glyphs ids to avoid possible circular references
@@ -308,8 +419,8 @@ def serialize_character_glyph(obj, options=None):
 
         data["made_of"] = made_of_character_glyphs + made_of_deep_components
     if return_used_by:
-        used_by_character_glyphs = list(
-            obj.used_by_character_glyphs.values(*CHARACTER_GLYPH_ID_FIELDS)
+        used_by_character_glyphs = _serialize_related_values(
+            obj, "used_by_character_glyphs", CHARACTER_GLYPH_ID_FIELDS
         )
         data["used_by"] = used_by_character_glyphs
     return data
@@ -322,3 +433,13 @@ def serialize_character_glyph_layer(obj, options=None):
         CHARACTER_GLYPH_LAYER_FIELDS if return_data else CHARACTER_GLYPH_LAYER_ID_FIELDS
     )
     return _serialize_glif_layer(obj, fields, options)
+
+
+def serialize_columns(queryset, fields):
+    """
+    Serialize the queryset rows as columns: a list of values for each field,
+    values at the same index belong to the same row.
+    """
+    rows = queryset.values_list(*fields)
+    columns = list(zip(*rows)) or [()] * len(fields)
+    return {field: list(values) for field, values in zip(fields, columns)}
@@ -37,6 +37,7 @@ from robocjk.api.views import (
     font_get,
     font_list,
     font_update,
+    glif_bulk_update,
     glif_list,
     glif_lock,
     glif_unlock,
@@ -93,6 +94,7 @@ urlpatterns = [
     path("api/glif/list/", glif_list, name="glif_list"),
     path("api/glif/lock/", glif_lock, name="glif_lock"),
     path("api/glif/unlock/", glif_unlock, name="glif_unlock"),
+    path("api/glif/bulk-update/", glif_bulk_update, name="glif_bulk_update"),
     # Atomic Element
     path("api/atomic-element/list/", atomic_element_list, name="atomic_element_list"),
     path("api/atomic-element/get/", atomic_element_get, name="atomic_element_get"),
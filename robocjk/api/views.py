@@ -24,7 +24,12 @@ from robocjk.api.decorators import (
 from robocjk.api.http import (
     ApiResponseBadRequest,
     ApiResponseForbidden,
+    ApiResponseNDJSONStream,
+    ApiResponseNotModified,
+    ApiResponseStream,
     ApiResponseSuccess,
+    get_etag,
+    is_etag_matched,
 )
 from robocjk.api.serializers import (
     ATOMIC_ELEMENT_ID_FIELDS,
@@ -34,10 +39,15 @@ from robocjk.api.serializers import (
     FONT_FIELDS,
     PROJECT_FIELDS,
     USER_FIELDS,
+    get_atomic_element_prefetch_lookups,
+    get_character_glyph_prefetch_lookups,
+    get_deep_component_prefetch_lookups,
+    serialize_columns,
     serialize_user,
     serialize_user_group,
     serialize_user_permission,
 )
+from robocjk.core import GlifData
 from robocjk.models import (
     AtomicElement,
     AtomicElementLayer,
@@ -54,6 +64,37 @@ from robocjk.validators import GitSSHRepositoryURLValidator
 
 UserClass = get_user_model()
 
+API_STREAM_RESPONSES = {
+    "json": ApiResponseStream,
+    "ndjson": ApiResponseNDJSONStream,
+}
+
+
+def _get_stream_response(params, data):
+    stream = params.get_str("stream")
+    response_class = API_STREAM_RESPONSES.get(stream)
+    if response_class is None:
+        return ApiResponseBadRequest(
+            "Invalid parameter 'stream': {} -> allowed values: {}".format(
+                stream, ", ".join(API_STREAM_RESPONSES.keys())
+            )
+        )
+    return response_class(data)
+
+
+def _iterate_values(queryset, fields):
+    return queryset.values(*fields).iterator(
+        chunk_size=settings.ROBOCJK_API_STREAM_CHUNK_SIZE
+    )
+
+
+def _iterate_character_glyphs_values(queryset):
+    # unicodes are precomputed on save, added only if the glif has a unicode
+    for values in _iterate_values(queryset, [*CHARACTER_GLYPH_ID_FIELDS, "unicodes"]):
+        if not values["unicode_hex"]:
+            del values["unicodes"]
+        yield values
+
 
 @api_view
 def ping(request, params, *args, **kwargs):
@@ -209,7 +250,10 @@ def font_list(request, params, user, project, *args, **kwargs):
 @require_user
 @require_font
 def font_get(request, params, user, font, *args, **kwargs):
-    return ApiResponseSuccess(font.serialize())
+    etag = get_etag("Font", font.uid, font.updated_at, font.available)
+    if is_etag_matched(request, etag):
+        return ApiResponseNotModified(etag)
+    return ApiResponseSuccess(font.serialize(), etag=etag)
 
 
 @api_view
@@ -315,6 +359,44 @@ def glif_list(request, params, user, font, glif_filters, *args, **kwargs):
             Q(updated_at__gt=updated_since) | Q(layers_updated_at__gt=updated_since)
         )
 
+    if params.get_bool("columnar", False):
+        # lightweight response: a list of values for each field (no repeated keys),
+        # unicodes are precomputed on save and keys sorting is skipped
+        data = {
+            "atomic_elements": serialize_columns(
+                atomic_elements_qs, ATOMIC_ELEMENT_ID_FIELDS
+            ),
+            "deep_components": serialize_columns(
+                deep_components_qs, DEEP_COMPONENT_ID_FIELDS
+            ),
+            "character_glyphs": serialize_columns(
+                character_glyphs_qs, [*CHARACTER_GLYPH_ID_FIELDS, "unicodes"]
+            ),
+        }
+        if updated_since:
+            deleted_glifs_qs = font.deleted_glifs.filter(deleted_at__gt=updated_since)
+            data["deleted_glifs"] = serialize_columns(
+                deleted_glifs_qs, DELETED_GLIF_ID_FIELDS
+            )
+        return ApiResponseSuccess(data, sort_keys=False)
+
+    if params.get_str("stream"):
+        data = {
+            "atomic_elements": _iterate_values(
+                atomic_elements_qs, ATOMIC_ELEMENT_ID_FIELDS
+            ),
+            "deep_components": _iterate_values(
+                deep_components_qs, DEEP_COMPONENT_ID_FIELDS
+            ),
+            "character_glyphs": _iterate_character_glyphs_values(character_glyphs_qs),
+        }
+        if updated_since:
+            deleted_glifs_qs = font.deleted_glifs.filter(deleted_at__gt=updated_since)
+            data["deleted_glifs"] = _iterate_values(
+                deleted_glifs_qs, DELETED_GLIF_ID_FIELDS
+            )
+        return _get_stream_response(params, data)
+
     atomic_elements_qs = atomic_elements_qs.values(*ATOMIC_ELEMENT_ID_FIELDS)
     atomic_elements_list = list(atomic_elements_qs)
 
@@ -353,33 +435,28 @@ def glif_list(request, params, user, font, glif_filters, *args, **kwargs):
     return ApiResponseSuccess(data)
 
 
-@api_view
-@require_user
-@require_font
-def glif_lock(request, params, user, font, *args, **kwargs):
+def _get_glifs_querysets_by_params(params, font):
     atomic_elements_ids = params.get_int_list("atomic_elements_ids")
     atomic_elements_names = params.get_str_list("atomic_elements_names")
-    atomic_elements_list = []
+    atomic_elements_qs = font.atomic_elements.none()
 
     deep_components_ids = params.get_int_list("deep_components_ids")
     deep_components_names = params.get_str_list("deep_components_names")
-    deep_components_list = []
+    deep_components_qs = font.deep_components.none()
 
     character_glyphs_ids = params.get_int_list("character_glyphs_ids")
     character_glyphs_names = params.get_str_list("character_glyphs_names")
-    character_glyphs_list = []
+    character_glyphs_qs = font.character_glyphs.none()
 
     if atomic_elements_ids or atomic_elements_names:
         atomic_elements_qs = font.atomic_elements.filter(
             Q(id__in=atomic_elements_ids) | Q(name__in=atomic_elements_names)
         )
-        atomic_elements_list = list(atomic_elements_qs)
 
     if deep_components_ids or deep_components_names:
         deep_components_qs = font.deep_components.filter(
             Q(id__in=deep_components_ids) | Q(name__in=deep_components_names)
         )
-        deep_components_list = list(deep_components_qs)
 
     if character_glyphs_ids or character_glyphs_names:
         # fmt: off
@@ -389,26 +466,38 @@ def glif_lock(request, params, user, font, *args, **kwargs):
             Q(unicode_hex__in=character_glyphs_names)
         )
         # fmt: on
-        character_glyphs_list = list(character_glyphs_qs)
 
-    glif_list = atomic_elements_list + deep_components_list + character_glyphs_list
-    for glif_obj in glif_list:
-        glif_obj.lock_by(user, save=True)
+    return {
+        "atomic_elements": atomic_elements_qs,
+        "deep_components": deep_components_qs,
+        "character_glyphs": character_glyphs_qs,
+    }
 
-    data = {
-        "atomic_elements": [
-            atomic_element_obj.serialize(options=params)
-            for atomic_element_obj in atomic_elements_list
-        ],
-        "deep_components": [
-            deep_components_obj.serialize(options=params)
-            for deep_components_obj in deep_components_list
-        ],
-        "character_glyphs": [
-            character_glyphs_obj.serialize(options=params)
-            for character_glyphs_obj in character_glyphs_list
-        ],
+
+def _serialize_glifs_queryset(glifs_qs, params):
+    prefetch_lookups_getters = {
+        AtomicElement: get_atomic_element_prefetch_lookups,
+        DeepComponent: get_deep_component_prefetch_lookups,
+        CharacterGlyph: get_character_glyph_prefetch_lookups,
     }
+    prefetch_lookups = prefetch_lookups_getters[glifs_qs.model](params)
+    glifs_qs = glifs_qs.select_related("locked_by").prefetch_related(*prefetch_lookups)
+    return [glif_obj.serialize(options=params) for glif_obj in glifs_qs]
+
+
+@api_view
+@require_user
+@require_font
+def glif_lock(request, params, user, font, *args, **kwargs):
+    glifs_querysets = _get_glifs_querysets_by_params(params, font)
+    data = {}
+    for key, glifs_qs in glifs_querysets.items():
+        # lock all the unlocked glifs with a single update query per model
+        acquired_ids, refused_ids = glifs_qs.model.lock_queryset_by(glifs_qs, user)
+        if params.get_bool("return_ids", False):
+            data[key] = {"acquired": acquired_ids, "refused": refused_ids}
+        else:
+            data[key] = _serialize_glifs_queryset(glifs_qs, params)
     return ApiResponseSuccess(data)
 
 
@@ -416,59 +505,317 @@ def glif_lock(request, params, user, font, *args, **kwargs):
 @require_user
 @require_font
 def glif_unlock(request, params, user, font, *args, **kwargs):
-    atomic_elements_ids = params.get_int_list("atomic_elements_ids")
-    atomic_elements_names = params.get_str_list("atomic_elements_names")
-    atomic_elements_list = []
+    glifs_querysets = _get_glifs_querysets_by_params(params, font)
+    data = {}
+    for key, glifs_qs in glifs_querysets.items():
+        # unlock all the glifs locked by user with a single update query per model
+        released_ids, refused_ids = glifs_qs.model.unlock_queryset_by(glifs_qs, user)
+        if params.get_bool("return_ids", False):
+            data[key] = {"released": released_ids, "refused": refused_ids}
+        else:
+            data[key] = _serialize_glifs_queryset(glifs_qs, params)
+    return ApiResponseSuccess(data)
 
-    deep_components_ids = params.get_int_list("deep_components_ids")
-    deep_components_names = params.get_str_list("deep_components_names")
-    deep_components_list = []
 
-    character_glyphs_ids = params.get_int_list("character_glyphs_ids")
-    character_glyphs_names = params.get_str_list("character_glyphs_names")
-    character_glyphs_list = []
+# glif type: (glif model, glif layer model)
+GLIF_BULK_UPDATE_MODELS = {
+    "atomic_element": (AtomicElement, AtomicElementLayer),
+    "deep_component": (DeepComponent, None),
+    "character_glyph": (CharacterGlyph, CharacterGlyphLayer),
+}
 
-    if atomic_elements_ids or atomic_elements_names:
-        atomic_elements_qs = font.atomic_elements.filter(
-            Q(id__in=atomic_elements_ids) | Q(name__in=atomic_elements_names)
-        )
-        atomic_elements_list = list(atomic_elements_qs)
 
-    if deep_components_ids or deep_components_names:
-        deep_components_qs = font.deep_components.filter(
-            Q(id__in=deep_components_ids) | Q(name__in=deep_components_names)
+def _set_glif_bulk_update_item_error(item, status, error):
+    item["result"]["status"] = status
+    item["result"]["error"] = error
+    return item
+
+
+def _parse_glif_bulk_update_data(data):
+    if not isinstance(data, str):
+        return None, 'Invalid item "data", data must be a .glif xml string.'
+    glif = GlifData()
+    glif.parse_string(data)
+    if not glif.ok:
+        return None, (
+            'Invalid item "data", data must be a valid .glif xml file - {}.'.format(
+                str(glif.error)
+            )
+        )
+    return glif, None
+
+
+def _parse_glif_bulk_update_item(index, item_params):  # noqa: C901
+    result = {
+        "index": index,
+        "type": None,
+        "id": None,
+        "name": None,
+        "status": 200,
+        "error": None,
+        "created": False,
+        "updated": False,
+        "layers": [],
+    }
+    item = {"result": result}
+    if not isinstance(item_params, dict):
+        return _set_glif_bulk_update_item_error(
+            item, 400, "Invalid item, item must be an object."
         )
-        deep_components_list = list(deep_components_qs)
 
-    if character_glyphs_ids or character_glyphs_names:
-        # fmt: off
-        character_glyphs_qs = font.character_glyphs.filter(
-            Q(id__in=character_glyphs_ids) |
-            Q(name__in=character_glyphs_names) |
-            Q(unicode_hex__in=character_glyphs_names)
+    glif_type = item_params.get("type")
+    if glif_type not in GLIF_BULK_UPDATE_MODELS:
+        return _set_glif_bulk_update_item_error(
+            item,
+            400,
+            'Invalid item "type", type must be one of: {}.'.format(
+                ", ".join(GLIF_BULK_UPDATE_MODELS.keys())
+            ),
         )
-        # fmt: on
-        character_glyphs_list = list(character_glyphs_qs)
+    result["type"] = glif_type
+    glif_cls, layer_cls = GLIF_BULK_UPDATE_MODELS[glif_type]
+    item["glif_cls"] = glif_cls
+    item["layer_cls"] = layer_cls
+
+    data = item_params.get("data")
+    layers_params = item_params.get("layers") or []
+    if not data and not layers_params:
+        return _set_glif_bulk_update_item_error(
+            item, 400, 'Missing item "data" or "layers".'
+        )
+    item["data"] = data
+    item["glif"] = None
+    if data:
+        item["glif"], error = _parse_glif_bulk_update_data(data)
+        if error:
+            return _set_glif_bulk_update_item_error(item, 400, error)
+
+    item["layers"] = []
+    item["layers_objs"] = []
+    if layers_params:
+        if not layer_cls:
+            return _set_glif_bulk_update_item_error(
+                item, 400, f'Invalid item "layers", {glif_type} has no layers.'
+            )
+        if not isinstance(layers_params, list):
+            return _set_glif_bulk_update_item_error(
+                item, 400, 'Invalid item "layers", layers must be a list.'
+            )
+        for layer_params in layers_params:
+            layer_group_name = (
+                layer_params.get("group_name")
+                if isinstance(layer_params, dict)
+                else None
+            )
+            if not layer_group_name or not isinstance(layer_group_name, str):
+                return _set_glif_bulk_update_item_error(
+                    item,
+                    400,
+                    'Invalid item "layers", each layer must have a "group_name".',
+                )
+            if any(layer_group_name == group_name for group_name, _ in item["layers"]):
+                return _set_glif_bulk_update_item_error(
+                    item,
+                    400,
+                    f'Invalid item "layers", duplicate group_name "{layer_group_name}".',
+                )
+            layer_data = layer_params.get("data")
+            _, error = _parse_glif_bulk_update_data(layer_data)
+            if error:
+                return _set_glif_bulk_update_item_error(
+                    item, 400, f'Invalid layer "{layer_group_name}" - {error}'
+                )
+            item["layers"].append((layer_group_name, layer_data))
+
+    glif_id = item_params.get("id")
+    glif_name = item_params.get("name") or (item["glif"].name if data else None)
+    if glif_id is not None and not isinstance(glif_id, int):
+        return _set_glif_bulk_update_item_error(
+            item, 400, 'Invalid item "id", id must be an integer.'
+        )
+    if glif_id is None and not glif_name:
+        return _set_glif_bulk_update_item_error(
+            item, 400, 'Missing item "id" or "name".'
+        )
+    result["id"] = glif_id
+    result["name"] = glif_name
+    return item
+
+
+def _resolve_glif_bulk_update_items(items, font, user, ignore_lock):  # noqa: C901
+    for glif_cls, layer_cls in GLIF_BULK_UPDATE_MODELS.values():
+        glif_items = [
+            item
+            for item in items
+            if not item["result"]["error"] and item["glif_cls"] is glif_cls
+        ]
+        if not glif_items:
+            continue
+
+        # retrieve all the glifs of the model with a single query
+        glifs_ids = set()
+        glifs_names = set()
+        for item in glif_items:
+            if item["result"]["id"] is not None:
+                glifs_ids.add(item["result"]["id"])
+            else:
+                glifs_names.add(item["result"]["name"])
+            if item["glif"]:
+                glifs_names.add(item["glif"].name)
+        glifs_qs = glif_cls.objects.filter(font=font).filter(
+            Q(id__in=glifs_ids) | Q(name__in=glifs_names)
+        )
+        glifs_by_id = {}
+        glifs_by_name = {}
+        for glif_obj in glifs_qs:
+            glifs_by_id[glif_obj.id] = glif_obj
+            glifs_by_name[glif_obj.name] = glif_obj
+
+        glifs_keys = set()
+        for item in glif_items:
+            result = item["result"]
+            glif_id = result["id"]
+            glif_name = result["name"]
+            glif_obj = (
+                glifs_by_id.get(glif_id)
+                if glif_id is not None
+                else glifs_by_name.get(glif_name)
+            )
+            if glif_obj:
+                if not ignore_lock and not glif_obj.is_locked_by(user):
+                    _set_glif_bulk_update_item_error(
+                        item, 403, "Glif object must be locked by the current user."
+                    )
+                    continue
+            elif glif_id is not None or not item["glif"]:
+                _set_glif_bulk_update_item_error(
+                    item,
+                    404,
+                    f"Glif object with id='{glif_id}' and name='{glif_name}' not found.",
+                )
+                continue
+            # glifs are identified by name in the font, new names must be unique
+            new_glif_name = item["glif"].name if item["glif"] else glif_obj.name
+            new_glif_obj = glifs_by_name.get(new_glif_name)
+            if new_glif_obj and new_glif_obj is not glif_obj:
+                _set_glif_bulk_update_item_error(
+                    item,
+                    400,
+                    f"Glif object with name='{new_glif_name}' already exists.",
+                )
+                continue
+            glif_keys = {("name", new_glif_name)}
+            if glif_obj:
+                glif_keys.add(("id", glif_obj.id))
+            if glif_keys & glifs_keys:
+                _set_glif_bulk_update_item_error(
+                    item,
+                    400,
+                    "Duplicate item, glif is already updated by another item.",
+                )
+                continue
+            glifs_keys.update(glif_keys)
+            if not glif_obj:
+                glif_obj = glif_cls(font=font)
+                result["created"] = True
+            item["glif_obj"] = glif_obj
+
+        # retrieve all the existing layers of the model glifs with a single query
+        if not layer_cls:
+            continue
+        layers_glifs_ids = [
+            item["glif_obj"].id
+            for item in glif_items
+            if not item["result"]["error"]
+            and item["layers"]
+            and not item["result"]["created"]
+        ]
+        layers_by_key = {}
+        if layers_glifs_ids:
+            layers_qs = layer_cls.objects.filter(glif_id__in=layers_glifs_ids)
+            for layer_obj in layers_qs:
+                layers_by_key[(layer_obj.glif_id, layer_obj.group_name)] = layer_obj
+        for item in glif_items:
+            if item["result"]["error"]:
+                continue
+            glif_obj = item["glif_obj"]
+            for layer_group_name, layer_data in item["layers"]:
+                layer_obj = layers_by_key.get((glif_obj.id, layer_group_name))
+                layer_created = layer_obj is None
+                if layer_created:
+                    layer_obj = layer_cls(glif=glif_obj, group_name=layer_group_name)
+                layer_obj.data = layer_data
+                item["layers_objs"].append((layer_obj, layer_created))
 
-    glif_list = atomic_elements_list + deep_components_list + character_glyphs_list
-    for glif_obj in glif_list:
-        glif_obj.unlock_by(user, save=True)
 
-    data = {
-        "atomic_elements": [
-            atomic_element_obj.serialize(options=params)
-            for atomic_element_obj in atomic_elements_list
-        ],
-        "deep_components": [
-            deep_components_obj.serialize(options=params)
-            for deep_components_obj in deep_components_list
-        ],
-        "character_glyphs": [
-            character_glyphs_obj.serialize(options=params)
-            for character_glyphs_obj in character_glyphs_list
-        ],
-    }
-    return ApiResponseSuccess(data)
+@transaction.atomic
+def _apply_glif_bulk_update_items(items, user):
+    # save glifs first, components may be created in the same request
+    for glif_cls, layer_cls in GLIF_BULK_UPDATE_MODELS.values():
+        glif_items = [item for item in items if item["glif_cls"] is glif_cls]
+        glifs_objs = []
+        for item in glif_items:
+            # new glifs always have data, items without data update only layers
+            if item["data"]:
+                glif_obj = item["glif_obj"]
+                glif_obj.data = item["data"]
+                glifs_objs.append(glif_obj)
+        glif_cls.bulk_save_by(glifs_objs, user)
+
+        if not layer_cls:
+            continue
+        layers_objs = []
+        for item in glif_items:
+            for layer_obj, _ in item["layers_objs"]:
+                # layers of new glifs were built before their glif had an id
+                layer_obj.glif_id = item["glif_obj"].id
+                layers_objs.append(layer_obj)
+        layer_cls.bulk_save_by(layers_objs, user)
+        if layers_objs:
+            # layers have just been saved, so their updated_at is the max value
+            glif_cls.objects.filter(
+                id__in={layer_obj.glif_id for layer_obj in layers_objs}
+            ).update(layers_updated_at=layers_objs[0].updated_at)
+
+    for item in items:
+        result = item["result"]
+        glif_obj = item["glif_obj"]
+        result["id"] = glif_obj.id
+        result["name"] = glif_obj.name
+        result["updated"] = True
+        result["layers"] = [
+            {
+                "id": layer_obj.id,
+                "group_name": layer_obj.group_name,
+                "created": layer_created,
+            }
+            for layer_obj, layer_created in item["layers_objs"]
+        ]
+
+
+@api_view
+@require_user
+@require_font
+@require_params(items="list")
+def glif_bulk_update(request, params, user, font, *args, **kwargs):
+    items_params = params.get("items")
+    items_max = settings.ROBOCJK_API_BULK_UPDATE_MAX_ITEMS
+    if len(items_params) > items_max:
+        return ApiResponseBadRequest(
+            f"Invalid parameter 'items', items must be at most {items_max}."
+        )
+    ignore_lock = params.get_bool("ignore_lock", False)
+    # if atomic, items are not updated at all if any item is invalid
+    atomic = params.get_bool("atomic", True)
+    items = [
+        _parse_glif_bulk_update_item(index, item_params)
+        for index, item_params in enumerate(items_params)
+    ]
+    _resolve_glif_bulk_update_items(items, font, user, ignore_lock)
+    valid_items = [item for item in items if not item["result"]["error"]]
+    if valid_items and (not atomic or len(valid_items) == len(items)):
+        _apply_glif_bulk_update_items(valid_items, user)
+    return ApiResponseSuccess([item["result"] for item in items])
 
 
 @transaction.atomic
@@ -503,15 +850,18 @@ def glif_delete(request, user, glif):
 @require_font
 @require_glif_filters
 def atomic_element_list(request, params, user, font, glif_filters, *args, **kwargs):
-    data = list(
-        font.atomic_elements.filter(**glif_filters).values(*ATOMIC_ELEMENT_ID_FIELDS)
-    )
+    atomic_elements_qs = font.atomic_elements.filter(**glif_filters)
+    if params.get_str("stream"):
+        return _get_stream_response(
+            params, _iterate_values(atomic_elements_qs, ATOMIC_ELEMENT_ID_FIELDS)
+        )
+    data = list(atomic_elements_qs.values(*ATOMIC_ELEMENT_ID_FIELDS))
     return ApiResponseSuccess(data)
 
 
 @api_view
 @require_user
-@require_atomic_element()
+@require_atomic_element(etag=True)
 def atomic_element_get(request, params, user, atomic_element, *args, **kwargs):
     return ApiResponseSuccess(atomic_element.serialize(options=params))
 
@@ -597,7 +947,7 @@ def atomic_element_layer_create(
         )
 
     AtomicElementLayer.objects.create(
-        glif_id=atomic_element.id,
+        glif=atomic_element,
         group_name=group_name,
         data=data,
         updated_by=user,
@@ -658,15 +1008,18 @@ def atomic_element_layer_delete(
 @require_font
 @require_glif_filters
 def deep_component_list(request, params, user, font, glif_filters, *args, **kwargs):
-    data = list(
-        font.deep_components.filter(**glif_filters).values(*DEEP_COMPONENT_ID_FIELDS)
-    )
+    deep_components_qs = font.deep_components.filter(**glif_filters)
+    if params.get_str("stream"):
+        return _get_stream_response(
+            params, _iterate_values(deep_components_qs, DEEP_COMPONENT_ID_FIELDS)
+        )
+    data = list(deep_components_qs.values(*DEEP_COMPONENT_ID_FIELDS))
     return ApiResponseSuccess(data)
 
 
 @api_view
 @require_user
-@require_deep_component()
+@require_deep_component(etag=True)
 def deep_component_get(request, params, user, deep_component, *args, **kwargs):
     return ApiResponseSuccess(deep_component.serialize(options=params))
 
@@ -738,15 +1091,18 @@ def deep_component_unlock(request, params, user, deep_component, *args, **kwargs
 @require_font
 @require_glif_filters
 def character_glyph_list(request, params, user, font, glif_filters, *args, **kwargs):
-    data = list(
-        font.character_glyphs.filter(**glif_filters).values(*CHARACTER_GLYPH_ID_FIELDS)
-    )
+    character_glyphs_qs = font.character_glyphs.filter(**glif_filters)
+    if params.get_str("stream"):
+        return _get_stream_response(
+            params, _iterate_values(character_glyphs_qs, CHARACTER_GLYPH_ID_FIELDS)
+        )
+    data = list(character_glyphs_qs.values(*CHARACTER_GLYPH_ID_FIELDS))
     return ApiResponseSuccess(data)
 
 
 @api_view
 @require_user
-@require_character_glyph()
+@require_character_glyph(etag=True)
 def character_glyph_get(request, params, user, character_glyph, *args, **kwargs):
     return ApiResponseSuccess(character_glyph.serialize(options=params))
 
@@ -832,7 +1188,7 @@ def character_glyph_layer_create(
         )
 
     CharacterGlyphLayer.objects.create(
-        glif_id=character_glyph.id,
+        glif=character_glyph,
         group_name=group_name,
         data=data,
         updated_by=user,
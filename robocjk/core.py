@@ -1,6 +1,7 @@
 from xml.etree import ElementTree
 
 from benedict import benedict
+from fontTools.misc import plistlib
 
 # from robocjk.debug import logger
 from robocjk.utils import username_to_filename
@@ -8,11 +9,53 @@ from robocjk.utils import username_to_filename
 # from django.conf import settings
 
 
+def _get_plist_dict_values(dict_node, keys):
+    """
+    Get the value nodes of the given keys from a plist <dict> node
+    without converting the whole dict to a python object.
+    """
+    values = {}
+    nodes = iter(dict_node)
+    for key_node in nodes:
+        value_node = next(nodes, None)
+        if value_node is None:
+            break
+        key = key_node.text or ""
+        if key in keys:
+            values[key] = value_node
+    return values
+
+
+def _get_plist_value(value_node, default=None):
+    if value_node is None:
+        return default
+    return plistlib.fromtree(value_node)
+
+
+def _get_plist_items_values(array_node, keys):
+    if array_node is None or array_node.tag != "array":
+        return []
+    return [
+        _get_plist_dict_values(item_node, keys)
+        for item_node in array_node
+        if item_node.tag == "dict"
+    ]
+
+
+def _is_plist_value_empty(value_node):
+    if value_node is None:
+        return True
+    if value_node.tag in ("array", "dict"):
+        return not len(value_node)
+    return not _get_plist_value(value_node)
+
+
 class GlifData:
     _error = None
     _xml_string = None
     _xml = None
     _lib = None
+    _lib_xml = None
     _name = ""
     _filename = ""
     _unicode_hex = ""
@@ -51,13 +94,14 @@ class GlifData:
     def parse_string(self, s):
         self._ok = False
         self._error = None
+        self._xml_string = None
+        self._xml = None
+        self._lib = None
+        self._lib_xml = None
         try:
-            self._xml_string = s.strip()
-            self._xml = ElementTree.fromstring(self._xml_string)
-            self._xml_string = "<?xml version='1.0' encoding='UTF-8'?>\n{}".format(
-                ElementTree.tostring(self._xml).decode()
-            )
+            self._xml = ElementTree.fromstring(s.strip())
         except ElementTree.ParseError as xml_data_error:
+            self._xml_string = s.strip()
             self._error = xml_data_error
             return
         try:
@@ -91,32 +135,51 @@ class GlifData:
             self._unicodes = unicodes
             self._has_unicode = True
 
-        # look for <lib><dict> xml node
+        # look for <lib><dict> xml node, the whole lib is converted lazily,
+        # only the needed values are read from the plist xml nodes
         lib_xml = self._xml.find("./lib/dict")
         if lib_xml is not None:
-            lib_str = ElementTree.tostring(lib_xml).decode()
-
-            # parse lib as plist
-            self._lib = benedict.from_plist(lib_str, keypath_separator="/")
+            self._lib_xml = lib_xml
+            lib_values = _get_plist_dict_values(
+                lib_xml,
+                {
+                    "robocjk.status",
+                    "robocjk.variationGlyphs",
+                    "robocjk.glyphVariationGlyphs",
+                    "robocjk.deepComponents",
+                    "public.markColor",
+                },
+            )
 
             # parse status color new format 2021/09: public.markColor -> robocjk.status
-            self._status = self._lib.get("robocjk.status", 0) or 0
+            self._status = (
+                _get_plist_value(lib_values.get("robocjk.status"), default=0) or 0
+            )
             self._status_with_variations = {
                 "status": self._status,
             }
 
-            var_glyphs = self._lib.get("robocjk.variationGlyphs", [])
-            if var_glyphs:
-                for item in var_glyphs:
-                    item_key = "status_{}".format(item.get("sourceName", ""))
-                    self._status_with_variations[item_key] = item.get("status", 0) or 0
+            var_glyphs_xml = lib_values.get("robocjk.variationGlyphs")
+            var_glyphs = _get_plist_items_values(
+                var_glyphs_xml, {"sourceName", "status"}
+            )
+            for item in var_glyphs:
+                item_key = "status_{}".format(
+                    _get_plist_value(item.get("sourceName"), default="")
+                )
+                self._status_with_variations[item_key] = (
+                    _get_plist_value(item.get("status"), default=0) or 0
+                )
 
             # parse status color old format fallback
-            self._status_color = self._lib.get("public.markColor", None)
+            self._status_color = _get_plist_value(lib_values.get("public.markColor"))
 
             # parse components list
-            components_list = self._lib.get("robocjk.deepComponents", [])
-            components_names_set = {item.get("name") for item in components_list}
+            components_xml = lib_values.get("robocjk.deepComponents")
+            components_list = _get_plist_items_values(components_xml, {"name"})
+            components_names_set = {
+                _get_plist_value(item.get("name")) for item in components_list
+            }
             if "" in components_names_set:
                 components_names_set.remove("")
             self._components_names = list(components_names_set)
@@ -125,10 +188,10 @@ class GlifData:
             # self._components_str = ','.join({'{}'.format(item) for item in self._components_names})
 
             # update computed properties
-            self._has_components = bool(components_list)
-            self._has_variation_axis = bool(
-                self._lib.get("robocjk.glyphVariationGlyphs")
-            ) or bool(self._lib.get("robocjk.variationGlyphs"))
+            self._has_components = not _is_plist_value_empty(components_xml)
+            self._has_variation_axis = not _is_plist_value_empty(
+                lib_values.get("robocjk.glyphVariationGlyphs")
+            ) or not _is_plist_value_empty(var_glyphs_xml)
 
         # update computed properties
         self._has_outlines = bool(self._xml.find("./outline"))
@@ -140,6 +203,10 @@ class GlifData:
 
     @property
     def xml_string(self):
+        if self._xml_string is None and self._xml is not None:
+            self._xml_string = "<?xml version='1.0' encoding='UTF-8'?>\n{}".format(
+                ElementTree.tostring(self._xml).decode()
+            )
         return self._xml_string
 
     @property
@@ -148,6 +215,10 @@ class GlifData:
 
     @property
     def lib(self):
+        if self._lib is None and self._lib_xml is not None:
+            self._lib = benedict(
+                plistlib.fromtree(self._lib_xml), keypath_separator="/"
+            )
         return self._lib
 
     @property
@@ -1,2 +1,6 @@
 class VerificationError(ValueError):
     pass
+
+
+class ExportLockLostError(RuntimeError):
+    pass
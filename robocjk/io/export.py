@@ -0,0 +1,352 @@
+import multiprocessing
+import queue
+import threading
+import time
+
+import fsutil
+
+from robocjk.debug import logger
+from robocjk.utils import format_glif, get_digest
+
+
+def _format_glif_data(pk, data):
+    error = None
+    try:
+        content = format_glif(data)
+    except Exception as formatting_error:
+        content = data
+        error = "glif xml data formatting error - pk: {}, error: {}".format(
+            pk, formatting_error
+        )
+    return content, error
+
+
+def _get_glif_content(pk, data, digest):
+    if digest:
+        # data is already formatted
+        return data, digest, None
+    content, error = _format_glif_data(pk, data)
+    return content, get_digest(content), error
+
+
+def format_glifs_data(glifs_data):
+    """
+    Worker function for formatting glifs xml data,
+    each item is a (pk, filepath, data, digest) tuple.
+    """
+    start = time.perf_counter()
+    results = []
+    format_count = 0
+    format_size = 0
+    for pk, filepath, data, digest in glifs_data:
+        content, digest, error = _get_glif_content(pk, data, digest)
+        size = len(content.encode("utf-8"))
+        results.append((pk, filepath, content, digest, size, error))
+        format_count += 1
+        format_size += size
+    format_stats = (format_count, format_size, time.perf_counter() - start)
+    return results, format_stats, 0.0
+
+
+def save_glifs_to_file_system(glifs_data):
+    """
+    Worker function for formatting glifs xml data and writing it to file-system,
+    each item is a (pk, filepath, data, digest) tuple.
+    The formatted content is not sent back to the parent process,
+    the digest is None if the file has not been written.
+    """
+    format_count = 0
+    format_size = 0
+    format_seconds = 0.0
+    write_seconds = 0.0
+    results = []
+    for pk, filepath, data, digest in glifs_data:
+        start = time.perf_counter()
+        formatted = not digest
+        content, digest, error = _get_glif_content(pk, data, digest)
+        size = len(content.encode("utf-8"))
+        if formatted:
+            format_count += 1
+            format_size += size
+            format_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        try:
+            fsutil.write_file(filepath, content)
+        except Exception as writing_error:
+            digest = None
+            error = "glif file writing error - pk: {}, error: {}".format(
+                pk, writing_error
+            )
+        write_seconds += time.perf_counter() - start
+        results.append((pk, filepath, None, digest, size, error))
+    format_stats = (format_count, format_size, format_seconds)
+    return results, format_stats, write_seconds
+
+
+class ExportPipelineStats:
+    """
+    Thread-safe per-stage counters of the export pipeline,
+    the seconds of the format and write stages are summed over all workers.
+    """
+
+    STAGES = ("read", "format", "write")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {
+            stage: {"count": 0, "bytes": 0, "seconds": 0.0} for stage in self.STAGES
+        }
+
+    def add(self, stage, count=0, size=0, seconds=0.0):
+        with self._lock:
+            counters = self._stages[stage]
+            counters["count"] += count
+            counters["bytes"] += size
+            counters["seconds"] += seconds
+
+    def get(self, stage):
+        with self._lock:
+            return dict(self._stages[stage])
+
+    def to_dict(self):
+        return {stage: self.get(stage) for stage in self.STAGES}
+
+    def __str__(self):
+        lines = []
+        for stage, counters in self.to_dict().items():
+            count = counters["count"]
+            seconds = counters["seconds"]
+            rate = (count / seconds) if seconds > 0 else 0
+            line = f"{stage}: {count} glifs in {seconds:.2f}s ({rate:.1f} glifs/s)"
+            if counters["bytes"]:
+                line += f", {counters['bytes'] / (1024 * 1024):.2f} MB"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class ExportPipeline:
+    """
+    Streams .glif files to the file-system through overlapping stages:
+    the items read from the database are submitted in batches to a pool
+    of processes that format the xml data, formatted batches are put
+    in a bounded queue consumed by writer threads.
+    If write_in_workers is True, the pool processes format and write
+    the files too, and only the digests are sent back to the parent process.
+    The number of batches in flight is bounded, so submitting blocks
+    (backpressure) when the format or the write stage can't keep up.
+    """
+
+    def __init__(
+        self,
+        processes=None,
+        writers=4,
+        batch_size=100,
+        max_pending_batches=16,
+        write_in_workers=False,
+        on_write=None,
+    ):
+        self._processes = processes or max(1, (multiprocessing.cpu_count() - 1))
+        self._writers_count = max(1, writers)
+        self._batch_size = max(1, batch_size)
+        self._max_pending_batches = max(1, max_pending_batches)
+        self._write_in_workers = write_in_workers
+        self._on_write = on_write
+        self._on_write_lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(self._max_pending_batches)
+        self._queue = queue.Queue(maxsize=self._max_pending_batches)
+        self._batch = []
+        self._formatted_batch = []
+        self._errors = []
+        self._pool = None
+        self._writers = []
+        self.stats = ExportPipelineStats()
+
+    @property
+    def processes(self):
+        return self._processes
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+
+    def start(self):
+        self._pool = multiprocessing.Pool(processes=self._processes)
+        if self._write_in_workers:
+            return
+        for _ in range(self._writers_count):
+            writer = threading.Thread(target=self._write_worker, daemon=True)
+            writer.start()
+            self._writers.append(writer)
+
+    def read(self, chunks):
+        """
+        Iterate the given chunks (eg. keyset paginated querysets)
+        measuring the time spent reading them.
+        """
+        chunks_iter = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(chunks_iter)
+            except StopIteration:
+                return
+            self.stats.add(
+                "read", count=len(chunk), seconds=(time.perf_counter() - start)
+            )
+            yield chunk
+
+    def submit(self, pk, filepath, data, digest=None):
+        """
+        Submit a glif to be exported, if the digest is given
+        the data is considered already formatted and it is not formatted again.
+        """
+        self._raise_errors()
+        if digest and not self._write_in_workers:
+            # nothing to do for the pool processes, send it to the writers
+            self._formatted_batch.append((pk, filepath, data, digest))
+            if len(self._formatted_batch) >= self._batch_size:
+                self._submit_formatted_batch()
+            return
+        self._batch.append((pk, filepath, data, digest))
+        if len(self._batch) >= self._batch_size:
+            self._submit_batch()
+
+    def _submit_formatted_batch(self):
+        if not self._formatted_batch:
+            return
+        batch = self._formatted_batch
+        self._formatted_batch = []
+        results = [
+            (pk, filepath, content, digest, len(content.encode("utf-8")), None)
+            for pk, filepath, content, digest in batch
+        ]
+        # blocks until a batch slot is released by the writers
+        self._pending.acquire()
+        self._queue.put(results)
+
+    def _submit_batch(self):
+        if not self._batch:
+            return
+        batch = self._batch
+        self._batch = []
+        # blocks until a batch slot is released by the writers
+        self._pending.acquire()
+        worker_func = (
+            save_glifs_to_file_system if self._write_in_workers else format_glifs_data
+        )
+        self._pool.apply_async(
+            worker_func,
+            (batch,),
+            callback=self._on_formatted,
+            error_callback=self._on_error,
+        )
+
+    def _on_formatted(self, result):
+        results, format_stats, write_seconds = result
+        format_count, format_size, format_seconds = format_stats
+        self.stats.add(
+            "format", count=format_count, size=format_size, seconds=format_seconds
+        )
+        for _, _, _, _, _, error in results:
+            if error:
+                logger.error(error)
+        if not self._write_in_workers:
+            self._queue.put(results)
+            return
+        try:
+            self._on_written(results)
+            written = [item for item in results if item[3]]
+            self.stats.add(
+                "write",
+                count=len(written),
+                size=sum(item[4] for item in written),
+                seconds=write_seconds,
+            )
+        except Exception as error:
+            self._errors.append(error)
+        finally:
+            self._pending.release()
+
+    def _on_written(self, results):
+        if not self._on_write:
+            return
+        with self._on_write_lock:
+            for _, filepath, _, digest, size, _ in results:
+                if digest:
+                    self._on_write(filepath, digest, size)
+
+    def _on_error(self, error):
+        self._errors.append(error)
+        self._pending.release()
+
+    def _write_worker(self):
+        while True:
+            results = self._queue.get()
+            if results is None:
+                break
+            try:
+                self._write(results)
+            except Exception as error:
+                self._errors.append(error)
+            finally:
+                self._pending.release()
+
+    def _write(self, results):
+        start = time.perf_counter()
+        size = 0
+        for _, filepath, content, _, content_size, _ in results:
+            fsutil.write_file(filepath, content)
+            size += content_size
+        self._on_written(results)
+        self.stats.add(
+            "write", count=len(results), size=size, seconds=time.perf_counter() - start
+        )
+
+    def _raise_errors(self):
+        if self._errors:
+            raise self._errors[0]
+
+    def close(self):
+        """
+        Submit the last batch, wait for all batches to be written
+        and stop the workers; raise the first error occurred (if any).
+        """
+        self._submit_batch()
+        self._submit_formatted_batch()
+        # all the batches have been written when all the slots are available
+        for _ in range(self._max_pending_batches):
+            self._pending.acquire()
+        for _ in range(self._max_pending_batches):
+            self._pending.release()
+        self._stop()
+        self._raise_errors()
+
+    def terminate(self):
+        self._batch = []
+        self._formatted_batch = []
+        if self._pool:
+            self._pool.terminate()
+        # unblock the writers even if the queue is full of pending batches
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._stop()
+
+    def _stop(self):
+        for _ in self._writers:
+            self._queue.put(None)
+        for writer in self._writers:
+            writer.join()
+        self._writers = []
+        if self._pool:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
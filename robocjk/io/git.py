@@ -0,0 +1,169 @@
+import os
+import subprocess
+import tempfile
+import time
+
+import fsutil
+
+from robocjk.debug import logger
+
+
+class GitRepository:
+    """
+    Runs git commands (without shell) in a local repository,
+    the time spent by each phase (eg. pull, add, commit, push) is recorded.
+    """
+
+    def __init__(self, path, branch="main", remote="origin"):
+        self._path = path
+        self._branch = branch
+        self._remote = remote
+        self.timings = {}
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def branch(self):
+        return self._branch
+
+    def exists(self):
+        return fsutil.exists(fsutil.join_path(self._path, ".git"))
+
+    def run(self, *args, phase=None, check=True):
+        cmd = ["git", "-C", self._path, *args]
+        logger.info(f"Run git command: {' '.join(cmd)}")
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(cmd, capture_output=True, check=False)
+        finally:
+            phase = phase or args[0]
+            self.timings[phase] = self.timings.get(phase, 0.0) + (
+                time.perf_counter() - start
+            )
+        output = (result.stdout + result.stderr).decode("UTF-8", errors="replace")
+        output = output.replace("\0", "\n")
+        if output:
+            logger.info(f"Git command output: {output}")
+        if check and result.returncode != 0:
+            if result.returncode == 128:
+                logger.error(
+                    "Git command returned non-zero exit status 128, "
+                    "check if git repo and branch are correct."
+                )
+            logger.error(f"Git command error: {output}")
+            raise subprocess.CalledProcessError(
+                result.returncode, cmd, output=result.stdout, stderr=result.stderr
+            )
+        return result
+
+    def init(self, remote_url, user_name, user_email):
+        fsutil.make_dirs(self._path)
+        self.run("init", phase="init")
+        self.run("config", "--local", "user.name", user_name, phase="init")
+        self.run("config", "--local", "user.email", user_email, phase="init")
+        self.run("remote", "add", self._remote, remote_url, phase="init")
+        self.pull()
+        self.run("checkout", "-B", self._branch, phase="init")
+        self.push(set_upstream=True)
+
+    def update(self):
+        """
+        Discard all local changes and pull the remote branch.
+        """
+        self.run("reset", "--hard", phase="reset")
+        self.run("checkout", self._branch, phase="reset")
+        self.pull()
+        self.run("clean", "-df", phase="reset")
+
+    def pull(self):
+        self.run("pull", self._remote, self._branch, phase="pull")
+
+    def _run_with_pathspec_file(self, args, paths, phase):
+        if not paths:
+            return
+        # paths are passed using a file to avoid exceeding the command-line limit
+        with tempfile.NamedTemporaryFile("wb", suffix=".pathspec", delete=False) as f:
+            f.write(b"\0".join(path.encode("utf-8") for path in paths))
+            pathspec_filepath = f.name
+        try:
+            self.run(
+                *args,
+                f"--pathspec-from-file={pathspec_filepath}",
+                "--pathspec-file-nul",
+                phase=phase,
+            )
+        finally:
+            os.remove(pathspec_filepath)
+
+    def _get_relpaths(self, paths):
+        return sorted({os.path.relpath(path, self._path) for path in paths})
+
+    def add(self, paths):
+        """
+        Stage the changes (additions, modifications and deletions)
+        of the given paths only, without scanning the whole working tree.
+        """
+        relpaths = self._get_relpaths(paths)
+        existing_relpaths = [
+            relpath
+            for relpath in relpaths
+            if fsutil.exists(fsutil.join_path(self._path, relpath))
+        ]
+        existing_relpaths_set = set(existing_relpaths)
+        removed_relpaths = [
+            relpath for relpath in relpaths if relpath not in existing_relpaths_set
+        ]
+        self._run_with_pathspec_file(["add", "--all"], existing_relpaths, phase="add")
+        self._run_with_pathspec_file(
+            ["rm", "-r", "--cached", "--quiet", "--ignore-unmatch"],
+            removed_relpaths,
+            phase="add",
+        )
+
+    def restore(self, paths):
+        """
+        Discard the changes (staged or not) of the given paths only.
+        """
+        relpaths = self._get_relpaths(paths)
+        if not relpaths:
+            return
+        # restore fails with paths not existing in HEAD (eg. new fonts)
+        result = self.run(
+            "ls-tree", "-z", "--name-only", "HEAD", "--", *relpaths, phase="restore"
+        )
+        tracked_relpaths = list(filter(None, result.stdout.decode("utf-8").split("\0")))
+        self._run_with_pathspec_file(
+            ["restore", "--source=HEAD", "--staged", "--worktree"],
+            tracked_relpaths,
+            phase="restore",
+        )
+        # untracked paths are unstaged and removed by clean
+        self.run("reset", "--quiet", "--", *relpaths, phase="restore")
+        self.run("clean", "-df", "--", *relpaths, phase="restore")
+
+    def has_staged_changes(self):
+        result = self.run("diff", "--cached", "--quiet", phase="commit", check=False)
+        return result.returncode != 0
+
+    def commit(self, message):
+        """
+        Commit the staged changes, return False if there is nothing to commit.
+        """
+        if not self.has_staged_changes():
+            logger.info("Nothing to commit, working tree clean.")
+            return False
+        self.run("commit", "--quiet", "-m", message, phase="commit")
+        return True
+
+    def push(self, set_upstream=False):
+        args = ["push"]
+        if set_upstream:
+            args.append("--set-upstream")
+        self.run(*args, self._remote, self._branch, phase="push")
+
+    def format_timings(self):
+        return ", ".join(
+            f"{phase}: {seconds:.2f}s" for phase, seconds in self.timings.items()
+        )
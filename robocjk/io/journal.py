@@ -0,0 +1,41 @@
+class ExportJournal:
+    """
+    Keeps track of the paths created, modified or removed by the font export,
+    so that only the changed paths need to be staged in the git repository.
+    A path that is written after being removed (or vice-versa)
+    is tracked only once with its last change.
+    """
+
+    def __init__(self):
+        self._written = set()
+        self._removed = set()
+
+    @property
+    def written(self):
+        return sorted(self._written)
+
+    @property
+    def removed(self):
+        return sorted(self._removed)
+
+    @property
+    def paths(self):
+        return sorted(self._written | self._removed)
+
+    def write(self, path):
+        self._removed.discard(path)
+        self._written.add(path)
+
+    def remove(self, path):
+        self._written.discard(path)
+        self._removed.add(path)
+
+    def clear(self):
+        self._written = set()
+        self._removed = set()
+
+    def __contains__(self, path):
+        return path in self._written or path in self._removed
+
+    def __len__(self):
+        return len(self._written) + len(self._removed)
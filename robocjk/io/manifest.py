@@ -0,0 +1,119 @@
+import json
+import os
+
+import fsutil
+
+
+class ExportManifest:
+    """
+    Keeps track of the .glif files written by the font export:
+    each entry maps a file path (relative to the font path) to the digest
+    of the content that has been written, to the file stat (size, mtime)
+    and to the glif type and id, so that unchanged files can be skipped
+    on the next export and the exported files can be verified against
+    the database without walking the file-system.
+    """
+
+    def __init__(self, filepath, basepath):
+        self._filepath = filepath
+        self._basepath = basepath
+        self._entries = {}
+
+    @property
+    def filepath(self):
+        return self._filepath
+
+    def _get_key(self, path):
+        return os.path.relpath(path, self._basepath)
+
+    def load(self):
+        self._entries = {}
+        if not fsutil.is_file(self._filepath):
+            return False
+        try:
+            self._entries = json.loads(fsutil.read_file(self._filepath))
+        except ValueError:
+            # corrupted manifest, all files will be written again
+            return False
+        return True
+
+    def save(self):
+        fsutil.write_file(
+            self._filepath, json.dumps(self._entries, separators=(",", ":"))
+        )
+
+    def clear(self):
+        self._entries = {}
+
+    def delete(self):
+        self._entries = {}
+        if fsutil.is_file(self._filepath):
+            fsutil.remove_file(self._filepath)
+
+    def is_unchanged(self, path, digest):
+        """
+        Return True if the file at the given path has been written
+        by a previous export with the same digest and has not been
+        modified (or removed) since then.
+        """
+        if not digest:
+            return False
+        entry = self._entries.get(self._get_key(path))
+        if not entry or entry[0] != digest:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return entry[1] == stat.st_size and entry[2] == stat.st_mtime_ns
+
+    def set(self, path, digest, glif_type=None, glif_id=None):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.remove(path)
+            return
+        self._entries[self._get_key(path)] = [
+            digest,
+            stat.st_size,
+            stat.st_mtime_ns,
+            glif_type,
+            glif_id,
+        ]
+
+    def set_glif(self, path, glif_type, glif_id):
+        """
+        Set the glif type and id of an existing entry.
+        """
+        entry = self._entries.get(self._get_key(path))
+        if entry:
+            entry[3:] = [glif_type, glif_id]
+
+    def get_glifs_ids(self):
+        """
+        Get the ids of the glifs in the manifest grouped by glif type
+        (an id is repeated if the glif has been exported to more paths),
+        return None if the manifest contains entries without type and id
+        (written by a previous version of the export).
+        """
+        glifs_ids = {}
+        for entry in self._entries.values():
+            if len(entry) < 5 or entry[3] is None:
+                return None
+            glifs_ids.setdefault(entry[3], []).append(entry[4])
+        return glifs_ids
+
+    def remove(self, path):
+        self._entries.pop(self._get_key(path), None)
+
+    def retain(self, paths):
+        keys = {self._get_key(path) for path in paths}
+        self._entries = {
+            key: entry for key, entry in self._entries.items() if key in keys
+        }
+
+    def __contains__(self, path):
+        return self._get_key(path) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
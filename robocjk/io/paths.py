@@ -1,4 +1,6 @@
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import unquote
 
 import fsutil
@@ -69,6 +71,14 @@ def get_font_path(instance, name=None):
     )
 
 
+def get_font_manifest_path(instance):
+    return fsutil.join_path(
+        settings.GIT_REPOSITORIES_PATH,
+        ".manifests",
+        f"{instance.uid}.json",
+    )
+
+
 def get_glif_filename(instance, name=None):
     filename = quote_filename(name or instance.filename)
     assert filename.endswith(".glif")
@@ -135,9 +145,72 @@ def get_atomic_element_layer_path(instance, name=None):
     )
 
 
+def get_glifs_paths(dirpath, filenames):
+    """
+    Get the paths of the glifs files with the given filenames
+    (eg. loaded using values_list) in the given glifs dir,
+    without instantiating the glifs models.
+    """
+    return [os.path.join(dirpath, quote_filename(filename)) for filename in filenames]
+
+
+def get_glifs_layers_paths(dirpath, layers):
+    """
+    Get the paths of the glifs layers files with the given
+    (group_name, filename) tuples in the given glifs dir.
+    """
+    return [
+        os.path.normpath(
+            os.path.join(dirpath, quote_filename(group_name), quote_filename(filename))
+        )
+        for group_name, filename in layers
+    ]
+
+
 def get_proof_path(instance):
     return fsutil.join_path(
         get_font_path(instance.font),
         "Proofing",
         fsutil.get_filename(instance.file.path),
     )
+
+
+def _scan_glifs_files(dirpath):
+    try:
+        with os.scandir(dirpath) as entries:
+            return [
+                entry.path
+                for entry in entries
+                if entry.name.endswith(".glif") and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def _scan_dirs(dirpath):
+    try:
+        with os.scandir(dirpath) as entries:
+            return [entry.path for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return []
+
+
+def _scan_in_parallel(scan_func, dirpaths, workers):
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return dict(zip(dirpaths, executor.map(scan_func, dirpaths)))
+
+
+def scan_dirs(dirpaths, workers=8):
+    """
+    Scan in parallel (using os.scandir) the sub-dirs of the given dirs,
+    return a dict of sub-dirs paths lists keyed by dirpath.
+    """
+    return _scan_in_parallel(_scan_dirs, dirpaths, workers)
+
+
+def scan_glifs_files(dirpaths, workers=8):
+    """
+    Scan in parallel (using os.scandir) the .glif files of the given dirs
+    (not recursively), return a dict of files paths lists keyed by dirpath.
+    """
+    return _scan_in_parallel(_scan_glifs_files, dirpaths, workers)
@@ -0,0 +1,66 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ExportProfiler:
+    """
+    Records the seconds spent by each export phase (timing spans)
+    and the number of glifs files and bytes written for each glif type.
+    Spans with the same name (eg. a retried phase) are summed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counts = {}
+
+    @property
+    def timings(self):
+        with self._lock:
+            return {name: round(seconds, 4) for name, seconds in self._timings.items()}
+
+    @property
+    def counts(self):
+        with self._lock:
+            return {name: dict(counters) for name, counters in self._counts.items()}
+
+    @property
+    def files_count(self):
+        with self._lock:
+            return sum(counters["written"] for counters in self._counts.values())
+
+    @property
+    def bytes_count(self):
+        with self._lock:
+            return sum(counters["bytes"] for counters in self._counts.values())
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - start)
+
+    def add_timing(self, name, seconds):
+        with self._lock:
+            self._timings[name] = self._timings.get(name, 0.0) + seconds
+
+    def add_timings(self, timings, prefix=""):
+        for name, seconds in timings.items():
+            self.add_timing(f"{prefix}{name}", seconds)
+
+    def add_count(self, name, total=0, written=0, size=0):
+        with self._lock:
+            counters = self._counts.setdefault(
+                name, {"total": 0, "written": 0, "bytes": 0}
+            )
+            counters["total"] += total
+            counters["written"] += written
+            counters["bytes"] += size
+
+    def format_timings(self):
+        return ", ".join(
+            f"{name}: {seconds:.2f}s" for name, seconds in self.timings.items()
+        )
@@ -0,0 +1,396 @@
+import datetime as dt
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+import zipfile
+from contextlib import contextmanager
+
+import django
+import fsutil
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from robocjk.api.auth import generate_auth_token
+from robocjk.api.middleware import get_compression_encodings
+from robocjk.models import Font, Project
+from robocjk.synthetic import create_synthetic_font, get_synthetic_glif_xml
+
+BENCHMARK_RESULTS_VERSION = 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark import, export, verify, cleanup and the main api endpoints "
+        "using a synthetic font, results are written as json."
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._results = {}
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--atomic-elements",
+            type=int,
+            default=500,
+            help="The number of atomic elements of the synthetic font.",
+        )
+        parser.add_argument(
+            "--deep-components",
+            type=int,
+            default=2000,
+            help="The number of deep components of the synthetic font.",
+        )
+        parser.add_argument(
+            "--character-glyphs",
+            type=int,
+            default=5000,
+            help="The number of character glyphs of the synthetic font.",
+        )
+        parser.add_argument(
+            "--layers",
+            type=int,
+            default=2,
+            help="The number of layers of each atomic element and character glyph.",
+        )
+        parser.add_argument(
+            "--components",
+            type=int,
+            default=3,
+            help="The number of components (fan-out) of each deep component "
+            "and character glyph.",
+        )
+        parser.add_argument(
+            "--changes",
+            type=int,
+            default=100,
+            help="The number of character glyphs updated before the incremental export.",
+        )
+        parser.add_argument(
+            "--api-repeat",
+            type=int,
+            default=10,
+            help="The number of times each api endpoint is called.",
+        )
+        parser.add_argument(
+            "--bandwidth",
+            type=float,
+            default=10.0,
+            help="The bandwidth (Mbit/s) used to estimate the api responses "
+            "transfer seconds with and without compression.",
+        )
+        parser.add_argument(
+            "--output",
+            required=False,
+            help="The filepath of the json results, "
+            "if not provided the results are written to stdout.",
+        )
+        parser.add_argument(
+            "--compare",
+            required=False,
+            help="The filepath of previous json results to compare the timings with.",
+        )
+        parser.add_argument(
+            "--path",
+            required=False,
+            help="The directory where the synthetic fonts are exported, "
+            "if not provided a temporary directory is used.",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Don't delete the synthetic project, fonts and exported files.",
+        )
+
+    def handle(self, *args, **options):
+        compare_results = None
+        compare_filepath = options.get("compare")
+        if compare_filepath:
+            if not fsutil.exists(compare_filepath):
+                message = f"Invalid compare filepath, file {compare_filepath!r} doesn't exist."
+                raise CommandError(message)
+            compare_results = json.loads(fsutil.read_file(compare_filepath))
+
+        counts = {
+            "atomic_elements": max(0, options.get("atomic_elements")),
+            "deep_components": max(0, options.get("deep_components")),
+            "character_glyphs": max(0, options.get("character_glyphs")),
+            "layers": max(0, options.get("layers")),
+            "components": max(0, options.get("components")),
+        }
+        changes_count = max(0, options.get("changes"))
+        api_repeat = max(1, options.get("api_repeat"))
+        bandwidth = max(0.001, options.get("bandwidth"))
+        keep = options.get("keep", False)
+
+        benchmark_id = uuid.uuid4().hex[:8]
+        repositories_path = options.get("path") or tempfile.mkdtemp(
+            prefix="robocjk-benchmark-"
+        )
+        project = Project.objects.create(
+            name=f"Benchmark {benchmark_id}",
+            repo_url=f"git@github.com:robocjk/benchmark-{benchmark_id}.git",
+        )
+        user = get_user_model().objects.create_user(
+            username=f"benchmark-{benchmark_id}"
+        )
+        project.designers.add(user)
+        try:
+            with override_settings(
+                GIT_REPOSITORIES_PATH=repositories_path,
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            ):
+                self._benchmark(
+                    project, user, counts, changes_count, api_repeat, bandwidth
+                )
+        finally:
+            if keep:
+                self.stderr.write(
+                    f"Kept project {project.name!r} and exported files "
+                    f"in {repositories_path!r}."
+                )
+            else:
+                fsutil.remove_dir(repositories_path)
+                project.delete()
+                user.delete()
+
+        results = {
+            "version": BENCHMARK_RESULTS_VERSION,
+            "created_at": dt.datetime.now().isoformat(),
+            "environment": self._get_environment(),
+            "options": {
+                **counts,
+                "changes": changes_count,
+                "api_repeat": api_repeat,
+                "bandwidth": bandwidth,
+            },
+            "results": self._results,
+        }
+        results_str = json.dumps(results, indent=4)
+        output_filepath = options.get("output")
+        if output_filepath:
+            fsutil.write_file(output_filepath, results_str)
+            self.stderr.write(f"Written benchmark results to {output_filepath!r}.")
+        else:
+            self.stdout.write(results_str)
+        if compare_results:
+            if compare_results.get("options") != results["options"]:
+                self.stderr.write(
+                    "Compared results have been run with different options."
+                )
+            self._compare(compare_results.get("results", {}), self._results)
+
+    @contextmanager
+    def _measure(self, name):
+        self.stderr.write(f"Benchmarking {name}...")
+        with CaptureQueriesContext(connection) as queries:
+            start_t = time.perf_counter()
+            yield
+            diff_t = time.perf_counter() - start_t
+        self._results[name] = {
+            "seconds": round(diff_t, 4),
+            "queries": len(queries),
+        }
+        self.stderr.write(f"Benchmarked {name} in {diff_t:.3f}s.")
+
+    def _benchmark(self, project, user, counts, changes_count, api_repeat, bandwidth):
+        with self._measure("generate"):
+            font = create_synthetic_font(project, "Synthetic", **counts)
+
+        with self._measure("export_full"):
+            if not font.export(full=True):
+                raise CommandError("Full export failed, check the logs for details.")
+
+        with self._measure("export_incremental_unchanged"):
+            font.export(full=False)
+
+        character_glyphs_list = list(
+            font.character_glyphs.order_by("id")[:changes_count]
+        )
+        for character_glyph in character_glyphs_list:
+            character_glyph.data = get_synthetic_glif_xml(
+                character_glyph.name,
+                unicode_hex=character_glyph.unicode_hex,
+                contours=2,
+            )
+            character_glyph.save()
+
+        with self._measure("export_incremental"):
+            font.export(full=False)
+
+        with self._measure("verify"):
+            font.verify_file_system()
+
+        with self._measure("verify_deep"):
+            font.verify_file_system(deep=True)
+
+        with self._measure("cleanup"):
+            font.cleanup_file_system()
+
+        import_font = Font.objects.create(project=project, name="Synthetic Import")
+        import_filepath = self._zip_font(font)
+        with self._measure("import"):
+            call_command(
+                "import_rcjk",
+                filepath=import_filepath,
+                font_uid=str(import_font.uid),
+                bulk=True,
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+        self._benchmark_api(font, user, api_repeat, bandwidth)
+
+    def _zip_font(self, font):
+        font_path = font.path()
+        font_parent_path = fsutil.get_parent_dir(font_path)
+        zip_filepath = f"{font_path}.zip"
+        # zip entries paths are relative to the font parent dir (.rcjk dir included)
+        with zipfile.ZipFile(zip_filepath, "w") as file:
+            for filepath in fsutil.search_files(font_path, "**/*"):
+                file.write(filepath, os.path.relpath(filepath, font_parent_path))
+        return zip_filepath
+
+    def _get_api_calls(self, font):
+        font_uid = str(font.uid)
+        character_glyph = font.character_glyphs.order_by("id").first()
+        deep_component = font.deep_components.order_by("id").first()
+        atomic_element = font.atomic_elements.order_by("id").first()
+        api_calls = [
+            ("font_get", "/api/font/get/", {"font_uid": font_uid}),
+            ("glif_list", "/api/glif/list/", {"font_uid": font_uid}),
+            (
+                "character_glyph_list",
+                "/api/character-glyph/list/",
+                {"font_uid": font_uid},
+            ),
+            (
+                "glyphs_composition_get",
+                "/api/glyphs-composition/get/",
+                {"font_uid": font_uid},
+            ),
+        ]
+        for name, url, glif_obj in [
+            ("character_glyph_get", "/api/character-glyph/get/", character_glyph),
+            ("deep_component_get", "/api/deep-component/get/", deep_component),
+            ("atomic_element_get", "/api/atomic-element/get/", atomic_element),
+        ]:
+            if glif_obj:
+                api_calls.append(
+                    (
+                        name,
+                        url,
+                        {
+                            "font_uid": font_uid,
+                            "id": glif_obj.id,
+                            "return_layers": True,
+                            "return_related": True,
+                        },
+                    )
+                )
+        return api_calls
+
+    def _call_api(self, client, name, url, params, headers, api_repeat):
+        timings = []
+        for _index in range(api_repeat):
+            with CaptureQueriesContext(connection) as queries:
+                start_t = time.perf_counter()
+                response = client.post(url, params, **headers)
+                timings.append(time.perf_counter() - start_t)
+            if response.status_code != 200:
+                message = f"Api {name} error: {response.status_code} {response.content[:200]!r}"
+                raise CommandError(message)
+        return {
+            "seconds": round(statistics.median(timings), 4),
+            "seconds_min": round(min(timings), 4),
+            "seconds_max": round(max(timings), 4),
+            "queries": len(queries),
+            "bytes": len(response.content),
+        }
+
+    def _benchmark_api(self, font, user, api_repeat, bandwidth):
+        client = Client()
+        auth_token = generate_auth_token(data={"user_pk": user.pk})
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {auth_token}"}
+        # bytes per second
+        bandwidth_bytes = bandwidth * 1000 * 1000 / 8
+        api_results = {}
+        api_compression_results = {}
+        for name, url, params in self._get_api_calls(font):
+            self.stderr.write(f"Benchmarking api {name}...")
+            api_results[name] = self._call_api(
+                client, name, url, params, headers, api_repeat
+            )
+            # estimate the total seconds (response time + transfer time)
+            # for each compression encoding (identity means no compression)
+            api_compression_results[name] = {}
+            for encoding in ["identity", *get_compression_encodings()]:
+                encoding_headers = {**headers, "HTTP_ACCEPT_ENCODING": encoding}
+                encoding_results = self._call_api(
+                    client, name, url, params, encoding_headers, api_repeat
+                )
+                transfer_seconds = encoding_results["bytes"] / bandwidth_bytes
+                api_compression_results[name][encoding] = {
+                    "seconds": round(encoding_results["seconds"] + transfer_seconds, 4),
+                    "response_seconds": encoding_results["seconds"],
+                    "transfer_seconds": round(transfer_seconds, 4),
+                    "bytes": encoding_results["bytes"],
+                }
+            identity_results = api_compression_results[name]["identity"]
+            for encoding_results in api_compression_results[name].values():
+                encoding_results["bytes_saved"] = (
+                    identity_results["bytes"] - encoding_results["bytes"]
+                )
+                encoding_results["seconds_saved"] = round(
+                    identity_results["seconds"] - encoding_results["seconds"], 4
+                )
+        self._results["api"] = api_results
+        self._results["api_compression"] = api_compression_results
+
+    def _get_environment(self):
+        result = subprocess.run(
+            ["git", "-C", str(settings.BASE_DIR), "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=False,
+        )
+        commit = result.stdout.decode("utf-8").strip() if result.returncode == 0 else ""
+        return {
+            "commit": commit,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "settings": {
+                key: getattr(settings, key)
+                for key in dir(settings)
+                if key.startswith("ROBOCJK_EXPORT_")
+            },
+        }
+
+    def _compare(self, previous_results, results):
+        def iterate_timings(results, prefix=""):
+            for name, value in results.items():
+                if "seconds" in value:
+                    yield f"{prefix}{name}", value["seconds"]
+                else:
+                    yield from iterate_timings(value, prefix=f"{prefix}{name}.")
+
+        previous_timings = dict(iterate_timings(previous_results))
+        for name, seconds in iterate_timings(results):
+            previous_seconds = previous_timings.get(name)
+            if not previous_seconds or not seconds:
+                continue
+            speedup = previous_seconds / seconds
+            self.stderr.write(
+                f"{name}: {previous_seconds:.3f}s -> {seconds:.3f}s ({speedup:.2f}x)"
+            )
@@ -8,6 +8,7 @@ from robocjk.models import (
     DeepComponent,
     Font,
 )
+from robocjk.relations import format_glifs_relations_stats, update_glifs_relations
 
 
 class Command(BaseCommand):
@@ -130,14 +131,6 @@ class Command(BaseCommand):
                     },
                 )
 
-        self.stdout.write("Updating atomic elements many to many relations ...")
-        for ae_obj in font_clone_obj.atomic_elements.all():
-            ae_obj.update_components()
-
-        self.stdout.write("Updating deep components many to many relations ...")
-        for dc_obj in font_clone_obj.deep_components.all():
-            dc_obj.update_components()
-
-        self.stdout.write("Updating character glyphs many to many relations ...")
-        for cg_obj in font_clone_obj.character_glyphs.all():
-            cg_obj.update_components()
+        self.stdout.write("Updating glifs many to many relations ...")
+        stats = update_glifs_relations(font_clone_obj.id)
+        self.stdout.write(format_glifs_relations_stats(stats))
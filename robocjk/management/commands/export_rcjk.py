@@ -1,6 +1,12 @@
 import os
+import subprocess
+import sys
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import fsutil
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from extra_settings.models import Setting
 
@@ -22,6 +28,13 @@ class Command(BaseCommand):
             action="store_true",
             help="Run full export.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.ROBOCJK_EXPORT_WORKERS,
+            help="The number of projects exported concurrently, "
+            "each project is exported in its own process.",
+        )
 
     def handle(self, *args, **options):
         export_enabled = Setting.get("ROBOCJK_EXPORT_ENABLED", default=True)
@@ -48,15 +61,69 @@ class Command(BaseCommand):
                 self.stderr.write(message)
                 raise CommandError(message) from project_error
             else:
-                project_obj.export(full=projects_full_export)
+                self._export_project(project_obj, full=projects_full_export)
         else:
             # export all projects
-            projects_qs = Project.objects.prefetch_related("fonts")
-            for project in projects_qs:
-                project.export(full=projects_full_export)
+            projects_workers = max(1, options.get("workers") or 1)
+            if projects_workers > 1:
+                projects_list = list(Project.objects.all())
+                self._export_projects_concurrently(
+                    projects_list, workers=projects_workers, full=projects_full_export
+                )
+            else:
+                projects_qs = Project.objects.prefetch_related("fonts")
+                for project in projects_qs:
+                    self._export_project(project, full=projects_full_export)
 
         process_id = os.getpid()
         thread_name = threading.current_thread().name
         logger.info(f"Complete export - pid: {process_id} - thread: {thread_name}")
 
         logger.info("-" * 100)
+
+    def _export_project(self, project, full):
+        start_t = time.time()
+        project_exported = project.export(full=full)
+        diff_t = time.time() - start_t
+        logger.info(
+            f"Export project '{project.name}' - "
+            f"{'completed' if project_exported else 'skipped'} in {diff_t:.2f} seconds."
+        )
+        return project_exported
+
+    def _export_projects_concurrently(self, projects, workers, full):
+        """
+        Export projects concurrently, each project has its own git repository
+        and it is exported in its own process running the export_rcjk command
+        for the project (the project export lock prevents overlapping exports).
+        """
+        logger.info(
+            f"Exporting {len(projects)} projects using {workers} concurrent workers."
+        )
+        manage_path = fsutil.join_path(settings.BASE_DIR, "manage.py")
+
+        def export_project_in_subprocess(project):
+            cmd = [
+                sys.executable,
+                manage_path,
+                "export_rcjk",
+                "--project-uid",
+                str(project.uid),
+            ]
+            if full:
+                cmd.append("--full")
+            start_t = time.time()
+            returncode = subprocess.call(cmd)
+            diff_t = time.time() - start_t
+            logger.info(
+                f"Export project '{project.name}' - "
+                f"process exited with code {returncode} in {diff_t:.2f} seconds."
+            )
+            return project, returncode, diff_t
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(export_project_in_subprocess, projects))
+
+        for project, returncode, diff_t in results:
+            status = "ok" if returncode == 0 else f"error (exit code {returncode})"
+            self.stdout.write(f"{project.name}: {status} - {diff_t:.2f} seconds.")
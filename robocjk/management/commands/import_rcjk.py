@@ -1,3 +1,6 @@
+import datetime as dt
+import multiprocessing
+import time
 import zipfile
 
 import fsutil
@@ -24,8 +27,33 @@ from robocjk.models import (
     CharacterGlyphLayer,
     DeepComponent,
     Font,
+    GlifDataModel,
     StatusModel,
 )
+from robocjk.relations import format_glifs_relations_stats, update_glifs_relations
+from robocjk.utils import format_glif, get_digest
+
+
+def parse_glif_content(content):
+    """
+    Worker function for parsing .glif files content during bulk import,
+    it returns the glif model fields values and the parsing error (if any).
+    """
+    data = GlifData()
+    data.parse_string(content)
+    if not data.ok:
+        return None, str(data.error)
+    fields = GlifDataModel.get_data_fields(data)
+    try:
+        formatted_data = format_glif(fields["data"])
+    except Exception:
+        formatted_data = fields["data"]
+    fields["formatted_data"] = formatted_data
+    fields["data_hash"] = get_digest(formatted_data)
+    # parse status during import
+    fields["status"] = StatusModel.get_status_from_data(data)
+    fields["status_with_variations"] = data.status_with_variations
+    return fields, None
 
 
 class Command(BaseCommand):
@@ -97,6 +125,18 @@ class Command(BaseCommand):
             help="Delete existing Atomic Elements, Atomic Elements Layers, Deep Components, "
             "Character Glyphs, Character Glyphs Layers before importing new .rcjk file.",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Parse .glif files using multiple processes and insert/update them "
+            "in batches (glifs save method is not called).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of .glif files parsed and inserted/updated in each batch (bulk import only).",
+        )
 
     def handle(self, *args, **options):  # noqa: C901
         import_enabled = Setting.get("ROBOCJK_IMPORT_ENABLED", default=True)
@@ -163,35 +203,194 @@ class Command(BaseCommand):
                 group_count_title = group_name.replace("_", " ").title()
                 self.stdout.write(f"Found {group_count} {group_count_title} to import.")
 
+            if options.get("bulk", False):
+                batch_size = max(1, options.get("batch_size") or 500)
+                self._bulk_import(font_obj, file, batch_size)
+                font_obj.available = True
+                font_obj.save()
+                return
+
             for item in self._import_mappings:
                 for name, match in self._import_groups[item["group_name"]]:
                     item["import_func"](font_obj, self._zipfile_read(file, name), match)
 
         # update deep-components relations with atomic-elements
-        glif_objs = font_obj.deep_components.filter(has_components=True)
-        glif_objs_counter = 0
-        glif_objs_total = len(glif_objs)
-        self.stdout.write(f"Updating {glif_objs_total} DeepComponent relations...")
-        for glif_obj in glif_objs:
-            glif_obj.save()
-            glif_objs_counter += 1
-            # self.stdout.write('Updated DeepComponent relations - {} of {}'.format(glif_objs_counter, glif_objs_total))
-        self.stdout.write(f"Updated {glif_objs_total} DeepComponent relations.")
-
-        # update character-glyphs relations with deep-components
-        glif_objs = font_obj.character_glyphs.filter(has_components=True)
-        glif_objs_counter = 0
-        glif_objs_total = len(glif_objs)
-        self.stdout.write(f"Updating {glif_objs_total} CharacterGlyphs relations...")
-        for glif_obj in glif_objs:
-            glif_obj.save()
-            glif_objs_counter += 1
-            # self.stdout.write('Updated CharacterGlyph relations - {} of {}'.format(glif_objs_counter, glif_objs_total))
-        self.stdout.write(f"Updated {glif_objs_total} CharacterGlyphs relations.")
+        # and character-glyphs relations with deep-components
+        self._update_relations(font_obj)
 
         font_obj.available = True
         font_obj.save()
 
+    def _bulk_import(self, font, file, batch_size):
+        start_t = time.time()
+        for name, match in self._import_groups["fontlib"]:
+            self._import_fontlib(font, self._zipfile_read(file, name), match)
+        for name, match in self._import_groups["features"]:
+            self._import_features(font, self._zipfile_read(file, name), match)
+        for name, match in self._import_groups["designspace"]:
+            self._import_designspace(font, self._zipfile_read(file, name), match)
+
+        num_processes = max(1, (multiprocessing.cpu_count() - 1))
+        with multiprocessing.Pool(processes=num_processes) as pool:
+            for glif_cls, group_name in [
+                (AtomicElement, "atomic_elements"),
+                (DeepComponent, "deep_components"),
+                (CharacterGlyph, "character_glyphs"),
+            ]:
+                self._bulk_import_glifs(
+                    pool, file, glif_cls, font, group_name, batch_size
+                )
+            for glif_cls, cls, group_name in [
+                (AtomicElement, AtomicElementLayer, "atomic_elements_layers"),
+                (CharacterGlyph, CharacterGlyphLayer, "character_glyphs_layers"),
+            ]:
+                self._bulk_import_glifs_layers(
+                    pool, file, glif_cls, cls, font, group_name, batch_size
+                )
+
+        self._update_relations(font)
+        diff_t = time.time() - start_t
+        self.stdout.write(f"Imported '{font.name}' in {diff_t:.2f} seconds.")
+
+    def _bulk_parse_glifs(self, pool, file, entries, batch_size):
+        """
+        Parse the given zip entries using the processes pool,
+        yield batches of (entry, fields) tuples of the valid .glif files.
+        """
+        for index in range(0, len(entries), batch_size):
+            entries_batch = entries[index : index + batch_size]
+            contents = [self._zipfile_read(file, name) for name, _ in entries_batch]
+            results = pool.map(parse_glif_content, contents, chunksize=25)
+            batch = []
+            for entry, (fields, error) in zip(entries_batch, results):
+                if error:
+                    self.stderr.write(f"Import Error [{entry[0]}]: {error}")
+                    continue
+                batch.append((entry, fields))
+            yield batch
+
+    def _bulk_save(self, cls, objs_to_create, objs_to_update, fields_names):
+        now = dt.datetime.now()
+        for obj in objs_to_update:
+            obj.updated_at = now
+        cls.objects.bulk_create(objs_to_create)
+        cls.objects.bulk_update(objs_to_update, fields_names + ["updated_at"])
+
+    def _bulk_import_glifs(self, pool, file, cls, font, group_name, batch_size):
+        entries = self._import_groups[group_name]
+        objs_ids = dict(cls.objects.filter(font=font).values_list("name", "id"))
+        cls_fields_names = {field.attname for field in cls._meta.concrete_fields}
+        objs_counter = 0
+        for batch in self._bulk_parse_glifs(pool, file, entries, batch_size):
+            objs_to_create = {}
+            objs_to_update = {}
+            fields_names = []
+            for _, fields in batch:
+                fields = {
+                    key: value
+                    for key, value in fields.items()
+                    if key in cls_fields_names
+                }
+                fields_names = list(fields.keys())
+                obj = cls(font=font, **fields)
+                obj_id = objs_ids.get(obj.name)
+                if obj_id:
+                    obj.id = obj_id
+                    objs_to_update[obj.name] = obj
+                else:
+                    objs_to_create[obj.name] = obj
+            self._bulk_save(
+                cls,
+                list(objs_to_create.values()),
+                list(objs_to_update.values()),
+                fields_names,
+            )
+            # ids of created objects are not returned by all database backends
+            objs_ids.update(
+                cls.objects.filter(
+                    font=font, name__in=list(objs_to_create.keys())
+                ).values_list("name", "id")
+            )
+            objs_counter += len(batch)
+            self.stdout.write(
+                f"Imported {objs_counter} of {len(entries)} - {cls} models."
+            )
+
+    def _bulk_import_glifs_layers(
+        self, pool, file, glif_cls, cls, font, group_name, batch_size
+    ):
+        entries = self._import_groups[group_name]
+        glifs_ids = dict(glif_cls.objects.filter(font=font).values_list("name", "id"))
+        objs_ids = {
+            (glif_id, layer_name): obj_id
+            for glif_id, layer_name, obj_id in cls.objects.filter(
+                glif__font=font
+            ).values_list("glif_id", "group_name", "id")
+        }
+        cls_fields_names = {field.attname for field in cls._meta.concrete_fields}
+        updated_glifs_ids = set()
+        objs_counter = 0
+        for batch in self._bulk_parse_glifs(pool, file, entries, batch_size):
+            objs_to_create = {}
+            objs_to_update = {}
+            fields_names = []
+            for (_, match), fields in batch:
+                layer_name = match.groupdict()["layer_name"]
+                layer_name = unquote_filename(layer_name)
+                glif_id = glifs_ids.get(fields["name"])
+                if not glif_id:
+                    self.stderr.write(
+                        f"Import Error {cls} [{layer_name}]: {fields['name']}"
+                    )
+                    continue
+                fields = {
+                    key: value
+                    for key, value in fields.items()
+                    if key in cls_fields_names
+                }
+                fields_names = list(fields.keys())
+                obj = cls(glif_id=glif_id, group_name=layer_name, **fields)
+                obj_key = (glif_id, layer_name)
+                obj_id = objs_ids.get(obj_key)
+                if obj_id:
+                    obj.id = obj_id
+                    objs_to_update[obj_key] = obj
+                else:
+                    objs_to_create[obj_key] = obj
+                updated_glifs_ids.add(glif_id)
+            self._bulk_save(
+                cls,
+                list(objs_to_create.values()),
+                list(objs_to_update.values()),
+                fields_names,
+            )
+            # ids of created objects are not returned by all database backends
+            created_glifs_ids = {glif_id for glif_id, _ in objs_to_create.keys()}
+            objs_ids.update(
+                {
+                    (glif_id, group_name): obj_id
+                    for glif_id, group_name, obj_id in cls.objects.filter(
+                        glif_id__in=list(created_glifs_ids)
+                    ).values_list("glif_id", "group_name", "id")
+                }
+            )
+            objs_counter += len(batch)
+            self.stdout.write(
+                f"Imported {objs_counter} of {len(entries)} - {cls} models."
+            )
+        # update glifs layers_updated_at field
+        updated_glifs_ids = list(updated_glifs_ids)
+        now = dt.datetime.now()
+        for index in range(0, len(updated_glifs_ids), batch_size):
+            glif_cls.objects.filter(
+                id__in=updated_glifs_ids[index : index + batch_size]
+            ).update(layers_updated_at=now)
+
+    def _update_relations(self, font):
+        self.stdout.write(f"Updating '{font.name}' glifs relations...")
+        stats = update_glifs_relations(font.id)
+        self.stdout.write(format_glifs_relations_stats(stats))
+
     def _zipfile_read(self, file, path, encoding="utf-8"):
         return str(file.read(path), encoding)
 
@@ -0,0 +1,84 @@
+import time
+from xml.etree import ElementTree
+
+import fsutil
+from benedict import benedict
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from robocjk.core import GlifData
+
+
+def parse_glif_data_legacy(s):
+    """
+    The previous GlifData parsing steps: the xml is parsed, serialized back
+    to string, then the lib dict is serialized again and parsed as plist.
+    """
+    xml = ElementTree.fromstring(s.strip())
+    xml_string = "<?xml version='1.0' encoding='UTF-8'?>\n{}".format(
+        ElementTree.tostring(xml).decode()
+    )
+    lib = None
+    lib_xml = xml.find("./lib/dict")
+    if lib_xml is not None:
+        lib_str = ElementTree.tostring(lib_xml).decode()
+        lib = benedict.from_plist(lib_str, keypath_separator="/")
+    return xml_string, lib
+
+
+def parse_glif_data(s):
+    glif_data = GlifData()
+    glif_data.parse_string(s)
+    return glif_data
+
+
+class Command(BaseCommand):
+    help = "Test GlifData parsing performance compared to the legacy parsing."
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            required=False,
+            default=fsutil.join_path(settings.BASE_DIR, "robocjk/tests"),
+            help="The path of the directory containing the .glif files to parse.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=100,
+            help="The number of times each .glif file is parsed.",
+        )
+
+    def handle(self, *args, **options):
+        path = options.get("path")
+        iterations = max(1, options.get("iterations"))
+        filepaths = fsutil.search_files(path, "**/*.glif")
+        glifs_data = [fsutil.read_file(filepath) for filepath in filepaths]
+        glifs_count = len(glifs_data) * iterations
+        print(f"Parsing {len(glifs_data)} .glif files {iterations} times.")
+
+        results = {}
+        for name, parse_func in [
+            ("legacy", parse_glif_data_legacy),
+            ("single-pass", parse_glif_data),
+        ]:
+            start_t = time.perf_counter()
+            for _ in range(iterations):
+                for glif_data in glifs_data:
+                    try:
+                        parse_func(glif_data)
+                    except ElementTree.ParseError:
+                        pass
+            diff_t = time.perf_counter() - start_t
+            results[name] = diff_t
+            rate = (glifs_count / diff_t) if diff_t > 0 else 0
+            print(
+                f"Parsed {glifs_count} glifs ({name}) in {diff_t:.3f}s ({rate:.1f}/s)"
+            )
+
+        if results["single-pass"] > 0:
+            speedup = results["legacy"] / results["single-pass"]
+            print(f"Speedup: {speedup:.2f}x")
@@ -0,0 +1,122 @@
+import time
+import warnings
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator, UnorderedObjectListWarning
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from robocjk.models import Font, Project
+from robocjk.synthetic import create_synthetic_font
+
+
+def iterate_paginator_chunks(queryset, chunk_size):
+    """
+    The previous pagination: LIMIT/OFFSET queries (without explicit ordering)
+    and a COUNT(*) query.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UnorderedObjectListWarning)
+        paginator = Paginator(queryset, chunk_size)
+    for page in paginator:
+        yield page.object_list
+
+
+class Command(BaseCommand):
+    help = (
+        "Test queries pagination performance, "
+        "keyset pagination compared to the offset pagination (Paginator)."
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--font-uid",
+            required=False,
+            help="The uid of the font to use, if not provided a synthetic font "
+            "is created (and deleted at the end).",
+        )
+        parser.add_argument(
+            "--character-glyphs",
+            type=int,
+            default=5000,
+            help="The number of character glyphs of the synthetic font.",
+        )
+        parser.add_argument(
+            "--layers",
+            type=int,
+            default=2,
+            help="The number of layers of each character glyph of the synthetic font.",
+        )
+        parser.add_argument(
+            "--per-page",
+            type=int,
+            default=settings.ROBOCJK_EXPORT_QUERIES_PAGINATION_LIMIT,
+            help="The number of objects loaded by each query.",
+        )
+
+    def handle(self, *args, **options):
+        font_uid = options.get("font_uid")
+        per_page = max(1, options.get("per_page"))
+        with transaction.atomic():
+            if font_uid:
+                try:
+                    font = Font.objects.get(uid=font_uid)
+                except Font.DoesNotExist as font_error:
+                    message = (
+                        f"Invalid font_uid, font with uid {font_uid!r} doesn't exist."
+                    )
+                    raise CommandError(message) from font_error
+            else:
+                project = Project.objects.create(
+                    name="Pagination Benchmark",
+                    repo_url="git@github.com:robocjk/pagination-benchmark.git",
+                )
+                start_t = time.perf_counter()
+                font = create_synthetic_font(
+                    project,
+                    "Pagination Benchmark",
+                    character_glyphs=max(0, options.get("character_glyphs")),
+                    layers=max(0, options.get("layers")),
+                )
+                diff_t = time.perf_counter() - start_t
+                print(f"Created synthetic font in {diff_t:.3f}s.")
+            self._test_pagination(font, per_page)
+            # don't keep the synthetic font
+            transaction.set_rollback(not font_uid)
+
+    def _test_pagination(self, font, per_page):
+        for glifs_type_name, glifs_qs, _, glifs_layers in font.get_glifs_querysets():
+            glifs_qs = glifs_qs.values_list("id", "filename")
+
+            def iterate_keyset_chunks(queryset, chunk_size, glifs_layers=glifs_layers):
+                return font.iterate_glifs_queryset_chunks(
+                    queryset, glifs_layers, chunk_size
+                )
+
+            results = {}
+            for name, iterate_func in [
+                ("paginator", iterate_paginator_chunks),
+                ("keyset", iterate_keyset_chunks),
+            ]:
+                with CaptureQueriesContext(connection) as queries:
+                    start_t = time.perf_counter()
+                    glifs_ids = [
+                        glif[0]
+                        for glifs_list in iterate_func(glifs_qs, per_page)
+                        for glif in glifs_list
+                    ]
+                    diff_t = time.perf_counter() - start_t
+                results[name] = diff_t
+                duplicates_count = len(glifs_ids) - len(set(glifs_ids))
+                print(
+                    f"Loaded {len(glifs_ids)} {glifs_type_name} ({name}) "
+                    f"in {diff_t:.3f}s with {len(queries)} queries "
+                    f"({duplicates_count} duplicates)."
+                )
+            if results["keyset"] > 0:
+                speedup = results["paginator"] / results["keyset"]
+                print(f"Speedup: {speedup:.2f}x")
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
-from django.core.paginator import Paginator
 
 from robocjk.models import CharacterGlyph
+from robocjk.utils import iterate_queryset_chunks
 
 
 class Command(BaseCommand):
@@ -12,15 +12,13 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         glifs_queryset = CharacterGlyph.objects.all()
-        glifs_paginator = Paginator(glifs_queryset, 1000)
+        glifs_chunks = iterate_queryset_chunks(glifs_queryset, 1000)
 
         glif_objs_counter = 0
         glif_objs_updated_counter = 0
         glif_objs_total = CharacterGlyph.objects.count()
 
-        for glifs_page in glifs_paginator:
-            glifs_list = glifs_page.object_list
-
+        for glifs_list in glifs_chunks:
             for glif_obj in glifs_list:
                 glif_data = glif_obj._parse_data(glif_obj.data)
                 if glif_data:
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from robocjk.models import (
+    AtomicElement,
+    AtomicElementLayer,
+    CharacterGlyph,
+    CharacterGlyphLayer,
+    DeepComponent,
+)
+from robocjk.utils import get_digest, iterate_queryset_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        "Update all glifs formatted_data and data_hash fields "
+        "(formatted xml data and its digest)."
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Update also glifs that already have formatted_data and data_hash values.",
+        )
+
+    def handle(self, *args, **options):
+        update_all = options.get("all", False)
+        glif_models = [
+            CharacterGlyph,
+            CharacterGlyphLayer,
+            DeepComponent,
+            AtomicElement,
+            AtomicElementLayer,
+        ]
+        for glif_model in glif_models:
+            glif_objs_qs = glif_model.objects.only("id", "data")
+            if not update_all:
+                glif_objs_qs = glif_objs_qs.filter(
+                    Q(formatted_data="") | Q(data_hash="")
+                )
+            self._update_formatted_data(glif_model, glif_objs_qs)
+
+    def _update_formatted_data(self, glif_model, queryset):
+        objs_count = queryset.count()
+        objs_counter = 0
+        objs_per_page = 500
+        for objs_list in iterate_queryset_chunks(queryset, objs_per_page):
+            for obj in objs_list:
+                formatted_data = obj.format_data() if obj.data else ""
+                data_hash = get_digest(formatted_data) if obj.data else ""
+                # don't call save method because it updates the updated_at field timestamp
+                glif_model.objects.filter(pk=obj.pk).update(
+                    formatted_data=formatted_data, data_hash=data_hash
+                )
+            objs_counter += len(objs_list)
+            print(f"Updated {objs_counter} of {objs_count} - {glif_model} models.")
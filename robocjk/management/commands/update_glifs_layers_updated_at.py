@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 
 from robocjk.models import AtomicElement, CharacterGlyph
+from robocjk.utils import iterate_queryset_chunks
 
 
 class Command(BaseCommand):
@@ -18,17 +19,11 @@ class Command(BaseCommand):
         self._update_layers_updated_at(queryset=character_glyphs_qs)
 
     def _update_layers_updated_at(self, queryset):
-        objs_qs = queryset
         objs_count = queryset.count()
         objs_counter = 0
-        objs_min_id = 0
         objs_per_page = 500
-        while True:
-            objs_list = list(objs_qs.filter(id__gt=objs_min_id)[:objs_per_page])
-            if not objs_list:
-                break
+        for objs_list in iterate_queryset_chunks(queryset, objs_per_page):
             for obj in objs_list:
                 obj.update_layers_updated_at()
             objs_counter += len(objs_list)
-            objs_min_id = objs_list[-1].id
             print(f"Updated {objs_counter} of {objs_count} glifs.")
@@ -1,12 +1,7 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
-from robocjk.models import (
-    AtomicElement,
-    AtomicElementLayer,
-    CharacterGlyph,
-    CharacterGlyphLayer,
-    DeepComponent,
-)
+from robocjk.models import Font
+from robocjk.relations import format_glifs_relations_stats, update_glifs_relations
 
 
 class Command(BaseCommand):
@@ -15,22 +10,23 @@ class Command(BaseCommand):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--font-uid",
+            required=False,
+            help="The uid 'xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx' of the font whose relations will be updated.",
+        )
+
     def handle(self, *args, **options):
-        glif_models = [
-            CharacterGlyph,
-            CharacterGlyphLayer,
-            DeepComponent,
-            AtomicElement,
-            AtomicElementLayer,
-        ]
-        for glif_model in glif_models:
-            print(f"Updating {glif_model} models.")
-            glif_objs = glif_model.objects.filter(has_components=True)
-            glif_objs_counter = 0
-            glif_objs_total = len(glif_objs)
-            for glif_obj in glif_objs:
-                glif_obj.save()
-                glif_objs_counter += 1
-                print(
-                    f"Updated {glif_objs_counter} of {glif_objs_total} - {glif_model} models."
-                )
+        fonts_qs = Font.objects.all()
+        font_uid = options.get("font_uid")
+        if font_uid:
+            fonts_qs = fonts_qs.filter(uid=font_uid)
+            if not fonts_qs.exists():
+                message = f"Invalid font_uid, font with uid '{font_uid}' doesn't exist."
+                self.stderr.write(message)
+                raise CommandError(message)
+        for font_obj in fonts_qs:
+            self.stdout.write(f"Updating '{font_obj.name}' glifs relations...")
+            stats = update_glifs_relations(font_obj.id)
+            self.stdout.write(format_glifs_relations_stats(stats))
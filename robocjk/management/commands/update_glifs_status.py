@@ -33,6 +33,11 @@ class Command(BaseCommand):
                     # save glif model only if some status field changed
                     if glif_obj_changed:
                         glif_obj.save()
+                    elif glif_obj.status_with_variations is None:
+                        # don't call save method because it updates the updated_at field timestamp
+                        glif_model.objects.filter(pk=glif_obj.pk).update(
+                            status_with_variations=glif_data.status_with_variations
+                        )
 
                 glif_objs_counter += 1
                 print(
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from robocjk.models import (
+    AtomicElement,
+    AtomicElementLayer,
+    CharacterGlyph,
+    CharacterGlyphLayer,
+    DeepComponent,
+)
+from robocjk.utils import iterate_queryset_chunks, unicodes_str_to_list
+
+
+class Command(BaseCommand):
+    help = "Update all glifs unicodes field (unicode int values list of unicode_hex)."
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def handle(self, *args, **options):
+        glif_models = [
+            CharacterGlyph,
+            CharacterGlyphLayer,
+            DeepComponent,
+            AtomicElement,
+            AtomicElementLayer,
+        ]
+        for glif_model in glif_models:
+            glif_objs_qs = glif_model.objects.exclude(unicode_hex="").values_list(
+                "id", "unicode_hex"
+            )
+            self._update_unicodes(glif_model, glif_objs_qs)
+
+    def _update_unicodes(self, glif_model, queryset):
+        objs_count = queryset.count()
+        objs_counter = 0
+        objs_per_page = 1000
+        for objs_list in iterate_queryset_chunks(queryset, objs_per_page):
+            objs = [
+                glif_model(
+                    id=obj_id,
+                    unicodes=unicodes_str_to_list(obj_unicode_hex, to_int=True),
+                )
+                for obj_id, obj_unicode_hex in objs_list
+            ]
+            # don't call save method because it updates the updated_at field timestamp
+            glif_model.objects.bulk_update(objs, ["unicodes"])
+            objs_counter += len(objs_list)
+            print(f"Updated {objs_counter} of {objs_count} - {glif_model} models.")
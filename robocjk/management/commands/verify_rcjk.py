@@ -21,6 +21,11 @@ class Command(BaseCommand):
             action="store_true",
             help="Cleanup all projects.",
         )
+        parser.add_argument(
+            "--deep",
+            action="store_true",
+            help="Verify walking the file-system instead of using the export manifest.",
+        )
 
     def handle(self, *args, **options):
         process_id = os.getpid()
@@ -29,12 +34,13 @@ class Command(BaseCommand):
 
         project_uid = options.get("project_uid", None)
         all_projects = options.get("all_projects", False)
+        deep = options.get("deep", False)
 
         if project_uid:
             # export specific project
             try:
                 project_obj = Project.objects.get(uid=project_uid)
-                project_obj.verify_file_system()
+                project_obj.verify_file_system(deep=deep)
             except Project.DoesNotExist as project_error:
                 message = f"Invalid project_uid, project with uid {project_uid!r} doesn't exist."
                 self.stderr.write(message)
@@ -43,7 +49,7 @@ class Command(BaseCommand):
             # export all projects
             projects_qs = Project.objects.prefetch_related("fonts")
             for project_obj in projects_qs:
-                project_obj.verify_file_system()
+                project_obj.verify_file_system(deep=deep)
         else:
             message = "Missing expected argument --project-uid or --all-projects"
             raise CommandError(message)
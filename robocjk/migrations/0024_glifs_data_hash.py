@@ -0,0 +1,67 @@
+# Generated by Django 5.0.1 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("robocjk", "0023_alter_atomicelement_status_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="atomicelement",
+            name="data_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data digest, computed on save)",
+                max_length=32,
+                verbose_name="Data hash",
+            ),
+        ),
+        migrations.AddField(
+            model_name="atomicelementlayer",
+            name="data_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data digest, computed on save)",
+                max_length=32,
+                verbose_name="Data hash",
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterglyph",
+            name="data_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data digest, computed on save)",
+                max_length=32,
+                verbose_name="Data hash",
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterglyphlayer",
+            name="data_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data digest, computed on save)",
+                max_length=32,
+                verbose_name="Data hash",
+            ),
+        ),
+        migrations.AddField(
+            model_name="deepcomponent",
+            name="data_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data digest, computed on save)",
+                max_length=32,
+                verbose_name="Data hash",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.0.1 on 2026-10-18 19:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("robocjk", "0024_glifs_data_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="atomicelement",
+            name="formatted_data",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data, computed on save)",
+                verbose_name="Formatted data",
+            ),
+        ),
+        migrations.AddField(
+            model_name="atomicelementlayer",
+            name="formatted_data",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data, computed on save)",
+                verbose_name="Formatted data",
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterglyph",
+            name="formatted_data",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data, computed on save)",
+                verbose_name="Formatted data",
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterglyphlayer",
+            name="formatted_data",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data, computed on save)",
+                verbose_name="Formatted data",
+            ),
+        ),
+        migrations.AddField(
+            model_name="deepcomponent",
+            name="formatted_data",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="(.glif formatted xml data, computed on save)",
+                verbose_name="Formatted data",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.1 on 2026-10-18 19:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("robocjk", "0025_glifs_formatted_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="atomicelement",
+            name="status_with_variations",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                editable=False,
+                help_text="(status and variations status, autodetected from xml data)",
+                null=True,
+                verbose_name="Status with variations",
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterglyph",
+            name="status_with_variations",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                editable=False,
+                help_text="(status and variations status, autodetected from xml data)",
+                null=True,
+                verbose_name="Status with variations",
+            ),
+        ),
+        migrations.AddField(
+            model_name="deepcomponent",
+            name="status_with_variations",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                editable=False,
+                help_text="(status and variations status, autodetected from xml data)",
+                null=True,
+                verbose_name="Status with variations",
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-18 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("robocjk", "0026_glifs_status_with_variations"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportLock",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(max_length=100, unique=True, verbose_name="Key"),
+                ),
+                (
+                    "holder",
+                    models.CharField(blank=True, max_length=200, verbose_name="Holder"),
+                ),
+                (
+                    "acquired_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Acquired at"
+                    ),
+                ),
+                (
+                    "heartbeat_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Heartbeat at"
+                    ),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        blank=True, db_index=True, null=True, verbose_name="Expires at"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Export Lock",
+                "verbose_name_plural": "Export Locks",
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.0.1 on 2026-10-18 20:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("robocjk", "0027_export_lock"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportRun",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "full_export",
+                    models.BooleanField(default=False, verbose_name="Full export"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("error", "Error"),
+                        ],
+                        db_index=True,
+                        default="running",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(db_index=True, verbose_name="Started at"),
+                ),
+                (
+                    "completed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Completed at"
+                    ),
+                ),
+                (
+                    "duration",
+                    models.FloatField(
+                        blank=True,
+                        db_index=True,
+                        help_text="(seconds)",
+                        null=True,
+                        verbose_name="Duration",
+                    ),
+                ),
+                (
+                    "files_written",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Files written"
+                    ),
+                ),
+                (
+                    "bytes_written",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Bytes written"
+                    ),
+                ),
+                (
+                    "timings",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="(seconds spent by each export phase)",
+                        verbose_name="Timings",
+                    ),
+                ),
+                (
+                    "counts",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="(glifs files and bytes written for each glif type)",
+                        verbose_name="Counts",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Error")),
+                (
+                    "font",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="export_runs",
+                        to="robocjk.font",
+                        verbose_name="Font",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="export_runs",
+                        to="robocjk.project",
+                        verbose_name="Project",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Export Run",
+                "verbose_name_plural": "Export Runs",
+                "ordering": ["-started_at"],
+            },
+        ),
+    ]
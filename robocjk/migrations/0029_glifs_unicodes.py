@@ -0,0 +1,62 @@
+# Generated by Django 5.0.1 on 2026-10-18 20:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("robocjk", "0028_export_run"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="atomicelement",
+            name="unicodes",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="(unicode int values list, computed on save)",
+                verbose_name="Unicodes",
+            ),
+        ),
+        migrations.AddField(
+            model_name="atomicelementlayer",
+            name="unicodes",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="(unicode int values list, computed on save)",
+                verbose_name="Unicodes",
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterglyph",
+            name="unicodes",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="(unicode int values list, computed on save)",
+                verbose_name="Unicodes",
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterglyphlayer",
+            name="unicodes",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="(unicode int values list, computed on save)",
+                verbose_name="Unicodes",
+            ),
+        ),
+        migrations.AddField(
+            model_name="deepcomponent",
+            name="unicodes",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="(unicode int values list, computed on save)",
+                verbose_name="Unicodes",
+            ),
+        ),
+    ]
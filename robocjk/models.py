@@ -1,18 +1,17 @@
 import datetime as dt
-import multiprocessing
-
-# import os
-import subprocess
+import os
+import socket
+import threading
+import uuid
 
 import fsutil
 from benedict import benedict
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
-from django.core.paginator import Paginator
 from django.core.validators import FileExtensionValidator
-from django.db import models
-from django.db.models import Max
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Case, F, Max, Q, Value, When
 from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -35,7 +34,11 @@ from robocjk.api.serializers import (
 )
 from robocjk.core import GlifData
 from robocjk.debug import logger
-from robocjk.exceptions import VerificationError
+from robocjk.exceptions import ExportLockLostError, VerificationError
+from robocjk.io.export import ExportPipeline
+from robocjk.io.git import GitRepository
+from robocjk.io.journal import ExportJournal
+from robocjk.io.manifest import ExportManifest
 from robocjk.io.paths import (
     get_atomic_element_layer_path,
     get_atomic_element_path,
@@ -45,9 +48,14 @@ from robocjk.io.paths import (
     get_character_glyphs_path,
     get_deep_component_path,
     get_deep_components_path,
+    get_font_manifest_path,
     get_font_path,
+    get_glifs_layers_paths,
+    get_glifs_paths,
     get_project_path,
     get_proof_path,
+    scan_dirs,
+    scan_glifs_files,
 )
 from robocjk.managers import (
     AtomicElementLayerManager,
@@ -58,48 +66,17 @@ from robocjk.managers import (
     FontManager,
     ProjectManager,
 )
+from robocjk.relations import update_glifs_relations
 from robocjk.signals import connect_signals
-from robocjk.utils import format_glif, unicodes_str_to_list
+from robocjk.utils import (
+    format_glif,
+    get_digest,
+    iterate_queryset_chunks,
+    iterate_queryset_chunks_by_parent,
+    unicodes_str_to_list,
+)
 from robocjk.validators import GitSSHRepositoryURLValidator
 
-# import time
-
-
-def run_commands(*args):
-    cmds = args
-    cmd = " && ".join(cmds)
-    logger.info(f"Run commands: \n{cmd}")
-
-    # # Run commands using os.system
-    # os.system(cmd)
-
-    # # Run commands using Popen
-    # cmd_process = subprocess.Popen(cmd, shell=True)
-    # cmd_process.wait()
-
-    # Run commands using check_output
-    cmd_output = b""
-    try:
-        cmd_output = subprocess.check_output(cmd, shell=True)
-        cmd_output_str = cmd_output.decode("UTF-8")
-        logger.info(f"Command output: {cmd_output_str}")
-    except subprocess.CalledProcessError as error:
-        # print("error code", error.returncode, error.output)
-        if error.returncode == 1:
-            # Your branch is up to date with 'origin/master'.
-            # nothing to commit, working tree clean
-            pass
-        else:
-            if error.returncode == 128:
-                logger.error(
-                    "Command returned non-zero exit status 128, "
-                    "check if git repo and branch are correct."
-                )
-            cmd_output = error.output
-            cmd_output_str = cmd_output.decode("UTF-8")
-            logger.exception(f"Command error: {cmd_output_str}")
-            raise error
-
 
 class Project(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
     """
@@ -150,38 +127,32 @@ class Project(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel)
         super().save_by(user)
         self.designers.add(user)
 
+    def get_export_run_fields(self):
+        return {"project": self}
+
     def save_to_file_system(self, full_export=False):
         logger.info(f'Saving project "{self.name}" to file system...')
+        profiler = self.get_export_profiler()
         path = self.path()
         fsutil.make_dirs(path)
-        repo_path = fsutil.join_path(path, ".git")
         repo_branch = self.repo_branch or "main"
-        if not fsutil.exists(repo_path):
+        repo = GitRepository(path, branch=repo_branch)
+        if not repo.exists():
             # repository doesn't exist, initialize it
             logger.info(
                 f"Repository for project '{self.name}' doesn't exist, initialize it."
             )
-            run_commands(
-                f"cd {path}",
-                "git init",
-                f'git config --local --add "user.name" "{settings.GIT_USER_NAME}"',
-                f'git config --local --add "user.email" "{settings.GIT_USER_EMAIL}"',
-                f"git remote add origin {self.repo_url}",
-                f"git pull origin {repo_branch}",
-                f"git push --set-upstream origin {repo_branch}",
+            repo.init(
+                self.repo_url,
+                user_name=settings.GIT_USER_NAME,
+                user_email=settings.GIT_USER_EMAIL,
             )
         else:
             # repository exist
             logger.info(
                 f'Repository for project "{self.name}" already exist, update it.'
             )
-            run_commands(
-                f"cd {path}",
-                "git reset --hard",
-                f"git checkout {repo_branch}",
-                f"git pull origin {repo_branch}",
-                "git clean -df",
-            )
+            repo.update()
         # save all project fonts to file.system
         fonts_qs = self.fonts.all()
         fonts_list = list(fonts_qs)
@@ -202,44 +173,57 @@ class Project(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel)
             f"to file system... \n{font_names}"
         )
 
+        changed_paths = list(fonts_rcjk_deleted_dirs)
+        commit_messages = []
         for font in fonts_list:
-            font_dirpath = fsutil.get_filename(font.path())
+            # stop exporting if another process took over the project export
+            self.check_export_lock()
+            font_path = font.path()
             font_commit_message = font.get_commit_message()
-            font_export_success = font.export(full=full_export)
+            with profiler.span(f"fonts.{font.slug}"):
+                font_export_success = font.export(full=full_export)
             if font_export_success:
-                # add all changed files, commit and push to the git repository
-                run_commands(
-                    f"cd {path}",
-                    f"git add ./{font_dirpath}",
-                    f'git commit -m "{font_commit_message}"',
-                    f"git push origin {repo_branch}",
-                )
+                # stage only the paths written or removed by the font export
+                changed_paths += font.export_journal.paths
+                commit_messages.append(font_commit_message)
+                for glif_type, counters in font.export_profiler.counts.items():
+                    profiler.add_count(
+                        glif_type,
+                        total=counters["total"],
+                        written=counters["written"],
+                        size=counters["bytes"],
+                    )
             else:
-                # reset all changed files
-                run_commands(
-                    f"cd {path}",
-                    "git reset --hard",
-                    f"git checkout {repo_branch}",
-                    f"git pull origin {repo_branch}",
-                    "git clean -df",
-                )
+                # reset only the changed files of the failed font
+                repo.restore([font_path])
+
+        # add all changed files of the exported fonts with a single commit
+        # and push them to the git repository
+        self.check_export_lock(renew=True)
+        repo.add(changed_paths)
+        if repo.commit(self.get_commit_message(commit_messages)):
+            self.check_export_lock(renew=True)
+            repo.push()
+        profiler.add_timings(repo.timings, prefix="git.")
+        logger.info(
+            f"Saved project '{self.name}' - git timings: {repo.format_timings()}"
+        )
 
-        # # This is not needed for exporting .rcjk data and could commit
-        # # unwanted changes when font export failed (font_export_success=False).
-        # run_commands(
-        #     f"cd {path}",
-        #     "git add --all",
-        #     'git commit -m "{}"'.format("Updated project."),
-        #     f"git push origin {repo_branch}",
-        # )
+    def get_commit_message(self, fonts_commit_messages):
+        if len(fonts_commit_messages) == 1:
+            return fonts_commit_messages[0]
+        message = f"Updated {self.name}."
+        if fonts_commit_messages:
+            return "{}\n\n{}".format(message, "\n".join(fonts_commit_messages))
+        return message
 
     def cleanup_file_system(self):
         for font_obj in self.fonts.all():
             font_obj.cleanup_file_system()
 
-    def verify_file_system(self):
+    def verify_file_system(self, deep=False):
         for font_obj in self.fonts.all():
-            font_obj.verify_file_system()
+            font_obj.verify_file_system(deep=deep)
 
     def serialize(self, options=None):
         return serialize_project(self, options)
@@ -248,21 +232,6 @@ class Project(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel)
         return force_str(f"{self.name}")
 
 
-def save_glif_to_file_system(glif_data):
-    """
-    Worker function for saving glif files to file-system.
-    """
-    # logger.debug('Saving glif "{}" to file system: {}'.format(glif, glif.path()))
-    filepath, content = glif_data
-    # file_exists = fsutil.exists(filepath)
-    # assert not file_exists
-    fsutil.write_file(filepath, content)
-    # file_exists = fsutil.exists(filepath)
-    # assert file_exists
-    # return file_exists
-    return True
-
-
 class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
     """
     The Font model.
@@ -344,9 +313,18 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
     def path(self):
         return get_font_path(self)
 
-    def save_to_file_system(self, full_export=False):  # noqa: C901
+    def get_export_run_fields(self):
+        return {"project_id": self.project_id, "font": self}
+
+    def save_to_file_system(self, full_export=False, journal=None):  # noqa: C901
         font = self
         font_name = font.full_name
+        # keep track of the paths written/removed by the export
+        if journal is None:
+            journal = ExportJournal()
+        font.export_journal = journal
+        # keep track of the time spent by each export phase
+        profiler = font.get_export_profiler()
         if not font.available:
             logger.info(
                 f"Skipped font '{font_name}' saving because "
@@ -356,65 +334,91 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
         logger.info(f"Saving font '{font_name}' to file system...")
         font_path = font.path()
         fsutil.make_dirs(font_path)
-        # write fontLib.json file
-        logger.info(f"Saving font '{font_name}' 'fontLib.json' to file system...")
-        fontlib_path = fsutil.join_path(font_path, "fontLib.json")
-        fontlib_str = benedict(font.fontlib, keypath_separator=None).dump()
-        fsutil.write_file(fontlib_path, fontlib_str)
-        # write features.fea file
-        logger.info(f"Saving font '{font_name}' 'features.fea' to file system...")
-        features_path = fsutil.join_path(font_path, "features.fea")
-        fsutil.write_file(features_path, font.features)
-        # write designspace.json file
-        logger.info(f"Saving font '{font_name}' 'designspace.json' to file system...")
-        designspace_path = fsutil.join_path(font_path, "designspace.json")
-        designspace_str = benedict(font.designspace, keypath_separator=None).dump()
-        fsutil.write_file(designspace_path, designspace_str)
-        # write glyphsComposition.json file
-        logger.info(
-            f"Saving font '{font_name}' 'glyphsComposition.json' to file system..."
-        )
-        glyphs_composition_obj, _ = GlyphsComposition.objects.get_or_create(
-            font_id=font.id
-        )
-        glyphs_composition_path = fsutil.join_path(font_path, "glyphsComposition.json")
-        glyphs_composition_str = benedict(
-            glyphs_composition_obj.serialize(), keypath_separator=None
-        ).dump()
-        fsutil.write_file(glyphs_composition_path, glyphs_composition_str)
-
-        # delete existing character-glyphs, deep-components and atomic-elements directories
-        logger.info(
-            f"Deleting font '{font_name}' character-glyphs, "
-            "deep-components and atomic-elements folders..."
-        )
+        with profiler.span("files"):
+            # write fontLib.json file
+            logger.info(f"Saving font '{font_name}' 'fontLib.json' to file system...")
+            fontlib_path = fsutil.join_path(font_path, "fontLib.json")
+            fontlib_str = benedict(font.fontlib, keypath_separator=None).dump()
+            fsutil.write_file(fontlib_path, fontlib_str)
+            journal.write(fontlib_path)
+            # write features.fea file
+            logger.info(f"Saving font '{font_name}' 'features.fea' to file system...")
+            features_path = fsutil.join_path(font_path, "features.fea")
+            fsutil.write_file(features_path, font.features)
+            journal.write(features_path)
+            # write designspace.json file
+            logger.info(
+                f"Saving font '{font_name}' 'designspace.json' to file system..."
+            )
+            designspace_path = fsutil.join_path(font_path, "designspace.json")
+            designspace_str = benedict(font.designspace, keypath_separator=None).dump()
+            fsutil.write_file(designspace_path, designspace_str)
+            journal.write(designspace_path)
+            # write glyphsComposition.json file
+            logger.info(
+                f"Saving font '{font_name}' 'glyphsComposition.json' to file system..."
+            )
+            glyphs_composition_obj, _ = GlyphsComposition.objects.get_or_create(
+                font_id=font.id
+            )
+            glyphs_composition_path = fsutil.join_path(
+                font_path, "glyphsComposition.json"
+            )
+            glyphs_composition_str = benedict(
+                glyphs_composition_obj.serialize(), keypath_separator=None
+            ).dump()
+            fsutil.write_file(glyphs_composition_path, glyphs_composition_str)
+            journal.write(glyphs_composition_path)
 
         character_glyphs_path = get_character_glyphs_path(font)
         deep_components_path = get_deep_components_path(font)
         atomic_elements_path = get_atomic_elements_path(font)
 
-        # cleanup glifs dirs/files
-        updated_after = None
-        if full_export:
-            # remove existing glifs dirs
-            fsutil.remove_dirs(
-                character_glyphs_path,
-                deep_components_path,
-                atomic_elements_path,
-            )
-        else:
-            # set updated_after only if not running a full export
-            if font.export_started_at and font.export_completed_at:
-                updated_after = min(font.export_started_at, font.export_completed_at)
-            # delete possible zombie files of glifs that have been deleted
-            if updated_after:
-                deleted_glifs_qs = DeletedGlif.objects.select_related(
-                    "font",
-                ).filter(deleted_at__gt=updated_after)
-                for deleted_glif_obj in deleted_glifs_qs:
-                    deleted_glif_filepath = deleted_glif_obj.filepath
-                    if fsutil.is_file(deleted_glif_filepath):
-                        fsutil.remove_file(deleted_glif_filepath)
+        # load the manifest of the glifs files written by the previous exports
+        skip_unchanged = settings.ROBOCJK_EXPORT_SKIP_UNCHANGED_FILES
+        manifest = ExportManifest(get_font_manifest_path(font), font_path)
+
+        with profiler.span("prepare"):
+            # cleanup glifs dirs/files
+            updated_after = None
+            if full_export:
+                if skip_unchanged:
+                    # reconcile existing glifs files with the database,
+                    # only files with a changed digest will be written
+                    manifest.load()
+                else:
+                    # delete existing character-glyphs, deep-components and atomic-elements directories
+                    logger.info(
+                        f"Deleting font '{font_name}' character-glyphs, "
+                        "deep-components and atomic-elements folders..."
+                    )
+                    manifest.delete()
+                    fsutil.remove_dirs(
+                        character_glyphs_path,
+                        deep_components_path,
+                        atomic_elements_path,
+                    )
+                    journal.remove(character_glyphs_path)
+                    journal.remove(deep_components_path)
+                    journal.remove(atomic_elements_path)
+            else:
+                manifest.load()
+                # set updated_after only if not running a full export
+                if font.export_started_at and font.export_completed_at:
+                    updated_after = min(
+                        font.export_started_at, font.export_completed_at
+                    )
+                # delete possible zombie files of glifs that have been deleted
+                if updated_after:
+                    deleted_glifs_qs = DeletedGlif.objects.filter(
+                        font=font, deleted_at__gt=updated_after
+                    )
+                    for deleted_glif_obj in deleted_glifs_qs:
+                        deleted_glif_filepath = deleted_glif_obj.filepath
+                        manifest.remove(deleted_glif_filepath)
+                        if fsutil.is_file(deleted_glif_filepath):
+                            fsutil.remove_file(deleted_glif_filepath)
+                            journal.remove(deleted_glif_filepath)
 
         # create empty dirs to avoid errors in fonts that have not all entities
         fsutil.make_dirs(character_glyphs_path)
@@ -429,27 +433,22 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
         if not full_export and updated_after:
             glifs_filters["updated_at__gt"] = updated_after
 
-        character_glyphs_qs = CharacterGlyph.objects.select_related(
-            "font", "font__project"
-        ).filter(font=font, **glifs_filters)
-        character_glyphs_layers_qs = CharacterGlyphLayer.objects.select_related(
-            "glif", "glif__font", "glif__font__project"
-        ).filter(glif__font=font, **glifs_filters)
-        deep_components_qs = DeepComponent.objects.select_related(
-            "font", "font__project"
-        ).filter(font=font, **glifs_filters)
-        atomic_elements_qs = AtomicElement.objects.select_related(
-            "font", "font__project"
-        ).filter(font=font, **glifs_filters)
-        atomic_elements_layers_qs = AtomicElementLayer.objects.select_related(
-            "glif", "glif__font", "glif__font__project"
-        ).filter(glif__font=font, **glifs_filters)
-
-        character_glyphs_count = character_glyphs_qs.count()
-        character_glyphs_layers_count = character_glyphs_layers_qs.count()
-        deep_components_count = deep_components_qs.count()
-        atomic_elements_count = atomic_elements_qs.count()
-        atomic_elements_layers_count = atomic_elements_layers_qs.count()
+        character_glyphs_qs = CharacterGlyph.objects.filter(font=font, **glifs_filters)
+        character_glyphs_layers_qs = CharacterGlyphLayer.objects.filter(
+            glif__font=font, **glifs_filters
+        )
+        deep_components_qs = DeepComponent.objects.filter(font=font, **glifs_filters)
+        atomic_elements_qs = AtomicElement.objects.filter(font=font, **glifs_filters)
+        atomic_elements_layers_qs = AtomicElementLayer.objects.filter(
+            glif__font=font, **glifs_filters
+        )
+
+        with profiler.span("count"):
+            character_glyphs_count = character_glyphs_qs.count()
+            character_glyphs_layers_count = character_glyphs_layers_qs.count()
+            deep_components_count = deep_components_qs.count()
+            atomic_elements_count = atomic_elements_qs.count()
+            atomic_elements_layers_count = atomic_elements_layers_qs.count()
 
         # fmt: off
         glifs_count = (
@@ -463,16 +462,43 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
         glifs_progress = 0
         glifs_progress_perc = 0
 
+        # glifs querysets with the glifs dir path and the layer flag
         glifs_querysets = [
-            character_glyphs_qs,
-            character_glyphs_layers_qs,
-            deep_components_qs,
-            atomic_elements_qs,
-            atomic_elements_layers_qs,
+            (character_glyphs_qs, character_glyphs_path, False),
+            (character_glyphs_layers_qs, character_glyphs_path, True),
+            (deep_components_qs, deep_components_path, False),
+            (atomic_elements_qs, atomic_elements_path, False),
+            (atomic_elements_layers_qs, atomic_elements_path, True),
         ]
 
-        glifs_paginators = [
-            Paginator(glifs_queryset, per_page) for glifs_queryset in glifs_querysets
+        # load the formatted xml data stored on save, fallback to the raw xml data
+        # (formatted by the export pipeline) for glifs saved before it was stored;
+        # glifs are loaded as tuples and their paths are built from the filenames
+        # (and group names) without instantiating the models
+        glifs_querysets = [
+            (
+                glifs_queryset.annotate(
+                    export_data=Case(
+                        When(formatted_data="", then=F("data")),
+                        default=F("formatted_data"),
+                    ),
+                    export_data_formatted=Case(
+                        When(formatted_data="", then=Value(False)),
+                        default=Value(True),
+                        output_field=models.BooleanField(),
+                    ),
+                ).values_list(
+                    "id",
+                    "data_hash",
+                    "export_data",
+                    "export_data_formatted",
+                    "filename",
+                    *(["group_name"] if glifs_layers else []),
+                ),
+                glifs_dirpath,
+                glifs_layers,
+            )
+            for glifs_queryset, glifs_dirpath, glifs_layers in glifs_querysets
         ]
 
         # close old database connection to prevent OperationalError(s)
@@ -480,11 +506,28 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
         # https://developpaper.com/solution-to-the-lost-connection-problem-of-django-database/
         # close_old_connections()
 
-        num_processes = max(1, (multiprocessing.cpu_count() - 1))
+        # glif type and id of each glif path, stored in the manifest for verification
+        glifs_paths = {}
+        glifs_written_count = 0
+
+        def on_glif_written(glif_path, glif_digest, glif_size):
+            glif_type, glif_id = glifs_paths[glif_path]
+            manifest.set(glif_path, glif_digest, glif_type, glif_id)
+            journal.write(glif_path)
+            profiler.add_count(glif_type, written=1, size=glif_size)
+
+        export_pipeline = ExportPipeline(
+            writers=settings.ROBOCJK_EXPORT_PIPELINE_WRITERS,
+            batch_size=settings.ROBOCJK_EXPORT_PIPELINE_BATCH_SIZE,
+            max_pending_batches=settings.ROBOCJK_EXPORT_PIPELINE_MAX_PENDING_BATCHES,
+            write_in_workers=settings.ROBOCJK_EXPORT_PIPELINE_WRITE_IN_WORKERS,
+            on_write=on_glif_written,
+        )
 
         logger.info(
             f"Saving font '{font_name}' - "
-            f"{glifs_count} glifs to file system using {num_processes} process(es)."
+            f"{glifs_count} glifs to file system using "
+            f"{export_pipeline.processes} process(es)."
         )
         logger.info(f" - {character_glyphs_count} character glyphs")
         logger.info(f" - {character_glyphs_layers_count} character glyphs layers")
@@ -492,20 +535,42 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
         logger.info(f" - {atomic_elements_count} atomic elements")
         logger.info(f" - {atomic_elements_layers_count} atomic elements layers")
 
-        with multiprocessing.Pool(processes=num_processes) as pool:
-            for glifs_paginator in glifs_paginators:
-                for glifs_page in glifs_paginator:
-                    glifs_list = glifs_page.object_list
-                    glifs_data = (
-                        (glif.path(), glif.data_formatted) for glif in glifs_list
-                    )
-                    glifs_files_written_on_disk = pool.map(
-                        save_glif_to_file_system, glifs_data
+        with profiler.span("glifs"), export_pipeline:
+            for glifs_queryset, glifs_dirpath, glifs_layers in glifs_querysets:
+                glif_type = glifs_queryset.model._meta.model_name
+                glifs_chunks = export_pipeline.read(
+                    font.iterate_glifs_queryset_chunks(
+                        glifs_queryset, glifs_layers, per_page
                     )
-                    if not all(glifs_files_written_on_disk):
-                        logger.exception("Some files were not written to disk.")
+                )
+                for glifs_list in glifs_chunks:
+                    self.check_export_lock()
+                    if glifs_layers:
+                        glifs_list_paths = get_glifs_layers_paths(
+                            glifs_dirpath, [(glif[5], glif[4]) for glif in glifs_list]
+                        )
+                    else:
+                        glifs_list_paths = get_glifs_paths(
+                            glifs_dirpath, [glif[4] for glif in glifs_list]
+                        )
+                    for glif, glif_path in zip(glifs_list, glifs_list_paths):
+                        glif_id, glif_data_hash, glif_data, glif_formatted = glif[:4]
+                        glifs_paths[glif_path] = (glif_type, glif_id)
+                        if skip_unchanged and manifest.is_unchanged(
+                            glif_path, glif_data_hash
+                        ):
+                            manifest.set_glif(glif_path, glif_type, glif_id)
+                            continue
+                        export_pipeline.submit(
+                            glif_id,
+                            glif_path,
+                            glif_data,
+                            glif_data_hash if glif_formatted else None,
+                        )
+                        glifs_written_count += 1
 
                     glifs_progress += len(glifs_list)
+                    profiler.add_count(glif_type, total=len(glifs_list))
                     glifs_progress_perc = (
                         int(round((glifs_progress / glifs_count) * 100))
                         if glifs_count > 0
@@ -516,31 +581,112 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
                         f"{glifs_progress} of {glifs_count} total glifs - {glifs_progress_perc}%"
                     )
 
+        logger.info(
+            f"Saving font '{font_name}' - export pipeline stats:\n{export_pipeline.stats}"
+        )
+        # time spent by each pipeline stage: sql queries, formatting and writing
+        for stage, counters in export_pipeline.stats.to_dict().items():
+            profiler.add_timing(f"glifs.{stage}", counters["seconds"])
+        logger.info(
+            f"Saving font '{font_name}' - written {glifs_written_count} glifs files, "
+            f"skipped {glifs_count - glifs_written_count} unchanged glifs files."
+        )
+
+        if full_export and skip_unchanged:
+            # glifs dirs have not been removed, drop deleted glifs
+            # from the manifest and remove their zombie files
+            manifest.retain(glifs_paths)
+            manifest.save()
+            with profiler.span("cleanup"):
+                self.cleanup_file_system(journal=journal)
+        else:
+            manifest.save()
+
         try:
-            self.verify_file_system()
+            with profiler.span("verify"):
+                self.verify_file_system()
         except VerificationError as verification_error:
             # try to cleanup file-system, may be there is only some zombie file
-            cleaned = self.cleanup_file_system()
+            with profiler.span("cleanup"):
+                cleaned = self.cleanup_file_system(journal=journal)
             if cleaned:
                 # some zombie file has been deleted, retry to verify
                 try:
-                    self.verify_file_system()
+                    with profiler.span("verify"):
+                        self.verify_file_system()
                 except VerificationError as verification_error_despite_cleanup:
                     # there are still some verification errors.
                     # if this is already a full export let's raise the exception,
                     # otherwise let's run a full export to fix the problem
                     if full_export:
                         raise verification_error_despite_cleanup
-                    self.save_to_file_system(full_export=True)
+                    self.save_to_file_system(full_export=True, journal=journal)
             else:
                 # nothing has been cleaned up.
                 # if this is already a full export let's raise the exception,
                 # otherwise let's run a full export to fix the problem
                 if full_export:
                     raise verification_error
-                self.save_to_file_system(full_export=True)
+                self.save_to_file_system(full_export=True, journal=journal)
 
-    def cleanup_file_system(self):
+    def get_glifs_querysets(self, **filters):
+        """
+        Get the font glifs querysets (optionally filtered) as a list of
+        (glifs type name, glifs queryset, glifs dir path, layers) tuples.
+        """
+        font = self
+        character_glyphs_path = get_character_glyphs_path(font)
+        deep_components_path = get_deep_components_path(font)
+        atomic_elements_path = get_atomic_elements_path(font)
+        return [
+            (
+                "character glyphs",
+                CharacterGlyph.objects.filter(font=font, **filters),
+                character_glyphs_path,
+                False,
+            ),
+            (
+                "character glyphs layers",
+                CharacterGlyphLayer.objects.filter(glif__font=font, **filters),
+                character_glyphs_path,
+                True,
+            ),
+            (
+                "deep components",
+                DeepComponent.objects.filter(font=font, **filters),
+                deep_components_path,
+                False,
+            ),
+            (
+                "atomic elements",
+                AtomicElement.objects.filter(font=font, **filters),
+                atomic_elements_path,
+                False,
+            ),
+            (
+                "atomic elements layers",
+                AtomicElementLayer.objects.filter(glif__font=font, **filters),
+                atomic_elements_path,
+                True,
+            ),
+        ]
+
+    def iterate_glifs_queryset_chunks(self, glifs_queryset, glifs_layers, chunk_size):
+        """
+        Iterate the given font glifs queryset in chunks using keyset pagination,
+        layers are iterated by chunks of glifs to avoid sorting all the font layers.
+        """
+        if not glifs_layers:
+            return iterate_queryset_chunks(glifs_queryset, chunk_size)
+        glif_cls = glifs_queryset.model._meta.get_field("glif").related_model
+        return iterate_queryset_chunks_by_parent(
+            glifs_queryset,
+            glif_cls.objects.filter(font=self),
+            "glif_id",
+            chunk_size,
+        )
+
+    def cleanup_file_system(self, journal=None):
         font = self
         font_name = font.full_name
         font_path = font.path()
@@ -551,64 +697,32 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
             "for checking potential missing and/or zombie files."
         )
 
-        glif_related = [
-            "font",
-            "font__project",
-        ]
-        glif_layer_related = [
-            "glif",
-            "glif__font",
-            "glif__font__project",
-        ]
-
-        character_glyphs_qs = (
-            CharacterGlyph.objects.select_related(*glif_related)
-            .defer("data")
-            .filter(font=font)
-        )
-        character_glyphs_layers_qs = (
-            CharacterGlyphLayer.objects.select_related(*glif_layer_related)
-            .defer("data")
-            .filter(glif__font=font)
-        )
-        deep_components_qs = (
-            DeepComponent.objects.select_related(*glif_related)
-            .defer("data")
-            .filter(font=font)
-        )
-        atomic_elements_qs = (
-            AtomicElement.objects.select_related(*glif_related)
-            .defer("data")
-            .filter(font=font)
-        )
-        atomic_elements_layers_qs = (
-            AtomicElementLayer.objects.select_related(*glif_layer_related)
-            .defer("data")
-            .filter(glif__font=font)
-        )
-
-        glifs_querysets = [
-            character_glyphs_qs,
-            character_glyphs_layers_qs,
-            deep_components_qs,
-            atomic_elements_qs,
-            atomic_elements_layers_qs,
-        ]
-
         glifs_pagination_limit = settings.ROBOCJK_EXPORT_QUERIES_PAGINATION_LIMIT
-        glifs_paginators = [
-            Paginator(glifs_queryset, glifs_pagination_limit)
-            for glifs_queryset in glifs_querysets
-        ]
 
         glifs_files_found = set(fsutil.search_files(font_path, "**/*.glif"))
         glifs_files_expected = set()
 
-        for glifs_paginator in glifs_paginators:
-            for glifs_page in glifs_paginator:
-                glifs_list = glifs_page.object_list
-                glifs_data = (glif.path() for glif in glifs_list)
-                glifs_files_expected.update(glifs_data)
+        for glifs_queryset_info in self.get_glifs_querysets():
+            glifs_queryset, glifs_dirpath, glifs_layers = glifs_queryset_info[1:]
+            if glifs_layers:
+                glifs_queryset = glifs_queryset.values_list(
+                    "id", "group_name", "filename"
+                )
+            else:
+                glifs_queryset = glifs_queryset.values_list("id", "filename")
+            for glifs_list in self.iterate_glifs_queryset_chunks(
+                glifs_queryset, glifs_layers, glifs_pagination_limit
+            ):
+                if glifs_layers:
+                    glifs_files_expected.update(
+                        get_glifs_layers_paths(
+                            glifs_dirpath, [glif[1:] for glif in glifs_list]
+                        )
+                    )
+                else:
+                    glifs_files_expected.update(
+                        get_glifs_paths(glifs_dirpath, [glif[1] for glif in glifs_list])
+                    )
 
         if not glifs_files_expected:
             logger.warning(
@@ -620,6 +734,15 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
         if zombie_glifs_files:
             zombie_glifs_files_count = len(zombie_glifs_files)
             fsutil.remove_files(*zombie_glifs_files)
+            # remove the zombie files from the export manifest too
+            manifest = ExportManifest(get_font_manifest_path(font), font_path)
+            if manifest.load():
+                for zombie_glif_file in zombie_glifs_files:
+                    manifest.remove(zombie_glif_file)
+                manifest.save()
+            if journal is not None:
+                for zombie_glif_file in zombie_glifs_files:
+                    journal.remove(zombie_glif_file)
             logger.error(
                 f"Cleanup font {font_name!r} - "
                 f"removed {zombie_glifs_files_count} zombie glifs files from file system."
@@ -628,135 +751,37 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
 
         return False
 
-    def verify_file_system(self):
+    def verify_file_system(self, deep=False):
+        """
+        Verify the glifs files on file-system comparing the glifs ids stored
+        in the export manifest with the glifs ids in the database.
+        If deep is True (or if the manifest is not available) the glifs files
+        are counted walking the font directories and compared with the database.
+        """
         font = self
         font_name = font.full_name
 
         logger.info(f"Verifying font {font_name!r}.")
 
-        glif_related = [
-            "font",
-            "font__project",
-        ]
-        glif_layer_related = [
-            "glif",
-            "glif__font",
-            "glif__font__project",
+        glifs_querysets = [
+            glifs_queryset[:2] for glifs_queryset in self.get_glifs_querysets()
         ]
 
-        character_glyphs_qs = (
-            CharacterGlyph.objects.select_related(*glif_related)
-            .defer("data")
-            .filter(font=font)
-        )
-        character_glyphs_layers_qs = (
-            CharacterGlyphLayer.objects.select_related(*glif_layer_related)
-            .defer("data")
-            .filter(glif__font=font)
-        )
-        deep_components_qs = (
-            DeepComponent.objects.select_related(*glif_related)
-            .defer("data")
-            .filter(font=font)
-        )
-        atomic_elements_qs = (
-            AtomicElement.objects.select_related(*glif_related)
-            .defer("data")
-            .filter(font=font)
-        )
-        atomic_elements_layers_qs = (
-            AtomicElementLayer.objects.select_related(*glif_layer_related)
-            .defer("data")
-            .filter(glif__font=font)
-        )
-
-        character_glyphs_count = character_glyphs_qs.count()
-        character_glyphs_layers_count = character_glyphs_layers_qs.count()
-        deep_components_count = deep_components_qs.count()
-        atomic_elements_count = atomic_elements_qs.count()
-        atomic_elements_layers_count = atomic_elements_layers_qs.count()
-
-        def count_glif_files(dirpath):
-            return (
-                len(fsutil.search_files(dirpath, "*.glif"))
-                if fsutil.is_dir(dirpath)
-                else 0
-            )
-
-        def count_glif_layers_files(dirpath):
-            layers_dirs = fsutil.list_dirs(dirpath) if fsutil.is_dir(dirpath) else []
-            return sum(count_glif_files(layer_dir) for layer_dir in layers_dirs)
-
-        character_glyphs_path = get_character_glyphs_path(font)
-        deep_components_path = get_deep_components_path(font)
-        atomic_elements_path = get_atomic_elements_path(font)
-
-        character_glyphs_files_count = count_glif_files(character_glyphs_path)
-        character_glyphs_layers_files_count = count_glif_layers_files(
-            character_glyphs_path
-        )
-        deep_components_files_count = count_glif_files(deep_components_path)
-        atomic_elements_files_count = count_glif_files(atomic_elements_path)
-        atomic_elements_layers_files_count = count_glif_layers_files(
-            atomic_elements_path
-        )
-
-        def verify_glifs_count(
-            glifs_type_name, glifs_files_count, glifs_expected_count
-        ):
-            success = False
-            message = (
-                f"Verifying font {font_name!r} - expected {glifs_expected_count}, "
-                f"found {glifs_files_count} {glifs_type_name} .glif files on file-system."
-            )
-            if glifs_files_count == glifs_expected_count:
-                success = True
-            else:
-                # some files have been created/deleted in the mean time or zombie files?!
-                glifs_files_delta_tolerance = 50
-                glifs_files_delta = abs(glifs_expected_count - glifs_files_count)
-                if (
-                    glifs_files_delta < glifs_files_delta_tolerance
-                    or not glifs_expected_count
-                ):
-                    success = True
-                    message = (
-                        f"{message} "
-                        "Probably some files have been created/deleted in the meanwhile, "
-                        "don't treat it as an error."
-                    )
-            return {
-                "success": success,
-                "message": message,
-            }
+        manifest_glifs_ids = None
+        if not deep:
+            manifest = ExportManifest(get_font_manifest_path(font), font.path())
+            if manifest.load():
+                manifest_glifs_ids = manifest.get_glifs_ids()
+            if manifest_glifs_ids is None:
+                logger.info(
+                    f"Verifying font {font_name!r} - "
+                    "export manifest not available, walking the file-system."
+                )
 
-        results = [
-            verify_glifs_count(
-                "character glyphs",
-                character_glyphs_files_count,
-                character_glyphs_count,
-            ),
-            verify_glifs_count(
-                "character glyphs layers",
-                character_glyphs_layers_files_count,
-                character_glyphs_layers_count,
-            ),
-            verify_glifs_count(
-                "deep components",
-                deep_components_files_count,
-                deep_components_count,
-            ),
-            verify_glifs_count(
-                "atomic elements",
-                atomic_elements_files_count,
-                atomic_elements_count,
-            ),
-            verify_glifs_count(
-                "atomic elements layers",
-                atomic_elements_layers_files_count,
-                atomic_elements_layers_count,
-            ),
-        ]
+        if manifest_glifs_ids is None:
+            results = self._verify_glifs_files(glifs_querysets)
+        else:
+            results = self._verify_glifs_manifest(glifs_querysets, manifest_glifs_ids)
 
         info_messages = [result["message"] for result in results if result["success"]]
         if info_messages:
@@ -771,6 +796,88 @@ class Font(UIDModel, HashidModel, NameSlugModel, TimestampModel, ExportModel):
             logger.error(error_message)
             raise VerificationError(error_message)
 
+    def _get_verification_result(self, message, errors_count, expected_count):
+        success = False
+        if not errors_count:
+            success = True
+        else:
+            # some files have been created/deleted in the mean time or zombie files?!
+            glifs_files_delta_tolerance = 50
+            if errors_count < glifs_files_delta_tolerance or not expected_count:
+                success = True
+                message = (
+                    f"{message} "
+                    "Probably some files have been created/deleted in the meanwhile, "
+                    "don't treat it as an error."
+                )
+        return {
+            "success": success,
+            "message": message,
+        }
+
+    def _verify_glifs_manifest(self, glifs_querysets, manifest_glifs_ids):
+        results = []
+        for glifs_type_name, glifs_qs in glifs_querysets:
+            glif_type = glifs_qs.model._meta.model_name
+            glifs_ids = set(glifs_qs.values_list("id", flat=True))
+            glifs_files_ids_list = manifest_glifs_ids.get(glif_type, [])
+            glifs_files_ids = set(glifs_files_ids_list)
+            missing_count = len(glifs_ids - glifs_files_ids)
+            # files of deleted glifs or old files of renamed glifs
+            zombie_count = len(glifs_files_ids - glifs_ids) + (
+                len(glifs_files_ids_list) - len(glifs_files_ids)
+            )
+            message = (
+                f"Verifying font {self.full_name!r} - expected {len(glifs_ids)}, "
+                f"found {len(glifs_files_ids_list)} {glifs_type_name} .glif files "
+                f"in the export manifest ({missing_count} missing, "
+                f"{zombie_count} zombie)."
+            )
+            results.append(
+                self._get_verification_result(
+                    message, missing_count + zombie_count, len(glifs_ids)
+                )
+            )
+        return results
+
+    def _verify_glifs_files(self, glifs_querysets):
+        font = self
+        character_glyphs_path = get_character_glyphs_path(font)
+        deep_components_path = get_deep_components_path(font)
+        atomic_elements_path = get_atomic_elements_path(font)
+
+        # scan the glifs dirs and the layers sub-dirs in parallel
+        layers_dirs = scan_dirs([character_glyphs_path, atomic_elements_path])
+        glifs_dirs = {
+            "character glyphs": [character_glyphs_path],
+            "character glyphs layers": layers_dirs[character_glyphs_path],
+            "deep components": [deep_components_path],
+            "atomic elements": [atomic_elements_path],
+            "atomic elements layers": layers_dirs[atomic_elements_path],
+        }
+        glifs_files = scan_glifs_files(
+            [dirpath for dirpaths in glifs_dirs.values() for dirpath in dirpaths]
+        )
+
+        results = []
+        for glifs_type_name, glifs_qs in glifs_querysets:
+            glifs_expected_count = glifs_qs.count()
+            glifs_files_count = sum(
+                len(glifs_files[dirpath]) for dirpath in glifs_dirs[glifs_type_name]
+            )
+            message = (
+                f"Verifying font {font.full_name!r} - expected {glifs_expected_count}, "
+                f"found {glifs_files_count} {glifs_type_name} .glif files on file-system."
+            )
+            results.append(
+                self._get_verification_result(
+                    message,
+                    abs(glifs_expected_count - glifs_files_count),
+                    glifs_expected_count,
+                )
+            )
+        return results
+
     def updated_by_users(self, since=None, minutes=None, hours=None, days=None):
         """
         Get the list of users that have updated the font or any object that belongs to it.
@@ -930,6 +1037,312 @@ class GlyphsComposition(TimestampModel):
         return force_str(f"{self.font.name} / Glyphs Composition")
 
 
+class ExportLock(models.Model):
+    """
+    The Export Lock model is a lease-based lock used to prevent overlapping
+    exports of the same object across processes and hosts: the lock is held
+    until it is released or until its lease expires (not renewed by heartbeat).
+    """
+
+    class Meta:
+        app_label = "robocjk"
+        verbose_name = _("Export Lock")
+        verbose_name_plural = _("Export Locks")
+
+    key = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name=_("Key"),
+    )
+
+    holder = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name=_("Holder"),
+    )
+
+    acquired_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Acquired at"),
+    )
+
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Heartbeat at"),
+    )
+
+    expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name=_("Expires at"),
+    )
+
+    @staticmethod
+    def get_holder_id():
+        hostname = socket.gethostname()
+        return f"{hostname}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    @staticmethod
+    def get_lease_expires_at(now):
+        return now + dt.timedelta(seconds=settings.ROBOCJK_EXPORT_LOCK_TTL)
+
+    @classmethod
+    def acquire(cls, key, holder):
+        """
+        Atomically acquire the lock if it is free, expired or already held
+        by the same holder. Return True if the lock has been acquired.
+        """
+        try:
+            with transaction.atomic():
+                cls.objects.get_or_create(key=key)
+        except IntegrityError:
+            # lock row created concurrently by another process
+            pass
+        now = dt.datetime.now()
+        acquired = (
+            cls.objects.filter(key=key)
+            .filter(
+                Q(holder="")
+                | Q(holder=holder)
+                | Q(expires_at__isnull=True)
+                | Q(expires_at__lt=now)
+            )
+            .update(
+                holder=holder,
+                acquired_at=now,
+                heartbeat_at=now,
+                expires_at=cls.get_lease_expires_at(now),
+            )
+        )
+        return bool(acquired)
+
+    @classmethod
+    def renew(cls, key, holder):
+        """
+        Renew the lock lease, return False if the lock is not held anymore.
+        """
+        now = dt.datetime.now()
+        renewed = cls.objects.filter(key=key, holder=holder).update(
+            heartbeat_at=now,
+            expires_at=cls.get_lease_expires_at(now),
+        )
+        return bool(renewed)
+
+    @classmethod
+    def heartbeat(cls, key, holder):
+        return ExportLockHeartbeat(key, holder)
+
+    @classmethod
+    def release(cls, key, holder):
+        released = cls.objects.filter(key=key, holder=holder).update(
+            holder="",
+            expires_at=None,
+        )
+        return bool(released)
+
+    def __str__(self):
+        return force_str(f"{self.key} [{self.holder or '-'}]")
+
+
+class ExportLockHeartbeat:
+    """
+    Renews periodically the lease of an acquired export lock
+    in a background thread while a long export is running.
+    """
+
+    def __init__(self, key, holder, interval=None):
+        self._key = key
+        self._holder = holder
+        self._interval = interval or settings.ROBOCJK_EXPORT_LOCK_HEARTBEAT_INTERVAL
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.lost = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _run(self):
+        try:
+            while not self._stop_event.wait(self._interval):
+                if not ExportLock.renew(self._key, self._holder):
+                    self.lost = True
+                    logger.error(
+                        f"Export lock '{self._key}' lost by holder '{self._holder}'."
+                    )
+                    break
+        except Exception as heartbeat_error:
+            # the lease is not renewed anymore, so it can't be trusted
+            self.lost = True
+            logger.exception(
+                f"Export lock '{self._key}' heartbeat error: {heartbeat_error}"
+            )
+        finally:
+            # each thread has its own database connection
+            connection.close()
+
+    def check(self, renew=False):
+        """
+        Raise ExportLockLostError if the lease is not held anymore or if it is
+        not renewed anymore; if renew is True the lease is also renewed now
+        (eg. before committing and pushing the exported files).
+        """
+        if self._thread and not self._thread.is_alive():
+            self.lost = True
+        if not self.lost and renew:
+            self.lost = not ExportLock.renew(self._key, self._holder)
+        if self.lost:
+            raise ExportLockLostError(
+                f"Export lock '{self._key}' lost by holder '{self._holder}'."
+            )
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+class ExportRun(models.Model):
+    """
+    The Export Run model stores the timings of each phase of an export
+    and the number of glifs files and bytes written for each glif type.
+    Project runs have no font, their timings include the git phases.
+    """
+
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_ERROR = "error"
+    STATUS_CHOICES = (
+        (STATUS_RUNNING, _("Running")),
+        (STATUS_COMPLETED, _("Completed")),
+        (STATUS_ERROR, _("Error")),
+    )
+
+    class Meta:
+        app_label = "robocjk"
+        ordering = ["-started_at"]
+        verbose_name = _("Export Run")
+        verbose_name_plural = _("Export Runs")
+
+    project = models.ForeignKey(
+        "robocjk.Project",
+        on_delete=models.CASCADE,
+        related_name="export_runs",
+        verbose_name=_("Project"),
+    )
+
+    font = models.ForeignKey(
+        "robocjk.Font",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="export_runs",
+        verbose_name=_("Font"),
+    )
+
+    full_export = models.BooleanField(
+        default=False,
+        verbose_name=_("Full export"),
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_RUNNING,
+        db_index=True,
+        verbose_name=_("Status"),
+    )
+
+    started_at = models.DateTimeField(
+        db_index=True,
+        verbose_name=_("Started at"),
+    )
+
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Completed at"),
+    )
+
+    duration = models.FloatField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name=_("Duration"),
+        help_text=_("(seconds)"),
+    )
+
+    files_written = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Files written"),
+    )
+
+    bytes_written = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_("Bytes written"),
+    )
+
+    timings = models.JSONField(
+        blank=True,
+        default=dict,
+        verbose_name=_("Timings"),
+        help_text=_("(seconds spent by each export phase)"),
+    )
+
+    counts = models.JSONField(
+        blank=True,
+        default=dict,
+        verbose_name=_("Counts"),
+        help_text=_("(glifs files and bytes written for each glif type)"),
+    )
+
+    error = models.TextField(
+        blank=True,
+        verbose_name=_("Error"),
+    )
+
+    def complete(self, profiler, error=None):
+        """
+        Save the export run results collected by the given export profiler.
+        """
+        self.completed_at = dt.datetime.now()
+        self.duration = (self.completed_at - self.started_at).total_seconds()
+        self.status = self.STATUS_ERROR if error else self.STATUS_COMPLETED
+        self.error = str(error or "")
+        if profiler:
+            self.timings = profiler.timings
+            self.counts = profiler.counts
+            self.files_written = profiler.files_count
+            self.bytes_written = profiler.bytes_count
+        self.save()
+        self.delete_expired()
+
+    @classmethod
+    def delete_expired(cls):
+        """
+        Delete the export runs older than the ROBOCJK_EXPORT_RUNS_MAX_AGE days.
+        """
+        expired_at = dt.datetime.now() - dt.timedelta(
+            days=settings.ROBOCJK_EXPORT_RUNS_MAX_AGE
+        )
+        cls.objects.filter(started_at__lt=expired_at).delete()
+
+    def __str__(self):
+        target = self.font or self.project
+        return force_str(f"Export Run [{self.status}]: {target} - {self.started_at}")
+
+
 class LockableModel(models.Model):
     """
     The Lockable model is an abstract model which provides
@@ -961,7 +1374,8 @@ class LockableModel(models.Model):
         verbose_name=_("Locked at"),
     )
 
-    def _is_valid_user(self, user):
+    @staticmethod
+    def _is_valid_user(user):
         if not user or user.is_anonymous or not user.is_active:
             return False
         return True
@@ -1022,6 +1436,55 @@ class LockableModel(models.Model):
             return False
         return True
 
+    @classmethod
+    def lock_queryset_by(cls, queryset, user):
+        """
+        Lock all the unlocked glifs of the queryset using a single conditional
+        update (without updating the updated_at field timestamp) and return
+        the ids of the acquired glifs (now locked by the user)
+        and the ids of the refused ones (locked by other users).
+        """
+        if not cls._is_valid_user(user):
+            return ([], list(queryset.values_list("id", flat=True)))
+        # the update is atomic, the conditions prevent locking glifs locked by others
+        queryset.filter(is_locked=False).update(
+            is_locked=True,
+            locked_by=user,
+            locked_at=dt.datetime.now(),
+        )
+        acquired_ids = []
+        refused_ids = []
+        for glif_id, locked_by_id in queryset.values_list("id", "locked_by_id"):
+            if locked_by_id == user.id:
+                acquired_ids.append(glif_id)
+            else:
+                refused_ids.append(glif_id)
+        return (acquired_ids, refused_ids)
+
+    @classmethod
+    def unlock_queryset_by(cls, queryset, user):
+        """
+        Unlock all the glifs of the queryset locked by the user using a single
+        conditional update (without updating the updated_at field timestamp)
+        and return the ids of the released glifs (now unlocked)
+        and the ids of the refused ones (locked by other users).
+        """
+        if not cls._is_valid_user(user):
+            return ([], list(queryset.values_list("id", flat=True)))
+        queryset.filter(is_locked=True, locked_by=user).update(
+            is_locked=False,
+            locked_by=None,
+            locked_at=None,
+        )
+        released_ids = []
+        refused_ids = []
+        for glif_id, is_locked in queryset.values_list("id", "is_locked"):
+            if is_locked:
+                refused_ids.append(glif_id)
+            else:
+                released_ids.append(glif_id)
+        return (released_ids, refused_ids)
+
 
 class StatusModel(models.Model):
     """
@@ -1128,6 +1591,15 @@ class StatusModel(models.Model):
         verbose_name=_("Status downgraded at"),
     )
 
+    status_with_variations = models.JSONField(
+        blank=True,
+        null=True,
+        default=None,
+        editable=False,
+        verbose_name=_("Status with variations"),
+        help_text=_("(status and variations status, autodetected from xml data)"),
+    )
+
     @property
     def status_color(self):
         return StatusModel.STATUS_COLORS.get(self.status, "#000000")
@@ -1171,8 +1643,18 @@ class GlifDataModel(models.Model):
         help_text=_("(.glif xml data)"),
     )
 
+    formatted_data = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name=_("Formatted data"),
+        help_text=_("(.glif formatted xml data, computed on save)"),
+    )
+
     @property
     def data_formatted(self):
+        return self.formatted_data or self.format_data()
+
+    def format_data(self):
         try:
             s = format_glif(self.data)
         except Exception as formatting_error:
@@ -1184,6 +1666,18 @@ class GlifDataModel(models.Model):
             logger.exception(message)
         return s
 
+    data_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        verbose_name=_("Data hash"),
+        help_text=_("(.glif formatted xml data digest, computed on save)"),
+    )
+
+    def _update_formatted_data(self):
+        self.formatted_data = self.format_data() if self.data else ""
+        self.data_hash = get_digest(self.formatted_data) if self.data else ""
+
     name = models.CharField(
         blank=True,
         max_length=50,
@@ -1208,6 +1702,13 @@ class GlifDataModel(models.Model):
         help_text=_("(unicode hex value, autodetected from xml data)"),
     )
 
+    unicodes = models.JSONField(
+        blank=True,
+        default=list,
+        verbose_name=_("Unicodes"),
+        help_text=_("(unicode int values list, computed on save)"),
+    )
+
     components = models.TextField(
         blank=True,
         verbose_name=_("Components"),
@@ -1292,16 +1793,27 @@ class GlifDataModel(models.Model):
             # the renamed file will be created during the next export process.
             self.delete_from_file_system()
 
-        self.data = data.xml_string
-        self.name = data.name
-        self.filename = data.filename
-        self.unicode_hex = data.unicode_hex
-        self.is_empty = data.is_empty
-        self.has_variation_axis = data.has_variation_axis
-        self.has_outlines = data.has_outlines
-        self.has_components = data.has_components
-        self.has_unicode = data.has_unicode
-        self.components = data.components_str
+        for field_name, field_value in self.get_data_fields(data).items():
+            setattr(self, field_name, field_value)
+
+    @staticmethod
+    def get_data_fields(data):
+        """
+        Get the fields values autodetected from the given parsed glif data.
+        """
+        return {
+            "data": data.xml_string,
+            "name": data.name,
+            "filename": data.filename,
+            "unicode_hex": data.unicode_hex,
+            "unicodes": unicodes_str_to_list(data.unicode_hex, to_int=True),
+            "is_empty": data.is_empty,
+            "has_variation_axis": data.has_variation_axis,
+            "has_outlines": data.has_outlines,
+            "has_components": data.has_components,
+            "has_unicode": data.has_unicode,
+            "components": data.components_str,
+        }
 
     def _update_init_data(self):
         if not self._init_data:
@@ -1320,23 +1832,24 @@ class GlifDataModel(models.Model):
 
         if self.data == self._init_data:
             # data is not changed
+            self.status_with_variations = glif_data.status_with_variations
             return
 
         if self._init_data:
             # it is not the first save/creation
-            init_glif_data = self._parse_data(self._init_data)
-            if init_glif_data:
+            init_status_with_variations = self.status_with_variations
+            if init_status_with_variations is None:
+                # status with variations not stored yet, parse it from the init data
+                init_glif_data = self._parse_data(self._init_data)
+                if init_glif_data:
+                    init_status_with_variations = init_glif_data.status_with_variations
+            if init_status_with_variations is not None:
                 any_status_downgraded = False
                 any_status_upgraded = False
-                if (
-                    init_glif_data.status_with_variations
-                    != glif_data.status_with_variations
-                ):
+                if init_status_with_variations != glif_data.status_with_variations:
                     # some status changed, check if any status has been downgraded
                     for key, val in glif_data.status_with_variations.items():
-                        init_val = (
-                            init_glif_data.status_with_variations.get(key, 0) or 0
-                        )
+                        init_val = init_status_with_variations.get(key, 0) or 0
                         # flag as downgraded when any source changes from done to a previous status
                         if init_val == 4 and val < init_val:
                             any_status_downgraded = True
@@ -1356,6 +1869,7 @@ class GlifDataModel(models.Model):
         # update init data to avoid to re-compute downgrade/upgrade
         # on possibile subsequent save calls on the same instance
         self._init_data = self.data
+        self.status_with_variations = glif_data.status_with_variations
 
         # this should be removed because not useful for detecting variations downgrades
         data_status = StatusModel.get_status_from_data(glif_data)
@@ -1366,26 +1880,17 @@ class GlifDataModel(models.Model):
             self.status_changed_at = dt.datetime.now()
 
     def _update_components(self):
-        if self.has_components:
-            comp_managers = self.get_components_managers()
-            if not comp_managers:
-                return False
-            for comp_manager in comp_managers:
-                comp_set = comp_manager[0]
-                comp_cls = comp_manager[1]
-                comp_names = self.components_names
-                # logger.debug(comp_names)
-                if comp_names:
-                    comp_set.clear()
-                    comp_objs = comp_cls.objects.filter(
-                        font_id=self.font_id, name__in=comp_names
-                    )
-                    # logger.debug(comp_objs)
-                    comp_set.add(*comp_objs)
-                else:
-                    comp_set.clear()
-            return True
-        return False
+        comp_managers = self.get_components_managers()
+        if not comp_managers:
+            return False
+        # create missing relations and delete stale relations (also when
+        # the glif has no components anymore) instead of clearing all of them
+        update_glifs_relations(
+            self.font_id, glif_cls=self.__class__, glifs_ids=[self.pk]
+        )
+        # relations are updated in bulk, the prefetched components (if any) are stale
+        getattr(self, "_prefetched_objects_cache", {}).clear()
+        return True
 
     def update_components(self):
         self._update_components()
@@ -1393,15 +1898,121 @@ class GlifDataModel(models.Model):
     def path(self):
         raise NotImplementedError
 
-    def save(self, *args, **kwargs):
+    def _update_data_fields(self):
         self._update_init_data()
         glif_data = self._parse_data(self.data)
         self._apply_data(glif_data)
         self._update_status(glif_data)
+        self._update_formatted_data()
+
+    def save(self, *args, **kwargs):
+        self._update_data_fields()
         super().save(*args, **kwargs)
         # update many-to-many relations after the instance has been saved
         self._update_components()
 
+    @classmethod
+    def get_bulk_update_fields(cls):
+        """
+        Get the names of the fields updated by bulk_save_by
+        (lock fields and foreign keys to the font / glif are excluded).
+        """
+        excluded_fields = {
+            "id",
+            "created_at",
+            "is_locked",
+            "locked_by",
+            "locked_at",
+            "font",
+            "glif",
+            "group_name",
+            "layers_updated_at",
+        }
+        return [
+            field.name
+            for field in cls._meta.concrete_fields
+            if field.name not in excluded_fields
+        ]
+
+    @classmethod
+    def bulk_save_by(cls, objs, user, batch_size=1000):
+        """
+        Save the given glifs (new and existing ones) of this model by the given
+        user with bulk queries instead of one save_by call per glif: computed fields
+        are updated the same way, then components relations are updated once.
+        It must be called in a transaction, save signals are not sent.
+        """
+        now = dt.datetime.now()
+        created_objs = []
+        updated_objs = []
+        for obj in objs:
+            obj._update_data_fields()
+            obj.update_editors_history(user)
+            obj.updated_by = user
+            # auto_now fields are not updated by bulk_update
+            obj.updated_at = now
+            if obj.pk:
+                updated_objs.append(obj)
+            else:
+                created_objs.append(obj)
+        cls.objects.bulk_create(created_objs, batch_size=batch_size)
+        cls.objects.bulk_update(
+            updated_objs, cls.get_bulk_update_fields(), batch_size=batch_size
+        )
+        if created_objs:
+            # ids of created objects are not returned by all database backends
+            cls._set_bulk_created_ids(created_objs)
+
+        # add user to editors
+        editors_field = cls._meta.get_field("editors")
+        editors_through_cls = editors_field.remote_field.through
+        editors_through_cls.objects.bulk_create(
+            [
+                editors_through_cls(
+                    **{
+                        editors_field.m2m_column_name(): obj.pk,
+                        editors_field.m2m_reverse_name(): user.pk,
+                    }
+                )
+                for obj in objs
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+
+        # update many-to-many relations after the instances have been saved
+        objs_ids_by_font_id = {}
+        for obj in objs:
+            if obj.get_components_managers():
+                objs_ids_by_font_id.setdefault(obj.font_id, []).append(obj.pk)
+        for font_id, objs_ids in objs_ids_by_font_id.items():
+            update_glifs_relations(
+                font_id, glif_cls=cls, glifs_ids=objs_ids, batch_size=batch_size
+            )
+        for obj in objs:
+            getattr(obj, "_prefetched_objects_cache", {}).clear()
+
+    @classmethod
+    def _set_bulk_created_ids(cls, objs):
+        # lookup created objects by their unique fields, (font, name) for glifs
+        # and (glif, group_name, name) for layers
+        keys_attnames = [
+            cls._meta.get_field(field_name).attname
+            for field_name in cls._meta.unique_together[0]
+        ]
+        filters = {
+            f"{attname}__in": {getattr(obj, attname) for obj in objs}
+            for attname in keys_attnames
+        }
+        objs_ids = {
+            tuple(values[:-1]): values[-1]
+            for values in cls.objects.filter(**filters).values_list(
+                *keys_attnames, "id"
+            )
+        }
+        for obj in objs:
+            obj.id = objs_ids[tuple(getattr(obj, attname) for attname in keys_attnames)]
+
     def save_to_file_system(self):
         # this method is not actually used
         filepath = self.path()
@@ -1596,6 +2207,8 @@ class CharacterGlyph(GlifDataModel, StatusModel, LockableModel, TimestampModel):
 
         # update in-memory value
         self.layers_updated_at = layers_updated_at
+        # layers have changed, the prefetched layers (if any) are stale
+        getattr(self, "_prefetched_objects_cache", {}).pop("layers", None)
 
         # update database value
         cls = self.__class__
@@ -1749,6 +2362,8 @@ class AtomicElement(GlifDataModel, StatusModel, LockableModel, TimestampModel):
 
         # update in-memory value
         self.layers_updated_at = layers_updated_at
+        # layers have changed, the prefetched layers (if any) are stale
+        getattr(self, "_prefetched_objects_cache", {}).pop("layers", None)
 
         # update database value
         cls = self.__class__
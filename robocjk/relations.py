@@ -0,0 +1,120 @@
+import time
+
+
+def get_glifs_relations():
+    """
+    Get the list of glifs relations (glif model, relation name, component model),
+    the relations are built from the glifs components names.
+    """
+    from robocjk.models import AtomicElement, CharacterGlyph, DeepComponent
+
+    return [
+        (DeepComponent, "atomic_elements", AtomicElement),
+        (CharacterGlyph, "deep_components", DeepComponent),
+        (CharacterGlyph, "character_glyphs", CharacterGlyph),
+    ]
+
+
+def _get_components_names(components):
+    return list(filter(None, components.split(",")))
+
+
+def _update_glifs_relation(
+    font_id, glif_cls, relation_name, component_cls, glifs_ids, batch_size
+):
+    relation_field = glif_cls._meta.get_field(relation_name)
+    through_cls = relation_field.remote_field.through
+    from_field_name = relation_field.m2m_column_name()
+    to_field_name = relation_field.m2m_reverse_name()
+
+    glifs_qs = glif_cls.objects.filter(font_id=font_id)
+    if glifs_ids is not None:
+        glifs_qs = glifs_qs.filter(id__in=glifs_ids)
+    glifs_components = list(
+        glifs_qs.filter(has_components=True).values_list("id", "components")
+    )
+
+    # map components names to ids
+    components_qs = component_cls.objects.filter(font_id=font_id)
+    if glifs_ids is not None:
+        components_names = {
+            component_name
+            for _, components in glifs_components
+            for component_name in _get_components_names(components)
+        }
+        components_qs = components_qs.filter(name__in=components_names)
+    components_ids = dict(components_qs.values_list("name", "id"))
+
+    # diff the desired edges against the existing ones
+    edges = {
+        (glif_id, components_ids[component_name])
+        for glif_id, components in glifs_components
+        for component_name in _get_components_names(components)
+        if component_name in components_ids
+    }
+    through_qs = through_cls.objects.filter(
+        **{f"{from_field_name}__in": glifs_qs.values("id")}
+    )
+    existing_edges = {
+        (from_id, to_id): edge_id
+        for edge_id, from_id, to_id in through_qs.values_list(
+            "id", from_field_name, to_field_name
+        )
+    }
+    edges_to_create = edges - existing_edges.keys()
+    edges_to_delete = [
+        edge_id for edge, edge_id in existing_edges.items() if edge not in edges
+    ]
+
+    for index in range(0, len(edges_to_delete), batch_size):
+        through_cls.objects.filter(
+            id__in=edges_to_delete[index : index + batch_size]
+        ).delete()
+    through_cls.objects.bulk_create(
+        [
+            through_cls(**{from_field_name: from_id, to_field_name: to_id})
+            for from_id, to_id in edges_to_create
+        ],
+        batch_size=batch_size,
+    )
+    return {
+        "edges": len(edges),
+        "created": len(edges_to_create),
+        "deleted": len(edges_to_delete),
+    }
+
+
+def update_glifs_relations(font_id, glif_cls=None, glifs_ids=None, batch_size=1000):
+    """
+    Rebuild the glifs relations of the given font from the glifs components,
+    only the missing relations are created and only the stale ones are deleted.
+    Relations can be limited to a glif model and to a list of glifs ids.
+    Return the stats (edges, created, deleted, seconds) of each relation.
+    """
+    stats = {}
+    for relation_glif_cls, relation_name, component_cls in get_glifs_relations():
+        if glif_cls and relation_glif_cls is not glif_cls:
+            continue
+        start_t = time.time()
+        relation_stats = _update_glifs_relation(
+            font_id,
+            relation_glif_cls,
+            relation_name,
+            component_cls,
+            glifs_ids,
+            batch_size,
+        )
+        relation_stats["seconds"] = time.time() - start_t
+        stats[f"{relation_glif_cls.__name__}.{relation_name}"] = relation_stats
+    return stats
+
+
+def format_glifs_relations_stats(stats):
+    lines = []
+    for relation_key, relation_stats in stats.items():
+        lines.append(
+            f"{relation_key}: {relation_stats['edges']} relations "
+            f"({relation_stats['created']} created, {relation_stats['deleted']} deleted) "
+            f"in {relation_stats['seconds']:.2f} seconds."
+        )
+    return "\n".join(lines)
@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save, pre_delete
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
 
 
 def connect_signals():
+    from robocjk.api.auth import delete_user_auth_cache
     from robocjk.io.client import (
         create_or_update_font,
         create_or_update_project,
@@ -17,6 +19,9 @@ def connect_signals():
         Project,
     )
 
+    user_cls = get_user_model()
+    post_save.connect(delete_user_auth_cache, sender=user_cls)
+    post_delete.connect(delete_user_auth_cache, sender=user_cls)
     post_save.connect(create_or_update_project, sender=Project)
     post_save.connect(create_or_update_font, sender=Font)
     pre_delete.connect(delete_glif, sender=CharacterGlyph)
@@ -0,0 +1,184 @@
+from robocjk.core import GlifData
+from robocjk.models import (
+    AtomicElement,
+    AtomicElementLayer,
+    CharacterGlyph,
+    CharacterGlyphLayer,
+    DeepComponent,
+    Font,
+    GlifDataModel,
+    StatusModel,
+)
+from robocjk.relations import update_glifs_relations
+from robocjk.utils import get_digest
+
+GLIF_CONTOUR_XML = """
+    <contour>
+      <point x="{x}" y="100" type="line"/>
+      <point x="{x}" y="700" type="line"/>
+      <point x="{x2}" y="700" type="line"/>
+      <point x="{x2}" y="100" type="line"/>
+    </contour>"""
+
+GLIF_COMPONENT_XML = """
+        <dict>
+          <key>coord</key>
+          <dict/>
+          <key>name</key>
+          <string>{name}</string>
+          <key>transform</key>
+          <dict>
+            <key>x</key>
+            <integer>{x}</integer>
+            <key>y</key>
+            <integer>0</integer>
+          </dict>
+        </dict>"""
+
+
+def get_synthetic_glif_xml(name, unicode_hex=None, components=None, contours=1):
+    """
+    Get the xml data of a synthetic glif with the given name, unicode,
+    components names (stored in the robocjk.deepComponents lib key)
+    and number of contours.
+    """
+    unicode_xml = f'\n  <unicode hex="{unicode_hex}"/>' if unicode_hex else ""
+    contours_xml = "".join(
+        GLIF_CONTOUR_XML.format(x=(index * 100), x2=(index * 100 + 50))
+        for index in range(contours)
+    )
+    lib_xml = ""
+    if components:
+        components_xml = "".join(
+            GLIF_COMPONENT_XML.format(name=component_name, x=(index * 50))
+            for index, component_name in enumerate(components)
+        )
+        lib_xml = (
+            "\n  <lib>\n    <dict>\n      <key>robocjk.deepComponents</key>"
+            f"\n      <array>{components_xml}\n      </array>\n    </dict>\n  </lib>"
+        )
+    return (
+        "<?xml version='1.0' encoding='UTF-8'?>\n"
+        f'<glyph name="{name}" format="2">\n'
+        f'  <advance width="1000"/>{unicode_xml}\n'
+        f"  <outline>{contours_xml}\n  </outline>{lib_xml}\n"
+        "</glyph>\n"
+    )
+
+
+def get_synthetic_glif_fields(xml):
+    """
+    Get the glif model fields values of the given synthetic glif xml data,
+    the same values computed by the glif model save method.
+    """
+    data = GlifData()
+    data.parse_string(xml)
+    fields = GlifDataModel.get_data_fields(data)
+    # synthetic xml data is already written as formatted by format_glif
+    fields["data"] = xml
+    fields["formatted_data"] = xml
+    fields["data_hash"] = get_digest(fields["formatted_data"])
+    return fields, data
+
+
+def _get_glif_fields(glif_cls, xml):
+    fields, data = get_synthetic_glif_fields(xml)
+    if issubclass(glif_cls, StatusModel):
+        fields["status"] = StatusModel.get_status_from_data(data)
+        fields["status_with_variations"] = data.status_with_variations
+    return fields
+
+
+def _get_components_names(names, index, count):
+    if not names:
+        return []
+    # pick the components in a deterministic but spread way
+    return [names[(index * 7 + offset * 13) % len(names)] for offset in range(count)]
+
+
+def _create_glifs(glif_cls, font, glifs_xml, batch_size):
+    glif_cls.objects.bulk_create(
+        [glif_cls(font=font, **_get_glif_fields(glif_cls, xml)) for xml in glifs_xml],
+        batch_size=batch_size,
+    )
+    return list(glif_cls.objects.filter(font=font).values_list("id", "data"))
+
+
+def _create_glifs_layers(glif_layer_cls, glifs, layers, batch_size):
+    if not layers:
+        return
+    glifs_layers = []
+    for glif_id, glif_xml in glifs:
+        # layers have the same data of their glif
+        fields = _get_glif_fields(glif_layer_cls, glif_xml)
+        glifs_layers += [
+            glif_layer_cls(
+                glif_id=glif_id, group_name=f"layer{layer_index + 1}", **fields
+            )
+            for layer_index in range(layers)
+        ]
+    glif_layer_cls.objects.bulk_create(glifs_layers, batch_size=batch_size)
+
+
+def create_synthetic_font(
+    project,
+    name,
+    atomic_elements=0,
+    deep_components=0,
+    character_glyphs=0,
+    layers=0,
+    components=0,
+    batch_size=1000,
+):
+    """
+    Create a synthetic font in the given project with the given number of
+    atomic elements, deep components and character glyphs; atomic elements
+    and character glyphs have the given number of layers, deep components
+    use the given number of atomic elements as components and character
+    glyphs use the given number of deep components as components.
+    """
+    font = Font.objects.create(project=project, name=name)
+
+    atomic_elements_names = [f"ae_{index:05d}" for index in range(atomic_elements)]
+    atomic_elements_xml = [
+        get_synthetic_glif_xml(glif_name, contours=2)
+        for glif_name in atomic_elements_names
+    ]
+    atomic_elements_list = _create_glifs(
+        AtomicElement, font, atomic_elements_xml, batch_size
+    )
+    _create_glifs_layers(AtomicElementLayer, atomic_elements_list, layers, batch_size)
+
+    deep_components_names = [
+        f"DC_{(0x4E00 + index):04X}_00" for index in range(deep_components)
+    ]
+    deep_components_xml = [
+        get_synthetic_glif_xml(
+            glif_name,
+            components=_get_components_names(atomic_elements_names, index, components),
+            contours=0,
+        )
+        for index, glif_name in enumerate(deep_components_names)
+    ]
+    _create_glifs(DeepComponent, font, deep_components_xml, batch_size)
+
+    character_glyphs_xml = []
+    for index in range(character_glyphs):
+        unicode_hex = f"{(0x4E00 + index):04X}"
+        character_glyphs_xml.append(
+            get_synthetic_glif_xml(
+                f"uni{unicode_hex}",
+                unicode_hex=unicode_hex,
+                components=_get_components_names(
+                    deep_components_names, index, components
+                ),
+                contours=0,
+            )
+        )
+    character_glyphs_list = _create_glifs(
+        CharacterGlyph, font, character_glyphs_xml, batch_size
+    )
+    _create_glifs_layers(CharacterGlyphLayer, character_glyphs_list, layers, batch_size)
+
+    update_glifs_relations(font.id, batch_size=batch_size)
+    return font
@@ -238,6 +238,45 @@ class APIsTestCase(TestCase):
         self.assertTrue(isinstance(data["character_glyphs"], list))
         self.assertTrue(isinstance(data["deleted_glifs"], list))
 
+    def test_0045_glif_list_columnar(self):
+        # print('test_0045_glif_list_columnar')
+        payload = {
+            "font_uid": self.get_font_uid(),
+            "updated_since": "2023/03/25",
+            "columnar": True,
+        }
+        response, data = self.get_response("/api/glif/list/", payload=payload)
+        self.assert_response_ok(response)
+        character_glyphs = data["character_glyphs"]
+        self.assertEqual(
+            list(character_glyphs.keys()),
+            [
+                "id",
+                "name",
+                "unicode_hex",
+                "updated_at",
+                "layers_updated_at",
+                "unicodes",
+            ],
+        )
+        self.assertTrue(len({len(values) for values in character_glyphs.values()}) == 1)
+        self.assertTrue(isinstance(data["atomic_elements"]["id"], list))
+        self.assertTrue(isinstance(data["deep_components"]["id"], list))
+        self.assertTrue(isinstance(data["deleted_glifs"]["id"], list))
+
+    def test_0045_glif_list_stream(self):
+        # print('test_0045_glif_list_stream')
+        payload = {
+            "font_uid": self.get_font_uid(),
+            "stream": "json",
+        }
+        response, data = self.get_response("/api/glif/list/", payload=payload)
+        self.assert_response_ok(response)
+        self.assertTrue(isinstance(data["atomic_elements"], list))
+        self.assertTrue(isinstance(data["deep_components"], list))
+        self.assertTrue(isinstance(data["character_glyphs"], list))
+        self.assertFalse("deleted_glifs" in data)
+
     def test_0046_glif_lock(self):
         # print('test_0046_glif_lock')
         payload = {
@@ -274,6 +313,34 @@ class APIsTestCase(TestCase):
         self.assertEqual(len(data["deep_components"]), 2)
         self.assertEqual(len(data["character_glyphs"]), 1)
 
+    def test_0048_glif_bulk_update(self):
+        # print('test_0048_glif_bulk_update')
+        items = [
+            {
+                "type": "atomic_element",
+                "name": "hengpietest",
+                "data": self.get_glif_data("atomic_element_update/hengpietest.glif"),
+            },
+            {
+                "type": "deep_component",
+                "name": "DC_2008A_00",
+                "layers": [{"group_name": "layer1", "data": ""}],
+            },
+        ]
+        payload = {
+            "font_uid": self.get_font_uid(),
+            "items": json.dumps(items),
+            "ignore_lock": True,
+        }
+        response, data = self.get_response("/api/glif/bulk-update/", payload=payload)
+        self.assert_response_ok(response)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[0]["status"], 200)
+        self.assertEqual(data[1]["status"], 400)
+        # atomic by default, no item is updated if any item is invalid
+        self.assertFalse(data[0]["updated"])
+        self.assertFalse(data[1]["updated"])
+
     def test_0050_atomic_element_list(self):
         # print('test_0050_atomic_element_list')
         payload = {
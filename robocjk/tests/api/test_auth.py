@@ -1,11 +1,24 @@
-from django.test import TestCase
+from unittest import mock
 
-from robocjk.api.auth import decode_auth_token, encode_auth_token, generate_auth_token
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
 
+from robocjk.api.auth import (
+    _auth_users_cache,
+    decode_auth_token,
+    encode_auth_token,
+    generate_auth_token,
+    get_user_by_auth_token,
+    invalidate_user_auth_cache,
+)
 
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
 class AuthTestCase(TestCase):
     def setUp(self):
-        pass
+        _auth_users_cache.clear()
 
     def tearDown(self):
         pass
@@ -28,3 +41,53 @@ class AuthTestCase(TestCase):
         token_encoded = generate_auth_token({"days": 5}, data)
         token_decoded = decode_auth_token(token_encoded)
         self.assertEqual(token_decoded["message"], data["message"])
+
+    def test_get_user_by_auth_token(self):
+        user = get_user_model().objects.create_user(username="designer")
+        token = generate_auth_token(data={"user_pk": user.pk})
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_by_auth_token(token), user)
+        # cached in-process
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_by_auth_token(token), user)
+        # cached in the shared cache
+        _auth_users_cache.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_by_auth_token(token), user)
+        # invalidated on save
+        user.is_active = False
+        user.save()
+        with self.assertNumQueries(1):
+            self.assertFalse(get_user_by_auth_token(token).is_active)
+        # invalidated on delete
+        user.delete()
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_user_by_auth_token(token))
+
+    def test_get_user_by_auth_token_invalidated_while_reading(self):
+        user = get_user_model().objects.create_user(username="designer")
+        token = generate_auth_token(data={"user_pk": user.pk})
+        users_manager = get_user_model().objects
+        get_user = users_manager.get
+
+        def get_user_and_invalidate(*args, **kwargs):
+            user_obj = get_user(*args, **kwargs)
+            invalidate_user_auth_cache(user_obj.pk)
+            return user_obj
+
+        with mock.patch.object(
+            users_manager, "get", side_effect=get_user_and_invalidate
+        ):
+            self.assertEqual(get_user_by_auth_token(token), user)
+        # the user read before the invalidation is not reused
+        _auth_users_cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_by_auth_token(token), user)
+
+    def test_get_user_by_auth_token_expired(self):
+        user = get_user_model().objects.create_user(username="designer")
+        token = generate_auth_token(
+            expiration={"seconds": -1}, data={"user_pk": user.pk}
+        )
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_user_by_auth_token(token))
@@ -261,6 +261,19 @@ class ClientTestCase(TestCase):
         # print(response)
         self.assert_response_ok(response)
 
+    def test_character_glyph_get_etag(self):
+        response = self._client.character_glyph_get(
+            font_uid=self._font_uid, character_glyph_id=18627
+        )
+        self.assert_response_ok(response)
+        self.assertEqual(len(self._client._etags_cache), 1)
+        # not modified, the cached response is returned
+        cached_response = self._client.character_glyph_get(
+            font_uid=self._font_uid, character_glyph_id=18627
+        )
+        self.assert_response_ok(cached_response)
+        self.assertEqual(cached_response["data"], response["data"])
+
     def test_character_glyph_lock(self):
         response = self._client.character_glyph_lock(
             font_uid=self._font_uid, character_glyph_id=18627
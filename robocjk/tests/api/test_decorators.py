@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+
+from robocjk.api.auth import _auth_users_cache, generate_auth_token
+from robocjk.models import CharacterGlyph, Project
+from robocjk.synthetic import create_synthetic_font
+
+
+@override_settings(
+    ALLOWED_HOSTS=["testserver"],
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class DecoratorsTestCase(TestCase):
+    def setUp(self):
+        _auth_users_cache.clear()
+        self._project = Project.objects.create(
+            name="Project", repo_url="git@github.com:googlefonts/project.git"
+        )
+        self._user = get_user_model().objects.create_user(username="designer")
+        self._project.designers.add(self._user)
+        token = generate_auth_token(data={"user_pk": self._user.pk})
+        self._client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self._font = create_synthetic_font(
+            self._project,
+            "Font",
+            atomic_elements=2,
+            deep_components=2,
+            character_glyphs=2,
+            layers=1,
+            components=1,
+        )
+
+    def tearDown(self):
+        pass
+
+    def _post(self, url, params, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self._client.post(
+            url, {"font_uid": str(self._font.uid), **params}, **headers
+        )
+
+    def test_glif_get_etag(self):
+        urls_params = [
+            ("/api/atomic-element/get/", {"name": "ae_00000"}),
+            ("/api/deep-component/get/", {"name": "DC_4E00_00"}),
+            ("/api/character-glyph/get/", {"name": "uni4E00"}),
+            ("/api/character-glyph/get/", {"name": "uni4E00", "return_related": 1}),
+            ("/api/font/get/", {}),
+        ]
+        for url, params in urls_params:
+            with self.subTest(url=url, params=params):
+                response = self._post(url, params)
+                self.assertEqual(response.status_code, 200)
+                etag = response["ETag"]
+                response = self._post(url, params, etag=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response["ETag"], etag)
+                self.assertEqual(response.content, b"")
+                # the etag depends on the serialization options
+                response = self._post(url, {**params, "return_data": 0}, etag=etag)
+                self.assertEqual(
+                    response.status_code, 304 if url == "/api/font/get/" else 200
+                )
+
+    def test_glif_get_etag_without_loading_data(self):
+        params = {"name": "uni4E00"}
+        etag = self._post("/api/character-glyph/get/", params)["ETag"]
+        with self.assertNumQueries(3):
+            # font, user projects and glif etag fields
+            response = self._post("/api/character-glyph/get/", params, etag=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_glif_get_etag_changed(self):
+        params = {"name": "uni4E00"}
+        etag = self._post("/api/character-glyph/get/", params)["ETag"]
+        glifs_qs = CharacterGlyph.objects.filter(font=self._font, name="uni4E00")
+        CharacterGlyph.lock_queryset_by(glifs_qs, self._user)
+        response = self._post("/api/character-glyph/get/", params, etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertTrue(response.json()["data"]["is_locked"])
+        etag = response["ETag"]
+        character_glyph = glifs_qs.get()
+        character_glyph.layers.first().save_by(self._user)
+        response = self._post("/api/character-glyph/get/", params, etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
@@ -1,17 +1,26 @@
+import datetime as dt
 import json
+import uuid
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.http import JsonResponse
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 
 from robocjk.api.http import (
+    ApiJSONEncoder,
     ApiResponseBadRequest,
     ApiResponseForbidden,
     ApiResponseInternalServerError,
     ApiResponseMethodNotAllowed,
+    ApiResponseNDJSONStream,
     ApiResponseNotFound,
+    ApiResponseNotModified,
     ApiResponseServiceUnavailableError,
+    ApiResponseStream,
     ApiResponseSuccess,
     ApiResponseUnauthorized,
+    get_etag,
+    is_etag_matched,
 )
 
 
@@ -31,6 +40,104 @@ class HttpTestCase(TestCase):
         self.assertEqual(d["error"], None)
         self.assertEqual(d["data"]["message"], "Hello World")
 
+    def test_success_response_without_sort_keys(self):
+        r = ApiResponseSuccess({"b": 1, "a": 2}, sort_keys=False)
+        d = json.loads(r.content)
+        self.assertEqual(list(d["data"].keys()), ["b", "a"])
+        r = ApiResponseSuccess({"b": 1, "a": 2})
+        d = json.loads(r.content)
+        self.assertEqual(list(d["data"].keys()), ["a", "b"])
+
+    def test_json_encoder(self):
+        data = {
+            "datetime": dt.datetime(2024, 1, 2, 3, 4, 5, 678901),
+            "date": dt.date(2024, 1, 2),
+            "uid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "list": [1, 2.5, "text", None, True],
+        }
+        for sort_keys in [True, False]:
+            self.assertEqual(
+                json.loads(json.dumps(data, cls=ApiJSONEncoder, sort_keys=sort_keys)),
+                json.loads(
+                    json.dumps(data, cls=DjangoJSONEncoder, sort_keys=sort_keys)
+                ),
+            )
+        # integers exceeding 64-bit fallback to the json module
+        self.assertEqual(
+            json.dumps({"big": 2**70}, cls=ApiJSONEncoder),
+            '{"big": 1180591620717411303424}',
+        )
+
+    def test_stream_response(self):
+        data = {
+            "b": ({"id": index, "name": f"b{index}"} for index in range(5)),
+            "a": iter([]),
+        }
+        r = ApiResponseStream(data, chunk_size=2)
+        self.assertTrue(r.streaming)
+        self.assertEqual(r.status_code, 200)
+        d = json.loads(b"".join(r.streaming_content))
+        self.assertEqual(d["status"], r.status_code)
+        self.assertEqual(d["error"], None)
+        self.assertEqual(
+            d["data"], {"a": [], "b": [{"id": i, "name": f"b{i}"} for i in range(5)]}
+        )
+        self.assertEqual(list(d["data"].keys()), ["a", "b"])
+        r = ApiResponseStream([{"id": 1}], sort_keys=False)
+        d = json.loads(b"".join(r.streaming_content))
+        self.assertEqual(d["data"], [{"id": 1}])
+        r = ApiResponseStream({})
+        d = json.loads(b"".join(r.streaming_content))
+        self.assertEqual(d["data"], {})
+
+    def test_ndjson_stream_response(self):
+        r = ApiResponseNDJSONStream([{"id": 1}, {"id": 2}, {"id": 3}], chunk_size=2)
+        self.assertEqual(r["Content-Type"], "application/x-ndjson")
+        lines = b"".join(r.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines], [{"id": 1}, {"id": 2}, {"id": 3}]
+        )
+        r = ApiResponseNDJSONStream({"a": [{"id": 1}], "b": [{"id": 2}]})
+        lines = b"".join(r.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"id": 1, "list": "a"}, {"id": 2, "list": "b"}],
+        )
+
+    def test_success_response_with_etag(self):
+        etag = get_etag({"message": "Hello World"})
+        r = ApiResponseSuccess({"message": "Hello World"}, etag=etag)
+        self.assertEqual(r["ETag"], etag)
+        self.assertEqual(r.data, {"message": "Hello World"})
+
+    def test_not_modified_response(self):
+        etag = get_etag({"message": "Hello World"})
+        r = ApiResponseNotModified(etag)
+        self.assertEqual(r.status_code, 304)
+        self.assertEqual(r["ETag"], etag)
+        self.assertEqual(r.content, b"")
+
+    def test_etag(self):
+        updated_at = dt.datetime(2023, 3, 25, 12, 30)
+        etag = get_etag("Font", updated_at, {"b": 1, "a": 2})
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertEqual(etag, get_etag("Font", updated_at, {"a": 2, "b": 1}))
+        self.assertNotEqual(etag, get_etag("Font", updated_at, {"a": 2, "b": 3}))
+        request_factory = RequestFactory()
+        request = request_factory.post("/", HTTP_IF_NONE_MATCH=etag)
+        self.assertTrue(is_etag_matched(request, etag))
+        # weak comparison (compressed responses have weak etags)
+        request = request_factory.post("/", HTTP_IF_NONE_MATCH=f"W/{etag}")
+        self.assertTrue(is_etag_matched(request, etag))
+        request = request_factory.post("/", HTTP_IF_NONE_MATCH=f'"other", {etag}')
+        self.assertTrue(is_etag_matched(request, etag))
+        request = request_factory.post("/", HTTP_IF_NONE_MATCH="*")
+        self.assertTrue(is_etag_matched(request, etag))
+        request = request_factory.post("/", HTTP_IF_NONE_MATCH='"other"')
+        self.assertFalse(is_etag_matched(request, etag))
+        request = request_factory.post("/")
+        self.assertFalse(is_etag_matched(request, etag))
+
     def test_bad_request_response(self):
         m = "Error message description"
         r = ApiResponseBadRequest(m)
@@ -0,0 +1,116 @@
+import gzip
+import json
+import unittest
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve
+
+from robocjk.api.http import ApiResponseStream, ApiResponseSuccess
+from robocjk.api.middleware import (
+    ApiCompressionMiddleware,
+    brotli,
+    negotiate_encoding,
+    parse_accept_encoding,
+    zstandard,
+)
+
+
+class MiddlewareTestCase(TestCase):
+    def setUp(self):
+        self._data = [{"id": index, "name": f"uni{index:04X}"} for index in range(200)]
+
+    def tearDown(self):
+        pass
+
+    def _get_response(self, response, path="/api/glif/list/", accept_encoding=""):
+        request = RequestFactory().post(path, HTTP_ACCEPT_ENCODING=accept_encoding)
+        request.resolver_match = resolve(path)
+        middleware = ApiCompressionMiddleware(lambda request: response)
+        return middleware(request)
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(parse_accept_encoding(""), {})
+        self.assertEqual(
+            parse_accept_encoding("gzip, deflate;q=0.5, br;q=0, *;q=invalid"),
+            {"gzip": 1.0, "deflate": 0.5, "br": 0.0, "*": 0.0},
+        )
+
+    def test_negotiate_encoding(self):
+        encodings = ["zstd", "br", "gzip"]
+        self.assertEqual(negotiate_encoding("", encodings), None)
+        self.assertEqual(negotiate_encoding("identity", encodings), None)
+        self.assertEqual(negotiate_encoding("gzip, br, zstd", encodings), "zstd")
+        self.assertEqual(negotiate_encoding("gzip, br;q=0.5", encodings), "gzip")
+        self.assertEqual(negotiate_encoding("*", encodings), "zstd")
+        self.assertEqual(negotiate_encoding("*, zstd;q=0", encodings), "br")
+        self.assertEqual(negotiate_encoding("gzip;q=0", encodings), None)
+
+    def test_compress_response(self):
+        response = self._get_response(
+            ApiResponseSuccess(self._data), accept_encoding="gzip"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(data["data"], self._data)
+
+    def test_compress_response_not_accepted(self):
+        response = self._get_response(
+            ApiResponseSuccess(self._data), accept_encoding="identity"
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+        data = json.loads(response.content)
+        self.assertEqual(data["data"], self._data)
+
+    def test_compress_response_min_size(self):
+        response = self._get_response(
+            ApiResponseSuccess(self._data[:1]), accept_encoding="gzip"
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+        with override_settings(
+            ROBOCJK_API_COMPRESSION_ENDPOINTS={"glif_list": {"min_size": 10**6}}
+        ):
+            response = self._get_response(
+                ApiResponseSuccess(self._data), accept_encoding="gzip"
+            )
+            self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_compress_stream_response(self):
+        response = self._get_response(
+            ApiResponseStream(iter(self._data), chunk_size=10),
+            accept_encoding="gzip",
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        data = json.loads(gzip.decompress(b"".join(response.streaming_content)))
+        self.assertEqual(data["data"], self._data)
+
+    def _assert_compressed_response(self, encoding, decompress):
+        response = self._get_response(
+            ApiResponseSuccess(self._data), accept_encoding=f"gzip;q=0.5, {encoding}"
+        )
+        self.assertEqual(response["Content-Encoding"], encoding)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        data = json.loads(decompress(response.content))
+        self.assertEqual(data["data"], self._data)
+        response = self._get_response(
+            ApiResponseStream(iter(self._data), chunk_size=10),
+            accept_encoding=encoding,
+        )
+        self.assertEqual(response["Content-Encoding"], encoding)
+        self.assertFalse(response.has_header("Content-Length"))
+        data = json.loads(decompress(b"".join(response.streaming_content)))
+        self.assertEqual(data["data"], self._data)
+
+    @unittest.skipIf(brotli is None, "brotli is not installed")
+    def test_compress_response_br(self):
+        self._assert_compressed_response("br", brotli.decompress)
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_compress_response_zstd(self):
+        def decompress(data):
+            # streamed frames have no content size, read them as a stream
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+        self._assert_compressed_response("zstd", decompress)
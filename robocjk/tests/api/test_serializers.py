@@ -1,13 +1,242 @@
-from django.test import TestCase
+import itertools
+import json
 
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
+from robocjk.api.auth import _auth_users_cache, generate_auth_token
+from robocjk.models import Project
+from robocjk.synthetic import create_synthetic_font, get_synthetic_glif_xml
+
+
+@override_settings(
+    ALLOWED_HOSTS=["testserver"],
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
 class SerializersTestCase(TestCase):
     def setUp(self):
-        pass
+        _auth_users_cache.clear()
+        self._project = Project.objects.create(
+            name="Project", repo_url="git@github.com:googlefonts/project.git"
+        )
+        self._user = get_user_model().objects.create_user(username="designer")
+        self._project.designers.add(self._user)
+        token = generate_auth_token(data={"user_pk": self._user.pk})
+        self._client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+        # fonts with the same glifs but a different number of related objects
+        self._fonts = [
+            create_synthetic_font(
+                self._project,
+                f"Font {components}",
+                atomic_elements=8,
+                deep_components=8,
+                character_glyphs=8,
+                layers=components,
+                components=components,
+            )
+            for components in [1, 4]
+        ]
+
+        self._glifs_counter = itertools.count()
 
     def tearDown(self):
         pass
 
-    def test_serializers(self):
-        # TODO
-        pass
+    def _get_num_queries(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._client.post(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(queries)
+
+    def _assert_num_queries_constant(self, url, params_getter, max_num_queries):
+        # the first request warms up the auth cache
+        self._get_num_queries(url, params_getter(self._fonts[0]))
+        num_queries = [
+            self._get_num_queries(url, params_getter(font)) for font in self._fonts
+        ]
+        self.assertEqual(len(set(num_queries)), 1, num_queries)
+        self.assertLessEqual(num_queries[0], max_num_queries)
+
+    def test_atomic_element_get_num_queries(self):
+        self._assert_num_queries_constant(
+            "/api/atomic-element/get/",
+            lambda font: {
+                "font_uid": str(font.uid),
+                "name": "ae_00000",
+                "return_layers": True,
+                "return_related": True,
+            },
+            max_num_queries=5,
+        )
+
+    def test_deep_component_get_num_queries(self):
+        self._assert_num_queries_constant(
+            "/api/deep-component/get/",
+            lambda font: {
+                "font_uid": str(font.uid),
+                "name": "DC_4E00_00",
+                "return_layers": True,
+                "return_related": True,
+            },
+            max_num_queries=7,
+        )
+
+    def test_character_glyph_get_num_queries(self):
+        self._assert_num_queries_constant(
+            "/api/character-glyph/get/",
+            lambda font: {
+                "font_uid": str(font.uid),
+                "name": "uni4E00",
+                "return_layers": True,
+                "return_related": True,
+            },
+            max_num_queries=11,
+        )
+
+    def test_character_glyph_layer_update_num_queries(self):
+        def get_params(font):
+            layer = font.character_glyphs.get(name="uni4E00").layers.first()
+            return {
+                "font_uid": str(font.uid),
+                "character_glyph_name": "uni4E00",
+                "group_name": layer.group_name,
+                "data": layer.data,
+                "ignore_lock": True,
+            }
+
+        self._assert_num_queries_constant(
+            "/api/character-glyph/layer/update/",
+            get_params,
+            max_num_queries=11,
+        )
+
+    def test_glif_lock_num_queries(self):
+        for url in ["/api/glif/lock/", "/api/glif/unlock/"]:
+            with self.subTest(url=url):
+                self._assert_num_queries_constant(
+                    url,
+                    lambda font: {
+                        "font_uid": str(font.uid),
+                        "atomic_elements_names": json.dumps(["ae_00000", "ae_00001"]),
+                        "deep_components_names": json.dumps(["DC_4E00_00"]),
+                        "character_glyphs_names": json.dumps(["uni4E00", "uni4E01"]),
+                    },
+                    max_num_queries=13,
+                )
+
+    def test_glif_list_num_queries(self):
+        for params in [
+            {},
+            {"columnar": True},
+            {"return_layers": True, "return_made_of": True, "return_used_by": True},
+        ]:
+            with self.subTest(params=params):
+                self._assert_num_queries_constant(
+                    "/api/glif/list/",
+                    lambda font, params=params: {"font_uid": str(font.uid), **params},
+                    max_num_queries=5,
+                )
+
+    def test_glifs_list_num_queries(self):
+        for url in [
+            "/api/atomic-element/list/",
+            "/api/deep-component/list/",
+            "/api/character-glyph/list/",
+        ]:
+            for params in [
+                {},
+                {"return_layers": True},
+                {"return_made_of": True, "return_used_by": True},
+            ]:
+                with self.subTest(url=url, params=params):
+                    self._assert_num_queries_constant(
+                        url,
+                        lambda font, params=params: {
+                            "font_uid": str(font.uid),
+                            **params,
+                        },
+                        max_num_queries=3,
+                    )
+
+    def test_glifs_get_prefetch_num_queries(self):
+        # prefetch lookups are planned by each serialization option
+        for url, name, options_max_num_queries in [
+            (
+                "/api/atomic-element/get/",
+                "ae_00000",
+                {"return_layers": 4, "return_made_of": 3, "return_used_by": 4},
+            ),
+            (
+                "/api/deep-component/get/",
+                "DC_4E00_00",
+                {"return_layers": 3, "return_made_of": 4, "return_used_by": 4},
+            ),
+            (
+                "/api/character-glyph/get/",
+                "uni4E00",
+                {"return_layers": 4, "return_made_of": 6, "return_used_by": 4},
+            ),
+        ]:
+            for option, max_num_queries in options_max_num_queries.items():
+                with self.subTest(url=url, option=option):
+                    self._assert_num_queries_constant(
+                        url,
+                        lambda font, name=name, option=option: {
+                            "font_uid": str(font.uid),
+                            "name": name,
+                            "return_layers": option == "return_layers",
+                            option: True,
+                        },
+                        max_num_queries=max_num_queries,
+                    )
+
+    def _get_atomic_element_layer_params(self, font, **params):
+        # each call uses a different atomic element, layers can be renamed or deleted
+        layer = font.atomic_elements.get(
+            name=f"ae_{next(self._glifs_counter):05d}"
+        ).layers.get(group_name="layer1")
+        return {
+            "font_uid": str(font.uid),
+            "atomic_element_name": layer.glif.name,
+            "group_name": layer.group_name,
+            "ignore_lock": True,
+            **params,
+        }
+
+    def test_atomic_element_layer_create_num_queries(self):
+        self._assert_num_queries_constant(
+            "/api/atomic-element/layer/create/",
+            lambda font: self._get_atomic_element_layer_params(
+                font,
+                group_name="layer-new",
+                data=get_synthetic_glif_xml("ae_layer_new"),
+            ),
+            max_num_queries=10,
+        )
+
+    def test_atomic_element_layer_rename_num_queries(self):
+        self._assert_num_queries_constant(
+            "/api/atomic-element/layer/rename/",
+            lambda font: self._get_atomic_element_layer_params(
+                font, new_group_name="layer1-renamed"
+            ),
+            max_num_queries=13,
+        )
+
+    def test_atomic_element_layer_update_num_queries(self):
+        self._assert_num_queries_constant(
+            "/api/atomic-element/layer/update/",
+            lambda font: self._get_atomic_element_layer_params(
+                font, data=get_synthetic_glif_xml("ae_layer_updated", contours=2)
+            ),
+            max_num_queries=12,
+        )
+
+    def test_atomic_element_layer_delete_num_queries(self):
+        self._assert_num_queries_constant(
+            "/api/atomic-element/layer/delete/",
+            self._get_atomic_element_layer_params,
+            max_num_queries=14,
+        )
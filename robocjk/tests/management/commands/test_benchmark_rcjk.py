@@ -0,0 +1,72 @@
+import json
+import tempfile
+
+import fsutil
+from django.core.management import call_command
+from django.test import TestCase
+
+from robocjk.models import Project
+
+
+class BenchmarkRCJKTestCase(TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._output_path = fsutil.join_path(self._temp_dir.name, "benchmark.json")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _benchmark(self, **options):
+        call_command(
+            "benchmark_rcjk",
+            atomic_elements=4,
+            deep_components=6,
+            character_glyphs=10,
+            layers=1,
+            components=2,
+            changes=3,
+            api_repeat=1,
+            output=self._output_path,
+            path=fsutil.join_path(self._temp_dir.name, "repositories"),
+            # synthetic data is rolled back at the end of the test
+            keep=True,
+            stderr=open(fsutil.join_path(self._temp_dir.name, "stderr"), "w"),
+            **options,
+        )
+        return json.loads(fsutil.read_file(self._output_path))
+
+    def test_benchmark_rcjk(self):
+        results = self._benchmark()
+        self.assertEqual(results["options"]["character_glyphs"], 10)
+        self.assertEqual(
+            list(results["results"].keys()),
+            [
+                "generate",
+                "export_full",
+                "export_incremental_unchanged",
+                "export_incremental",
+                "verify",
+                "verify_deep",
+                "cleanup",
+                "import",
+                "api",
+                "api_compression",
+            ],
+        )
+        self.assertIn("glif_list", results["results"]["api"])
+        self.assertGreater(results["results"]["api"]["glif_list"]["bytes"], 0)
+        glif_list_compression = results["results"]["api_compression"]["glif_list"]
+        self.assertEqual(glif_list_compression["identity"]["bytes_saved"], 0)
+        self.assertGreater(glif_list_compression["gzip"]["bytes_saved"], 0)
+        project = Project.objects.get()
+        self.assertEqual(
+            list(project.fonts.values_list("name", flat=True)),
+            ["Synthetic", "Synthetic Import"],
+        )
+        font, import_font = project.fonts.all()
+        self.assertEqual(import_font.character_glyphs.count(), 10)
+        self.assertEqual(import_font.num_character_glyphs_layers(), 10)
+        self.assertEqual(
+            list(font.character_glyphs.values_list("data_hash", flat=True)),
+            list(import_font.character_glyphs.values_list("data_hash", flat=True)),
+        )
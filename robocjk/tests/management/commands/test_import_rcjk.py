@@ -1,13 +1,102 @@
+import io
+import tempfile
+import zipfile
+
+import fsutil
+from django.core.management import call_command
 from django.test import TestCase
 
+from robocjk.models import Font, Project
+
 
 class ImportRCJKTestCase(TestCase):
     def setUp(self):
-        pass
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._zip_path = fsutil.join_path(self._temp_dir.name, "font.zip")
+        tests_path = fsutil.get_parent_dir(__file__, levels=2)
+        files = {
+            "atomicElement/line.glif": "test_core_data/atomicElement/line.glif",
+            "atomicElement/bendingB_oth.glif": "test_models_data/atomicElement/bendingB_oth.glif",
+            "atomicElement/1/bendingB_oth.glif": "test_models_data/atomicElement/1/bendingB_oth.glif",
+            "deepComponent/D_C__98E_0_00.glif": "test_core_data/deepComponent/D_C__98E_0_00.glif",
+            "deepComponent/D_C__2B_740_00.glif": "test_models_data/deepComponent/D_C__2B_740_00.glif",
+            "characterGlyph/cieuc.glif": "test_core_data/characterGlyph/cieuc.glif",
+            "characterGlyph/uni4E_25.glif": "test_models_data/characterGlyph/uni4E_25.glif",
+            "characterGlyph/1/uni4E_25.glif": "test_models_data/characterGlyph/1/uni4E_25.glif",
+            "fontLib.json": "test_models_data/fontLib.json",
+        }
+        with zipfile.ZipFile(self._zip_path, "w") as file:
+            for name, path in files.items():
+                file.write(fsutil.join_path(tests_path, path), f"MyFont.rcjk/{name}")
+        self._project = Project.objects.create(name="My Project")
 
     def tearDown(self):
-        pass
+        self._temp_dir.cleanup()
+
+    def _import(self, **options):
+        font = Font.objects.create(project=self._project, name="My Font")
+        call_command(
+            "import_rcjk",
+            filepath=self._zip_path,
+            font_uid=str(font.uid),
+            stdout=io.StringIO(),
+            **options,
+        )
+        return Font.objects.get(pk=font.pk)
+
+    def _get_font_data(self, font):
+        fields = [
+            "name",
+            "filename",
+            "data",
+            "formatted_data",
+            "data_hash",
+            "components",
+            "has_components",
+            "is_empty",
+        ]
+        data = {}
+        for related_name in ["atomic_elements", "deep_components", "character_glyphs"]:
+            glifs_qs = getattr(font, related_name).order_by("name")
+            data[related_name] = list(glifs_qs.values(*fields, "status"))
+            if related_name == "deep_components":
+                continue
+            data[f"{related_name}_layers"] = list(
+                glifs_qs.filter(layers__isnull=False).values(
+                    "layers__group_name", "layers__data", "layers__data_hash"
+                )
+            )
+        data["deep_components_relations"] = sorted(
+            font.deep_components.values_list("name", "atomic_elements__name")
+        )
+        data["character_glyphs_relations"] = sorted(
+            font.character_glyphs.values_list("name", "deep_components__name")
+        )
+        data["fontlib"] = font.fontlib
+        return data
 
     def test_io(self):
         # TODO
         pass
+
+    def test_bulk_import(self):
+        font = self._import()
+        font_bulk = self._import(bulk=True, batch_size=2)
+        self.assertTrue(font_bulk.available)
+        self.assertEqual(font_bulk.atomic_elements.count(), 2)
+        self.assertEqual(font_bulk.deep_components.count(), 2)
+        self.assertEqual(font_bulk.character_glyphs.count(), 2)
+        self.assertEqual(
+            sorted(font_bulk.deep_components.values_list("atomic_elements__name")),
+            [("bendingBoth",), ("line",), ("line",)],
+        )
+        self.assertEqual(self._get_font_data(font), self._get_font_data(font_bulk))
+        # import again to update existing glifs
+        call_command(
+            "import_rcjk",
+            filepath=self._zip_path,
+            font_uid=str(font_bulk.uid),
+            bulk=True,
+            stdout=io.StringIO(),
+        )
+        self.assertEqual(self._get_font_data(font), self._get_font_data(font_bulk))
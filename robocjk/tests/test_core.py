@@ -1,4 +1,7 @@
+from xml.etree import ElementTree
+
 import fsutil
+from benedict import benedict
 from django.test import TestCase
 
 from robocjk.core import GlifData
@@ -152,6 +155,28 @@ class CoreTestCase(TestCase):
         }
         self.assertEqual(glif_data.status_with_variations, expected_value)
 
+    def test_glyph_data_lib(self):
+        glif_str = fsutil.read_file(
+            fsutil.join_path(__file__, "test_core_data/characterGlyph/uni27C_28.glif")
+        )
+        glif_data = GlifData()
+        glif_data.parse_string(glif_str)
+        # lib is built only when accessed
+        self.assertEqual(glif_data._lib, None)
+        lib = glif_data.lib
+        self.assertEqual(
+            lib,
+            benedict.from_plist(
+                ElementTree.tostring(
+                    ElementTree.fromstring(glif_str).find("./lib/dict")
+                ).decode(),
+                keypath_separator="/",
+            ),
+        )
+        self.assertEqual(lib.get("robocjk.status"), glif_data.status)
+        self.assertTrue(glif_data.lib is lib)
+        self.assertTrue(glif_data.xml_string.startswith("<?xml"))
+
     def test_glyph_data_with_new_empty_glif(self):
         glif_str = """<?xml version='1.0' encoding='UTF-8'?>
         <glyph name="foo" format="2">
@@ -1,13 +1,442 @@
-from django.test import TestCase
+import datetime as dt
+import subprocess
+import tempfile
+from unittest import mock
+
+import fsutil
+from django.test import TestCase, override_settings
+
+from robocjk.io.export import ExportPipeline
+from robocjk.io.git import GitRepository
+from robocjk.io.journal import ExportJournal
+from robocjk.io.manifest import ExportManifest
+from robocjk.io.paths import scan_dirs, scan_glifs_files
+from robocjk.io.profiling import ExportProfiler
+from robocjk.models import (
+    CharacterGlyph,
+    DeletedGlif,
+    ExportLock,
+    ExportRun,
+    Font,
+    Project,
+)
+from robocjk.synthetic import get_synthetic_glif_xml
+from robocjk.utils import get_digest
 
 
 class IOTestCase(TestCase):
     def setUp(self):
-        pass
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._font_path = fsutil.join_path(self._temp_dir.name, "font.rcjk")
+        self._manifest_path = fsutil.join_path(self._temp_dir.name, "manifest.json")
 
     def tearDown(self):
-        pass
+        self._temp_dir.cleanup()
+
+    def _create_git_remote(self, name="remote"):
+        remote_path = fsutil.join_path(self._temp_dir.name, f"{name}.git")
+        seed_path = fsutil.join_path(self._temp_dir.name, f"{name}-seed")
+        fsutil.write_file(fsutil.join_path(seed_path, "README.md"), "readme")
+        for cmd in [
+            ["git", "init", "--quiet", "--bare", remote_path],
+            ["git", "-C", seed_path, "init", "--quiet"],
+            ["git", "-C", seed_path, "checkout", "--quiet", "-b", "main"],
+            ["git", "-C", seed_path, "add", "--all"],
+            [
+                "git",
+                "-C",
+                seed_path,
+                "-c",
+                "user.name=Seed",
+                "-c",
+                "user.email=seed@example.com",
+                "commit",
+                "--quiet",
+                "-m",
+                "Initial commit.",
+            ],
+            ["git", "-C", seed_path, "push", "--quiet", remote_path, "main"],
+        ]:
+            subprocess.run(cmd, check=True, capture_output=True)
+        return remote_path
+
+    def _get_git_log(self, remote_path):
+        return subprocess.run(
+            ["git", "-C", remote_path, "log", "--format=%s", "--name-status", "main"],
+            check=True,
+            capture_output=True,
+        ).stdout.decode("utf-8")
 
     def test_io(self):
         # TODO
         pass
+
+    def test_manifest(self):
+        glif_path = fsutil.join_path(self._font_path, "characterGlyph", "a.glif")
+        fsutil.write_file(glif_path, "<glyph/>")
+        manifest = ExportManifest(self._manifest_path, self._font_path)
+        self.assertFalse(manifest.load())
+        self.assertFalse(manifest.is_unchanged(glif_path, "digest"))
+        manifest.set(glif_path, "digest")
+        self.assertTrue(manifest.is_unchanged(glif_path, "digest"))
+        self.assertFalse(manifest.is_unchanged(glif_path, "other-digest"))
+        manifest.save()
+        manifest = ExportManifest(self._manifest_path, self._font_path)
+        self.assertTrue(manifest.load())
+        self.assertTrue(glif_path in manifest)
+        self.assertTrue(manifest.is_unchanged(glif_path, "digest"))
+
+    def test_manifest_with_externally_modified_file(self):
+        glif_path = fsutil.join_path(self._font_path, "characterGlyph", "a.glif")
+        fsutil.write_file(glif_path, "<glyph/>")
+        manifest = ExportManifest(self._manifest_path, self._font_path)
+        manifest.set(glif_path, "digest")
+        fsutil.write_file(glif_path, "<glyph name='a'/>")
+        self.assertFalse(manifest.is_unchanged(glif_path, "digest"))
+        fsutil.remove_file(glif_path)
+        self.assertFalse(manifest.is_unchanged(glif_path, "digest"))
+
+    def test_manifest_retain(self):
+        glif_path_1 = fsutil.join_path(self._font_path, "characterGlyph", "a.glif")
+        glif_path_2 = fsutil.join_path(self._font_path, "characterGlyph", "b.glif")
+        fsutil.write_file(glif_path_1, "<glyph/>")
+        fsutil.write_file(glif_path_2, "<glyph/>")
+        manifest = ExportManifest(self._manifest_path, self._font_path)
+        manifest.set(glif_path_1, "digest")
+        manifest.set(glif_path_2, "digest")
+        manifest.retain([glif_path_1])
+        self.assertEqual(len(manifest), 1)
+        self.assertTrue(glif_path_1 in manifest)
+        self.assertFalse(glif_path_2 in manifest)
+
+    def test_export_pipeline(self):
+        glif_data = fsutil.read_file(
+            fsutil.join_path(
+                __file__, "test_models_data", "characterGlyph", "uni4E_25.glif"
+            )
+        )
+        glifs_paths = [
+            fsutil.join_path(self._font_path, "characterGlyph", f"{index}.glif")
+            for index in range(25)
+        ]
+        written = {}
+        with ExportPipeline(
+            processes=2,
+            writers=2,
+            batch_size=4,
+            max_pending_batches=2,
+            on_write=lambda path, digest, size: written.__setitem__(path, digest),
+        ) as export_pipeline:
+            for index, glif_path in enumerate(glifs_paths):
+                export_pipeline.submit(index, glif_path, glif_data)
+        self.assertEqual(set(written.keys()), set(glifs_paths))
+        for glif_path in glifs_paths:
+            self.assertTrue(fsutil.is_file(glif_path))
+        stats = export_pipeline.stats.to_dict()
+        self.assertEqual(stats["format"]["count"], 25)
+        self.assertEqual(stats["write"]["count"], 25)
+        self.assertEqual(stats["format"]["bytes"], stats["write"]["bytes"])
+
+    def test_export_pipeline_with_write_in_workers(self):
+        glif_data = fsutil.read_file(
+            fsutil.join_path(
+                __file__, "test_models_data", "characterGlyph", "uni4E_25.glif"
+            )
+        )
+        glifs_paths = [
+            fsutil.join_path(self._font_path, "characterGlyph", f"{index}.glif")
+            for index in range(10)
+        ]
+        glifs_paths.append(self._font_path)
+        written = {}
+        with ExportPipeline(
+            processes=2,
+            batch_size=3,
+            write_in_workers=True,
+            on_write=lambda path, digest, size: written.__setitem__(path, digest),
+        ) as export_pipeline:
+            fsutil.make_dirs(self._font_path)
+            for index, glif_path in enumerate(glifs_paths):
+                export_pipeline.submit(index, glif_path, glif_data)
+        # the file path of the last glif is a directory, so it is not written
+        self.assertEqual(set(written.keys()), set(glifs_paths[:-1]))
+        for glif_path in glifs_paths[:-1]:
+            self.assertEqual(
+                get_digest(fsutil.read_file(glif_path)), written[glif_path]
+            )
+        stats = export_pipeline.stats.to_dict()
+        self.assertEqual(stats["format"]["count"], 11)
+        self.assertEqual(stats["write"]["count"], 10)
+
+    def test_export_pipeline_with_invalid_data(self):
+        glif_path = fsutil.join_path(self._font_path, "characterGlyph", "a.glif")
+        with ExportPipeline(processes=1, writers=1) as export_pipeline:
+            export_pipeline.submit(1, glif_path, "invalid")
+        # invalid data is written as it is
+        self.assertEqual(fsutil.read_file(glif_path), "invalid")
+        self.assertEqual(export_pipeline.stats.get("write")["count"], 1)
+
+    def test_git_repository(self):
+        remote_path = self._create_git_remote()
+        repo_path = fsutil.join_path(self._temp_dir.name, "repo")
+        repo = GitRepository(repo_path, branch="main")
+        self.assertFalse(repo.exists())
+        repo.init(remote_path, user_name="User", user_email="user@example.com")
+        self.assertTrue(repo.exists())
+        font_path = fsutil.join_path(repo_path, "font.rcjk")
+        other_font_path = fsutil.join_path(repo_path, "other-font.rcjk")
+        glif_path = fsutil.join_path(font_path, "characterGlyph", "a.glif")
+        other_glif_path = fsutil.join_path(other_font_path, "characterGlyph", "b.glif")
+        fsutil.write_file(glif_path, "<glyph/>")
+        fsutil.write_file(other_glif_path, "<glyph/>")
+        fsutil.remove_file(fsutil.join_path(repo_path, "README.md"))
+        # only the given paths are staged, removed paths included
+        repo.add([font_path, fsutil.join_path(repo_path, "README.md")])
+        # changes of other paths are discarded
+        repo.restore([other_font_path])
+        self.assertFalse(fsutil.exists(other_font_path))
+        self.assertTrue(repo.commit("Updated font."))
+        self.assertFalse(repo.commit("Nothing changed."))
+        repo.push()
+        git_log = self._get_git_log(remote_path)
+        self.assertTrue(git_log.startswith("Updated font."))
+        self.assertTrue("D\tREADME.md" in git_log)
+        self.assertTrue("A\tfont.rcjk/characterGlyph/a.glif" in git_log)
+        self.assertFalse("other-font.rcjk" in git_log)
+        # tracked paths are restored to their committed version
+        fsutil.write_file(glif_path, "<glyph>changed</glyph>")
+        repo.add([font_path])
+        repo.restore([font_path])
+        self.assertEqual(fsutil.read_file(glif_path), "<glyph/>")
+        for phase in ["init", "pull", "add", "restore", "commit", "push"]:
+            self.assertTrue(phase in repo.timings)
+
+    def test_project_save_to_file_system(self):
+        remote_path = self._create_git_remote()
+        project = Project.objects.create(
+            name="My Project", repo_url=remote_path, repo_branch="main"
+        )
+        Font.objects.create(project=project, name="My Font 1")
+        Font.objects.create(project=project, name="My Font 2")
+
+        def save_font_to_file_system(font, full_export):
+            font.export_journal = ExportJournal()
+            glif_path = fsutil.join_path(font.path(), "characterGlyph", "a.glif")
+            fsutil.write_file(glif_path, "<glyph/>")
+            font.export_journal.write(glif_path)
+            # files not written by the export are not staged
+            other_glif_path = fsutil.join_path(font.path(), "characterGlyph", "b.glif")
+            fsutil.write_file(other_glif_path, "<glyph/>")
+            if font.name == "My Font 2":
+                raise ValueError("Export error.")
+
+        with override_settings(GIT_REPOSITORIES_PATH=self._temp_dir.name):
+            with mock.patch.object(
+                Font, "save_to_file_system", save_font_to_file_system
+            ):
+                project.save_to_file_system()
+            # the failed font changes have been discarded
+            self.assertFalse(
+                fsutil.exists(fsutil.join_path(project.path(), "my-font-2.rcjk"))
+            )
+        # a single commit contains the changes of the exported fonts only
+        git_log = self._get_git_log(remote_path)
+        self.assertTrue(git_log.startswith("Updated My Font 1."))
+        self.assertTrue("A\tmy-font-1.rcjk/characterGlyph/a.glif" in git_log)
+        self.assertFalse("my-font-1.rcjk/characterGlyph/b.glif" in git_log)
+        self.assertFalse("my-font-2.rcjk" in git_log)
+        # each font export is recorded
+        self.assertEqual(
+            list(
+                ExportRun.objects.order_by("font__name").values_list(
+                    "font__name", "status"
+                )
+            ),
+            [
+                ("My Font 1", ExportRun.STATUS_COMPLETED),
+                ("My Font 2", ExportRun.STATUS_ERROR),
+            ],
+        )
+
+    def test_project_save_to_file_system_with_glifs(self):
+        remote_path = self._create_git_remote()
+        project = Project.objects.create(
+            name="My Project", repo_url=remote_path, repo_branch="main"
+        )
+        font = Font.objects.create(project=project, name="My Font")
+        character_glyph = CharacterGlyph.objects.create(
+            font=font, data=get_synthetic_glif_xml("uni4E00", unicode_hex="4E00")
+        )
+        with override_settings(GIT_REPOSITORIES_PATH=self._temp_dir.name):
+            project.save_to_file_system(full_export=True)
+        # the fonts export counts are merged in the project export counts
+        character_glyphs_counts = project.export_profiler.counts["characterglyph"]
+        self.assertEqual(character_glyphs_counts["total"], 1)
+        self.assertEqual(character_glyphs_counts["written"], 1)
+        self.assertEqual(
+            character_glyphs_counts["bytes"],
+            len(character_glyph.formatted_data.encode("utf-8")),
+        )
+        git_log = self._get_git_log(remote_path)
+        self.assertTrue(git_log.startswith("Updated My Font."))
+        self.assertTrue("A\tmy-font.rcjk/characterGlyph/uni4E_00.glif" in git_log)
+
+    def test_project_export_with_lost_export_lock(self):
+        remote_path = self._create_git_remote()
+        project = Project.objects.create(
+            name="My Project", repo_url=remote_path, repo_branch="main"
+        )
+        font = Font.objects.create(project=project, name="My Font")
+        CharacterGlyph.objects.create(
+            font=font, data=get_synthetic_glif_xml("uni4E00", unicode_hex="4E00")
+        )
+        renew = ExportLock.renew
+
+        def renew_fonts_locks_only(key, holder):
+            # the project lease is lost while its fonts are being exported
+            return key != project.export_lock_key and renew(key, holder)
+
+        with override_settings(GIT_REPOSITORIES_PATH=self._temp_dir.name):
+            with mock.patch.object(ExportLock, "renew", renew_fonts_locks_only):
+                self.assertFalse(project.export(full=True))
+        # the exported files have not been committed and pushed
+        git_log = self._get_git_log(remote_path)
+        self.assertTrue(git_log.startswith("Initial commit."))
+        self.assertFalse("my-font.rcjk" in git_log)
+        export_run = ExportRun.objects.get(font=None)
+        self.assertEqual(export_run.status, ExportRun.STATUS_ERROR)
+        self.assertTrue("lost" in export_run.error)
+        self.assertEqual(
+            ExportRun.objects.get(font=font).status, ExportRun.STATUS_COMPLETED
+        )
+        self.assertIsNone(Project.objects.get(pk=project.pk).export_completed_at)
+
+    def test_project_save_to_file_system_with_deleted_glifs(self):
+        projects = []
+        for name in ["A", "B"]:
+            remote_path = self._create_git_remote(f"remote-{name.lower()}")
+            project = Project.objects.create(
+                name=f"Project {name}", repo_url=remote_path, repo_branch="main"
+            )
+            font = Font.objects.create(project=project, name=f"Font {name}")
+            for unicode_hex in ["4E00", "4E01"]:
+                CharacterGlyph.objects.create(
+                    font=font,
+                    data=get_synthetic_glif_xml(
+                        f"uni{unicode_hex}", unicode_hex=unicode_hex
+                    ),
+                )
+            projects.append((project, font, remote_path))
+
+        with override_settings(GIT_REPOSITORIES_PATH=self._temp_dir.name):
+            for project, _, _ in projects:
+                project.save_to_file_system(full_export=True)
+            # delete a glif of each project
+            for _, font, _ in projects:
+                glif = font.character_glyphs.get(name="uni4E01")
+                DeletedGlif.objects.create(
+                    deleted_at=dt.datetime.now(),
+                    font=font,
+                    glif_type=DeletedGlif.get_glif_type_by_glif(glif),
+                    glif_id=glif.id,
+                    name=glif.name,
+                    filename=glif.filename,
+                    filepath=glif.path(),
+                )
+                glif.delete()
+            # deleted glifs files are restored by the repositories reset on update
+            for project, _, _ in projects:
+                subprocess.run(
+                    ["git", "-C", project.path(), "reset", "--quiet", "--hard"],
+                    check=True,
+                    capture_output=True,
+                )
+            project_a, _, remote_path_a = projects[0]
+            project_b, font_b, remote_path_b = projects[1]
+            glif_path_b = fsutil.join_path(
+                font_b.path(), "characterGlyph", "uni4E_01.glif"
+            )
+            # the incremental export removes the deleted glifs files of its fonts only
+            project_a.save_to_file_system()
+            self.assertTrue(fsutil.is_file(glif_path_b))
+            project_b.save_to_file_system()
+            self.assertFalse(fsutil.is_file(glif_path_b))
+        for remote_path, font_slug in [
+            (remote_path_a, "font-a"),
+            (remote_path_b, "font-b"),
+        ]:
+            git_log = self._get_git_log(remote_path)
+            self.assertTrue(
+                f"D\t{font_slug}.rcjk/characterGlyph/uni4E_01.glif" in git_log
+            )
+
+    def test_export_journal(self):
+        glif_path = fsutil.join_path(self._font_path, "characterGlyph", "a.glif")
+        other_glif_path = fsutil.join_path(self._font_path, "characterGlyph", "b.glif")
+        journal = ExportJournal()
+        journal.write(glif_path)
+        journal.write(glif_path)
+        journal.remove(other_glif_path)
+        self.assertEqual(len(journal), 2)
+        self.assertEqual(journal.written, [glif_path])
+        self.assertEqual(journal.removed, [other_glif_path])
+        # the last change wins
+        journal.write(other_glif_path)
+        self.assertEqual(journal.written, [glif_path, other_glif_path])
+        self.assertEqual(journal.removed, [])
+        self.assertTrue(other_glif_path in journal)
+        journal.clear()
+        self.assertEqual(journal.paths, [])
+
+    def test_export_profiler(self):
+        profiler = ExportProfiler()
+        with profiler.span("verify"):
+            pass
+        with profiler.span("verify"):
+            pass
+        profiler.add_timings({"pull": 1.0, "push": 2.0}, prefix="git.")
+        self.assertEqual(
+            list(profiler.timings.keys()), ["verify", "git.pull", "git.push"]
+        )
+        self.assertEqual(profiler.timings["git.push"], 2.0)
+        profiler.add_count("characterglyph", total=3)
+        profiler.add_count("characterglyph", written=1, size=100)
+        profiler.add_count("deepcomponent", total=1, written=1, size=50)
+        self.assertEqual(
+            profiler.counts["characterglyph"], {"total": 3, "written": 1, "bytes": 100}
+        )
+        self.assertEqual(profiler.files_count, 2)
+        self.assertEqual(profiler.bytes_count, 150)
+        self.assertTrue("git.push: 2.00s" in profiler.format_timings())
+
+    def test_manifest_glifs_ids(self):
+        glif_path = fsutil.join_path(self._font_path, "characterGlyph", "a.glif")
+        other_glif_path = fsutil.join_path(self._font_path, "characterGlyph", "b.glif")
+        fsutil.write_file(glif_path, "<glyph/>")
+        fsutil.write_file(other_glif_path, "<glyph/>")
+        manifest = ExportManifest(self._manifest_path, self._font_path)
+        manifest.set(glif_path, "digest", "characterglyph", 1)
+        manifest.set(other_glif_path, "digest")
+        # entries without glif type and id
+        self.assertEqual(manifest.get_glifs_ids(), None)
+        manifest.set_glif(other_glif_path, "characterglyph", 1)
+        self.assertEqual(manifest.get_glifs_ids(), {"characterglyph": [1, 1]})
+
+    def test_scan_glifs_files(self):
+        glifs_path = fsutil.join_path(self._font_path, "characterGlyph")
+        glif_path = fsutil.join_path(glifs_path, "a.glif")
+        layer_glif_path = fsutil.join_path(glifs_path, "layer", "a.glif")
+        fsutil.write_file(glif_path, "<glyph/>")
+        fsutil.write_file(layer_glif_path, "<glyph/>")
+        fsutil.write_file(fsutil.join_path(glifs_path, "a.txt"), "")
+        missing_path = fsutil.join_path(self._font_path, "deepComponent")
+        layers_dirs = scan_dirs([glifs_path, missing_path])
+        self.assertEqual(
+            layers_dirs,
+            {glifs_path: [fsutil.join_path(glifs_path, "layer")], missing_path: []},
+        )
+        glifs_files = scan_glifs_files([glifs_path, *layers_dirs[glifs_path]])
+        self.assertEqual(glifs_files[glifs_path], [glif_path])
+        self.assertEqual(
+            glifs_files[fsutil.join_path(glifs_path, "layer")], [layer_glif_path]
+        )
@@ -1,16 +1,29 @@
+import datetime as dt
+import tempfile
+from unittest import mock
+
 import fsutil
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
 
+from robocjk.exceptions import ExportLockLostError
+from robocjk.io.paths import get_glifs_layers_paths, get_glifs_paths
 from robocjk.models import (
     AtomicElement,
     AtomicElementLayer,
     CharacterGlyph,
     CharacterGlyphLayer,
     DeepComponent,
+    ExportLock,
+    ExportLockHeartbeat,
+    ExportRun,
     Font,
     Project,
     StatusModel,
 )
+from robocjk.synthetic import get_synthetic_glif_xml
+from robocjk.utils import format_glif, get_digest, iterate_queryset_chunks
 
 
 class ModelsTestCase(TestCase):
@@ -134,3 +147,334 @@ class ModelsTestCase(TestCase):
         self.assertEqual(self._atomic_element_layer.unicode_hex, "")
         self.assertEqual(self._atomic_element_layer.filename, "bendingB_oth.glif")
         self.assertTrue(isinstance(self._atomic_element_layer.serialize(), dict))
+
+    def test_glif_data_hash(self):
+        glif = self._character_glyph
+        self.assertEqual(glif.data_hash, get_digest(glif.data_formatted))
+        data_hash = glif.data_hash
+        glif.data = self.read_glif_data("characterGlyph/1/uni4E_25.glif")
+        glif.save()
+        self.assertNotEqual(glif.data_hash, data_hash)
+        self.assertEqual(glif.data_hash, self._character_glyph_layer.data_hash)
+
+    def test_glif_formatted_data(self):
+        glif = self._character_glyph
+        self.assertEqual(glif.formatted_data, format_glif(glif.data))
+        self.assertEqual(glif.data_formatted, glif.formatted_data)
+        self.assertEqual(glif.data_hash, get_digest(glif.formatted_data))
+        # glif saved before the formatted data was stored
+        CharacterGlyph.objects.filter(pk=glif.pk).update(formatted_data="")
+        glif = CharacterGlyph.objects.get(pk=glif.pk)
+        self.assertEqual(glif.formatted_data, "")
+        self.assertEqual(glif.data_formatted, format_glif(glif.data))
+
+    def test_glif_unicodes(self):
+        self.assertEqual(self._character_glyph.unicodes, [0x4E25])
+        self.assertEqual(self._character_glyph_layer.unicodes, [0x4E25])
+        self.assertEqual(self._deep_component.unicodes, [])
+        self.assertEqual(self._atomic_element.unicodes, [])
+
+    def test_glif_lock_queryset_by(self):
+        user1 = get_user_model().objects.create_user(username="designer1")
+        user2 = get_user_model().objects.create_user(username="designer2")
+        character_glyph = CharacterGlyph.objects.create(
+            font=self._font1,
+            data=get_synthetic_glif_xml("uni4E00", unicode_hex="4E00"),
+        )
+        self._character_glyph.lock_by(user2, save=True)
+        glifs_qs = self._font1.character_glyphs.all()
+        updated_at = character_glyph.updated_at
+        with self.assertNumQueries(2):
+            acquired_ids, refused_ids = CharacterGlyph.lock_queryset_by(glifs_qs, user1)
+        self.assertEqual(acquired_ids, [character_glyph.id])
+        self.assertEqual(refused_ids, [self._character_glyph.id])
+        character_glyph.refresh_from_db()
+        self.assertTrue(character_glyph.is_locked_by(user1))
+        self.assertEqual(character_glyph.updated_at, updated_at)
+        # already locked by user
+        self.assertEqual(
+            CharacterGlyph.lock_queryset_by(glifs_qs, user1),
+            ([character_glyph.id], [self._character_glyph.id]),
+        )
+        with self.assertNumQueries(2):
+            released_ids, refused_ids = CharacterGlyph.unlock_queryset_by(
+                glifs_qs, user1
+            )
+        self.assertEqual(released_ids, [character_glyph.id])
+        self.assertEqual(refused_ids, [self._character_glyph.id])
+        character_glyph.refresh_from_db()
+        self.assertFalse(character_glyph.is_locked)
+        self.assertIsNone(character_glyph.locked_by_id)
+
+    def test_glif_bulk_save_by(self):
+        user = get_user_model().objects.create_user(
+            username="designer", first_name="Robo", last_name="CJK"
+        )
+        deep_component_name = self._deep_component.name
+        character_glyph = self._character_glyph
+        character_glyph.data = get_synthetic_glif_xml(
+            character_glyph.name,
+            unicode_hex=character_glyph.unicode_hex,
+            contours=2,
+        )
+        new_character_glyph = CharacterGlyph(
+            font=self._font1,
+            data=get_synthetic_glif_xml(
+                "uni4E00", unicode_hex="4E00", components=[deep_component_name]
+            ),
+        )
+        with self.assertNumQueries(13):
+            CharacterGlyph.bulk_save_by([character_glyph, new_character_glyph], user)
+        # existing glif updated
+        character_glyph.refresh_from_db()
+        self.assertEqual(
+            character_glyph.formatted_data, format_glif(character_glyph.data)
+        )
+        self.assertEqual(
+            character_glyph.data_hash, get_digest(character_glyph.formatted_data)
+        )
+        self.assertEqual(character_glyph.updated_by, user)
+        self.assertEqual(character_glyph.editors_history, "Robo CJK")
+        self.assertEqual(list(character_glyph.editors.all()), [user])
+        self.assertEqual(list(character_glyph.deep_components.all()), [])
+        # new glif created
+        new_character_glyph.refresh_from_db()
+        self.assertEqual(new_character_glyph.name, "uni4E00")
+        self.assertEqual(new_character_glyph.unicodes, [0x4E00])
+        self.assertEqual(list(new_character_glyph.editors.all()), [user])
+        self.assertEqual(
+            list(new_character_glyph.deep_components.all()), [self._deep_component]
+        )
+
+    def test_glif_bulk_save_by_without_bulk_insert_returning_ids(self):
+        # some database backends (eg. MySQL) don't set the ids of created objects
+        user = get_user_model().objects.create_user(username="designer")
+        new_character_glyph = CharacterGlyph(
+            font=self._font1,
+            data=get_synthetic_glif_xml(
+                "uni4E00", unicode_hex="4E00", components=[self._deep_component.name]
+            ),
+        )
+        new_layer = CharacterGlyphLayer(
+            glif=new_character_glyph,
+            group_name="layer1",
+            data=get_synthetic_glif_xml("uni4E00"),
+        )
+        with mock.patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        ):
+            CharacterGlyph.bulk_save_by([new_character_glyph], user)
+            CharacterGlyphLayer.bulk_save_by([new_layer], user)
+        self.assertEqual(
+            new_character_glyph.id,
+            CharacterGlyph.objects.get(font=self._font1, name="uni4E00").id,
+        )
+        self.assertEqual(list(new_character_glyph.editors.all()), [user])
+        self.assertEqual(
+            list(new_character_glyph.deep_components.all()), [self._deep_component]
+        )
+        self.assertEqual(
+            new_layer.id,
+            CharacterGlyphLayer.objects.get(
+                glif=new_character_glyph, group_name="layer1"
+            ).id,
+        )
+        self.assertEqual(list(new_layer.editors.all()), [user])
+
+    def test_iterate_queryset_chunks(self):
+        fonts_qs = Font.objects.all()
+        chunks = list(iterate_queryset_chunks(fonts_qs, 1))
+        self.assertEqual(chunks, [[self._font1], [self._font2]])
+        chunks = list(iterate_queryset_chunks(fonts_qs, 2))
+        self.assertEqual(chunks, [[self._font1, self._font2]])
+        chunks = list(iterate_queryset_chunks(fonts_qs.none(), 2))
+        self.assertEqual(chunks, [])
+        # values querysets
+        chunks = list(iterate_queryset_chunks(fonts_qs.values_list("id", "name"), 1))
+        self.assertEqual(
+            chunks, [[(self._font1.id, "My Font 1")], [(self._font2.id, "My Font 2")]]
+        )
+        chunks = list(iterate_queryset_chunks(fonts_qs.values("id"), 1))
+        self.assertEqual(chunks, [[{"id": self._font1.id}], [{"id": self._font2.id}]])
+
+    def test_glif_status_with_variations(self):
+        glif_data = fsutil.read_file(
+            fsutil.join_path(
+                __file__, "test_core_data", "characterGlyph", "uni27C_28.glif"
+            )
+        )
+        glif = CharacterGlyph.objects.create(font=self._font1, data=glif_data)
+        expected_value = {
+            "status": 4,
+            "status_os_bold": 1,
+            "status_os_reg": 1,
+            "status_wght": 4,
+        }
+        self.assertEqual(glif.status_with_variations, expected_value)
+        glif = CharacterGlyph.objects.get(pk=glif.pk)
+        self.assertEqual(glif.status_with_variations, expected_value)
+        self.assertFalse(glif.status_downgraded)
+        # downgrade the wght variation status
+        glif.data = glif_data.replace(
+            "<string>wght</string>\n          <key>status</key>\n"
+            "          <integer>4</integer>",
+            "<string>wght</string>\n          <key>status</key>\n"
+            "          <integer>2</integer>",
+        )
+        glif.save()
+        self.assertEqual(glif.status_with_variations["status_wght"], 2)
+        self.assertTrue(glif.status_downgraded)
+
+    def test_font_acquire_export(self):
+        self.assertTrue(self._font1._acquire_export("host-a:1"))
+        self.assertTrue(Font.objects.get(pk=self._font1.pk).export_running)
+        # the same font can't be exported twice
+        self.assertFalse(
+            Font.objects.get(pk=self._font1.pk)._acquire_export("host-b:1")
+        )
+        # other fonts can be exported concurrently
+        self.assertTrue(self._font2._acquire_export("host-b:1"))
+        # the lease is renewed only by its holder
+        lock_key = self._font1.export_lock_key
+        self.assertTrue(ExportLock.renew(lock_key, "host-a:1"))
+        self.assertFalse(ExportLock.renew(lock_key, "host-b:1"))
+        # unfinished exports can be reclaimed as soon as their lease expires
+        ExportLock.objects.filter(key=lock_key).update(
+            expires_at=dt.datetime.now() - dt.timedelta(seconds=1)
+        )
+        self.assertTrue(Font.objects.get(pk=self._font1.pk)._acquire_export("host-b:1"))
+        self.assertFalse(ExportLock.renew(lock_key, "host-a:1"))
+        # released locks can be acquired again
+        self._font1._release_export("host-b:1")
+        self.assertTrue(self._font1._acquire_export("host-a:1"))
+
+    def test_font_export_releases_lock(self):
+        self._font1.save_to_file_system = lambda full_export: None
+        self.assertTrue(self._font1.export())
+        export_lock = ExportLock.objects.get(key=self._font1.export_lock_key)
+        self.assertEqual(export_lock.holder, "")
+        self.assertFalse(Font.objects.get(pk=self._font1.pk).export_running)
+
+    def test_export_lock_heartbeat_lost(self):
+        lock_key = self._font1.export_lock_key
+        self.assertTrue(ExportLock.acquire(lock_key, "host-a:1"))
+        for renew_side_effect in [[True, False], ValueError("Renew error.")]:
+            with self.subTest(renew_side_effect=renew_side_effect):
+                heartbeat = ExportLockHeartbeat(lock_key, "host-a:1", interval=0.01)
+                with mock.patch.object(
+                    ExportLock, "renew", side_effect=renew_side_effect
+                ):
+                    heartbeat.start()
+                    # the heartbeat thread stops renewing the lease
+                    heartbeat._thread.join(timeout=5)
+                    with self.assertRaises(ExportLockLostError):
+                        heartbeat.check()
+                    heartbeat.stop()
+                self.assertTrue(heartbeat.lost)
+        # the lease is renewed on check only by its holder
+        heartbeat = ExportLockHeartbeat(lock_key, "host-b:1")
+        with self.assertRaises(ExportLockLostError):
+            heartbeat.check(renew=True)
+
+    def test_font_export_with_lost_export_lock(self):
+        def save_to_file_system(full_export):
+            # another process takes over the expired lease
+            ExportLock.objects.filter(key=self._font1.export_lock_key).update(
+                holder="host-b:1"
+            )
+
+        self._font1.save_to_file_system = save_to_file_system
+        self.assertFalse(self._font1.export(full=True))
+        export_run = ExportRun.objects.get(font=self._font1)
+        self.assertEqual(export_run.status, ExportRun.STATUS_ERROR)
+        self.assertTrue("lost" in export_run.error)
+        self.assertIsNone(Font.objects.get(pk=self._font1.pk).export_completed_at)
+
+    def test_font_export_run(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GIT_REPOSITORIES_PATH=temp_dir):
+                self.assertTrue(self._font1.export(full=True))
+        export_run = ExportRun.objects.get(font=self._font1)
+        self.assertEqual(export_run.project, self._project)
+        self.assertEqual(export_run.status, ExportRun.STATUS_COMPLETED)
+        self.assertTrue(export_run.full_export)
+        self.assertGreater(export_run.duration, 0)
+        for phase in ["files", "prepare", "count", "glifs", "glifs.read", "verify"]:
+            self.assertTrue(phase in export_run.timings)
+        character_glyphs_counts = export_run.counts["characterglyph"]
+        self.assertEqual(character_glyphs_counts["total"], 1)
+        self.assertEqual(character_glyphs_counts["written"], 1)
+        self.assertEqual(
+            character_glyphs_counts["bytes"],
+            len(self._character_glyph.formatted_data.encode("utf-8")),
+        )
+        self.assertEqual(export_run.files_written, 5)
+        # failed exports are recorded with their error
+        self._font1.save_to_file_system = lambda full_export: 1 / 0
+        self.assertFalse(self._font1.export(full=True))
+        export_run = ExportRun.objects.filter(font=self._font1).first()
+        self.assertEqual(export_run.status, ExportRun.STATUS_ERROR)
+        self.assertEqual(export_run.error, "division by zero")
+        # old export runs are deleted
+        ExportRun.objects.update(started_at=dt.datetime.now() - dt.timedelta(days=31))
+        self._font1.save_to_file_system = lambda full_export: None
+        self.assertTrue(self._font1.export())
+        self.assertEqual(ExportRun.objects.count(), 1)
+
+    def test_font_save_to_file_system_journal(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GIT_REPOSITORIES_PATH=temp_dir):
+                self._font1.save_to_file_system(full_export=True)
+                journal = self._font1.export_journal
+                self.assertTrue(self._character_glyph.path() in journal.written)
+                self.assertTrue(self._atomic_element_layer.path() in journal.written)
+                # unchanged files are not written again
+                self._font1.save_to_file_system(full_export=True)
+                journal = self._font1.export_journal
+                self.assertFalse(self._character_glyph.path() in journal)
+                # removed glifs files are tracked
+                zombie_glif_path = self._character_glyph.path().replace(
+                    ".glif", "_zombie.glif"
+                )
+                fsutil.write_file(zombie_glif_path, "<glyph/>")
+                self._font1.save_to_file_system(full_export=True)
+                self.assertEqual(self._font1.export_journal.removed, [zombie_glif_path])
+
+    def test_font_verify_file_system(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with override_settings(GIT_REPOSITORIES_PATH=temp_dir):
+                self._font1.save_to_file_system(full_export=True)
+                with self.assertLogs("robocjk", level="INFO") as logs:
+                    self._font1.verify_file_system()
+                self.assertTrue("in the export manifest" in "\n".join(logs.output))
+                with self.assertLogs("robocjk", level="INFO") as logs:
+                    self._font1.verify_file_system(deep=True)
+                self.assertTrue("on file-system" in "\n".join(logs.output))
+                # deleted glifs files are found in the manifest
+                self._deep_component.delete()
+                with self.assertLogs("robocjk", level="INFO") as logs:
+                    self._font1.verify_file_system()
+                self.assertTrue(
+                    "found 1 deep components .glif files in the export manifest "
+                    "(0 missing, 1 zombie)" in "\n".join(logs.output)
+                )
+
+    def test_font_glifs_paths(self):
+        glifs = {
+            "character glyphs": self._character_glyph,
+            "character glyphs layers": self._character_glyph_layer,
+            "deep components": self._deep_component,
+            "atomic elements": self._atomic_element,
+            "atomic elements layers": self._atomic_element_layer,
+        }
+        glifs_querysets = self._font1.get_glifs_querysets()
+        for glifs_type_name, glifs_qs, glifs_dirpath, glifs_layers in glifs_querysets:
+            if glifs_layers:
+                glifs_paths = get_glifs_layers_paths(
+                    glifs_dirpath, glifs_qs.values_list("group_name", "filename")
+                )
+            else:
+                glifs_paths = get_glifs_paths(
+                    glifs_dirpath, glifs_qs.values_list("filename", flat=True)
+                )
+            self.assertEqual(glifs_paths, [glifs[glifs_type_name].path()])
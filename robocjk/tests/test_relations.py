@@ -0,0 +1,67 @@
+import fsutil
+from django.test import TestCase
+
+from robocjk.models import AtomicElement, DeepComponent, Font, Project
+from robocjk.relations import update_glifs_relations
+
+
+class RelationsTestCase(TestCase):
+    @classmethod
+    def read_glif_data(cls, path):
+        return fsutil.read_file(fsutil.join_path(__file__, path))
+
+    def setUp(self):
+        self._project = Project.objects.create(name="My Font Family")
+        self._font = Font.objects.create(project=self._project, name="My Font")
+        # deep component saved before its atomic element
+        self._deep_component = DeepComponent.objects.create(
+            font=self._font,
+            data=self.read_glif_data(
+                "test_models_data/deepComponent/D_C__2B_740_00.glif"
+            ),
+        )
+        self._atomic_element = AtomicElement.objects.create(
+            font=self._font,
+            data=self.read_glif_data("test_core_data/atomicElement/line.glif"),
+        )
+        self._other_atomic_element = AtomicElement.objects.create(
+            font=self._font,
+            data=self.read_glif_data(
+                "test_models_data/atomicElement/bendingB_oth.glif"
+            ),
+        )
+
+    def tearDown(self):
+        pass
+
+    def test_update_glifs_relations(self):
+        self.assertEqual(self._deep_component.atomic_elements.count(), 0)
+        stats = update_glifs_relations(self._font.id)
+        relation_stats = stats["DeepComponent.atomic_elements"]
+        self.assertEqual(relation_stats["edges"], 1)
+        self.assertEqual(relation_stats["created"], 1)
+        self.assertEqual(relation_stats["deleted"], 0)
+        self.assertEqual(
+            list(self._deep_component.atomic_elements.all()), [self._atomic_element]
+        )
+        # nothing changed
+        stats = update_glifs_relations(self._font.id)
+        relation_stats = stats["DeepComponent.atomic_elements"]
+        self.assertEqual(relation_stats["created"], 0)
+        self.assertEqual(relation_stats["deleted"], 0)
+        # stale relation
+        self._deep_component.atomic_elements.add(self._other_atomic_element)
+        stats = update_glifs_relations(self._font.id, glif_cls=DeepComponent)
+        self.assertEqual(list(stats.keys()), ["DeepComponent.atomic_elements"])
+        relation_stats = stats["DeepComponent.atomic_elements"]
+        self.assertEqual(relation_stats["created"], 0)
+        self.assertEqual(relation_stats["deleted"], 1)
+        self.assertEqual(
+            list(self._deep_component.atomic_elements.all()), [self._atomic_element]
+        )
+
+    def test_update_glifs_relations_on_save(self):
+        self._deep_component.save()
+        self.assertEqual(
+            list(self._deep_component.atomic_elements.all()), [self._atomic_element]
+        )
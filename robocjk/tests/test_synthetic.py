@@ -0,0 +1,64 @@
+from django.test import TestCase
+
+from robocjk.models import Project
+from robocjk.synthetic import create_synthetic_font, get_synthetic_glif_xml
+from robocjk.utils import format_glif, iterate_queryset_chunks_by_parent
+
+
+class SyntheticTestCase(TestCase):
+    def setUp(self):
+        self._project = Project.objects.create(name="My Project")
+
+    def tearDown(self):
+        pass
+
+    def test_synthetic_glif_xml(self):
+        xml = get_synthetic_glif_xml(
+            "uni4E00", unicode_hex="4E00", components=["DC_4E00_00"], contours=2
+        )
+        self.assertEqual(format_glif(xml), xml)
+
+    def test_create_synthetic_font(self):
+        font = create_synthetic_font(
+            self._project,
+            "My Font",
+            atomic_elements=5,
+            deep_components=4,
+            character_glyphs=3,
+            layers=2,
+            components=2,
+        )
+        self.assertEqual(font.atomic_elements.count(), 5)
+        self.assertEqual(font.deep_components.count(), 4)
+        self.assertEqual(font.character_glyphs.count(), 3)
+        character_glyph = font.character_glyphs.get(name="uni4E00")
+        self.assertEqual(character_glyph.unicode_hex, "4E00")
+        self.assertEqual(character_glyph.layers.count(), 2)
+        self.assertEqual(character_glyph.deep_components.count(), 2)
+        self.assertEqual(character_glyph.format_data(), character_glyph.formatted_data)
+        deep_component = font.deep_components.first()
+        self.assertEqual(deep_component.atomic_elements.count(), 2)
+
+    def test_iterate_queryset_chunks_by_parent(self):
+        font = create_synthetic_font(
+            self._project, "My Font", character_glyphs=5, layers=2
+        )
+        for _, glifs_qs, _, glifs_layers in font.get_glifs_querysets():
+            glifs_ids = list(glifs_qs.order_by("id").values_list("id", flat=True))
+            glifs_chunks = list(
+                font.iterate_glifs_queryset_chunks(glifs_qs, glifs_layers, 2)
+            )
+            self.assertEqual(
+                sorted(glif.id for glifs_list in glifs_chunks for glif in glifs_list),
+                glifs_ids,
+            )
+        layers_chunks = list(
+            iterate_queryset_chunks_by_parent(
+                font.character_glyphs.first().layers.model.objects.all(),
+                font.character_glyphs.all(),
+                "glif_id",
+                2,
+            )
+        )
+        # layers of 2 glifs per chunk
+        self.assertEqual([len(chunk) for chunk in layers_chunks], [4, 4, 2])
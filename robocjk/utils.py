@@ -1,3 +1,5 @@
+import hashlib
+
 from fontTools.pens.recordingPen import RecordingPointPen
 from fontTools.ufoLib.glifLib import readGlyphFromString, writeGlyphToString
 
@@ -13,6 +15,62 @@ def format_glif(s):
     return writeGlyphToString(glyph.name, glyph, drawPointsFunc=recorder.replay)
 
 
+def get_digest(s):
+    return hashlib.md5(s.encode("utf-8")).hexdigest()
+
+
+def _get_pk(obj):
+    if isinstance(obj, dict):
+        return obj["pk"] if "pk" in obj else obj["id"]
+    if isinstance(obj, tuple):
+        return obj[0]
+    return obj.pk
+
+
+def iterate_queryset_chunks(queryset, chunk_size):
+    """
+    Iterate the queryset in chunks (lists of objects) using keyset pagination
+    (pk greater than the last pk) instead of offset pagination,
+    that gets slower as the offset grows.
+    Querysets of values are supported too, values_list querysets
+    must have the pk as first field.
+    """
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        chunk_queryset = queryset
+        if last_pk is not None:
+            chunk_queryset = queryset.filter(pk__gt=last_pk)
+        chunk = list(chunk_queryset[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_pk = _get_pk(chunk[-1])
+
+
+def iterate_queryset_chunks_by_parent(
+    queryset, parents_queryset, parent_field, chunk_size
+):
+    """
+    Iterate the queryset in chunks of objects belonging to chunks of parents
+    (loaded using keyset pagination), ordered by parent and pk.
+    Keyset pagination of querysets filtered by a joined table (eg. layers
+    filtered by glif font) would sort all the matching rows on each query.
+    """
+    parents_queryset = parents_queryset.values_list("pk")
+    for parents_list in iterate_queryset_chunks(parents_queryset, chunk_size):
+        parents_pks = [parent[0] for parent in parents_list]
+        chunk = list(
+            queryset.filter(**{f"{parent_field}__in": parents_pks}).order_by(
+                parent_field, "pk"
+            )
+        )
+        if chunk:
+            yield chunk
+
+
 def char_to_unicode(s):
     return hex(ord(s))[2:].zfill(4).upper()
 